@@ -1,23 +0,0 @@
-try:
-    # ... existing code ...
-except Exception as e:
-    agentops.record_error(str(e))
-    raise
-// ... existing code ...
-try:
-    # ... existing code ...
-except Exception as e:
-    agentops.record_error(str(e))
-    raise
-// ... existing code ...
-try:
-    # ... existing code ...
-except Exception as e:
-    agentops.record_error(str(e))
-    raise
-// ... existing code ...
-try:
-    # ... existing code ...
-except Exception as e:
-    agentops.record_error(str(e))
-    raise 
\ No newline at end of file
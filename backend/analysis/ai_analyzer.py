@@ -1,10 +1,15 @@
 """Module for AI-powered project analysis using OpenAI."""
 import os
-from typing import Dict, List, Optional
-import json
+import re
+import hashlib
+import time
+import asyncio
+from typing import Dict, List, Optional, Mapping, Tuple
+import orjson
 from datetime import datetime
 from openai import AsyncOpenAI
 import agentops
+import aiofiles
 from pathlib import Path
 import logging
 
@@ -15,29 +20,30 @@ agentops.init(os.getenv('AGENTOPS_API_KEY'))
 logger = logging.getLogger(__name__)
 logger.setLevel(logging.DEBUG)
 
-class AIProjectAnalyzer:
-    def __init__(self):
-        self.api_key = os.getenv('OPENAI_API_KEY')
-        if not self.api_key:
-            raise ValueError("OPENAI_API_KEY environment variable is required")
-        
-        self.client = AsyncOpenAI(api_key=self.api_key)
-        self.cache_dir = Path('data/ai_analysis')
-        self.cache_dir.mkdir(parents=True, exist_ok=True)
+# Matches the parts of OpenAI reset durations such as "1s", "20ms" or "6m0s"
+_DURATION_PART = re.compile(r'(\d+(?:\.\d+)?)(ms|h|m|s)')
+_DURATION_UNITS = {'ms': 0.001, 's': 1, 'm': 60, 'h': 3600}
 
-    @agentops.record_action('analyze_project')
-    async def analyze_project(self, prompt: str, project_id: int) -> dict:
-        """Analyze project data using OpenAI's API"""
-        
-        # Check cache first
-        cache_file = self.cache_dir / f"analysis_{project_id}_{datetime.now().strftime('%Y%m%d')}.json"
-        if cache_file.exists():
-            logger.info(f"Using cached analysis for project {project_id}")
-            with open(cache_file) as f:
-                return json.load(f)
-        
-        try:
-            system_prompt = """You are a project analysis expert. Analyze the project data and provide insights in JSON format.
+def _parse_reset(value: Optional[str]) -> float:
+    """Convert an x-ratelimit-reset-* header value to seconds"""
+    if not value:
+        return 0.0
+    return sum(float(amount) * _DURATION_UNITS[unit] for amount, unit in _DURATION_PART.findall(value))
+
+# analysis_<id>_<date>.json, or analysis_<id>_<date>_<prompt hash>.json
+_CACHE_FILE = re.compile(r'analysis_(\d+)_(\d{8})(?:_([0-9a-f]+))?\.json')
+
+# Upper bound on the combined prompt size when packing projects into one request
+_GROUP_TOKEN_LIMIT = 8000
+
+def estimate_tokens(text: str) -> int:
+    """Rough token count for rate limiting (~4 characters per token)"""
+    return len(text) // 4 + 1
+
+# Kept byte-identical across requests and always sent first so providers can
+# reuse the cached prefix (OpenAI caches prompts of 1024+ tokens automatically,
+# vLLM reuses prefix KV blocks). Never interpolate per-call data into it.
+_SYSTEM_PROMPT = """You are a project analysis expert. Analyze the project data and provide insights in JSON format.
 DO NOT use any markdown formatting or code blocks. Return ONLY the raw JSON object.
 The response must be a valid JSON object with the following structure:
 {
@@ -73,54 +79,248 @@ The response must be a valid JSON object with the following structure:
     }
 }"""
 
-            logger.info(f"Making OpenAI API call for project {project_id}")
-            logger.debug(f"Using model: o3-mini")
+class TokenBucket:
+    """Token bucket tracking the OpenAI request/token budget from response headers"""
+    def __init__(self):
+        # None means the budget is unknown (no response seen yet, or the window reset)
+        self.remaining_requests: Optional[int] = None
+        self.remaining_tokens: Optional[int] = None
+        self.requests_reset_at = 0.0
+        self.tokens_reset_at = 0.0
+        self._lock = asyncio.Lock()
+    
+    async def acquire(self, estimated_tokens: int):
+        """Wait until the budget allows a request of the estimated size"""
+        while True:
+            async with self._lock:
+                now = time.monotonic()
+                if now >= self.requests_reset_at:
+                    self.remaining_requests = None
+                if now >= self.tokens_reset_at:
+                    self.remaining_tokens = None
+                
+                requests_ok = self.remaining_requests is None or self.remaining_requests >= 1
+                tokens_ok = self.remaining_tokens is None or self.remaining_tokens >= estimated_tokens
+                if requests_ok and tokens_ok:
+                    if self.remaining_requests is not None:
+                        self.remaining_requests -= 1
+                    if self.remaining_tokens is not None:
+                        self.remaining_tokens -= estimated_tokens
+                    return
+                
+                reset_at = self.requests_reset_at if not requests_ok else self.tokens_reset_at
+                wait_time = reset_at - now
             
-            # Call OpenAI API with modern client
-            response = await self.client.chat.completions.create(
-                model="o3-mini",
-                messages=[
-                    {"role": "system", "content": system_prompt},
-                    {"role": "user", "content": prompt}
-                ],
-                response_format={ "type": "json_object" }
+            logger.warning(f"OpenAI rate limit budget exhausted, waiting {wait_time:.2f} seconds")
+            await asyncio.sleep(wait_time)
+    
+    def update(self, headers: Mapping[str, str]):
+        """Refresh the budget from x-ratelimit-* response headers"""
+        now = time.monotonic()
+        if 'x-ratelimit-remaining-requests' in headers:
+            self.remaining_requests = int(headers['x-ratelimit-remaining-requests'])
+            self.requests_reset_at = now + _parse_reset(headers.get('x-ratelimit-reset-requests'))
+        if 'x-ratelimit-remaining-tokens' in headers:
+            self.remaining_tokens = int(headers['x-ratelimit-remaining-tokens'])
+            self.tokens_reset_at = now + _parse_reset(headers.get('x-ratelimit-reset-tokens'))
+    
+    def release(self, estimated_tokens: int, actual_tokens: int):
+        """Return the difference between the estimated and actual token usage"""
+        if self.remaining_tokens is not None:
+            self.remaining_tokens += estimated_tokens - actual_tokens
+
+class AIProjectAnalyzer:
+    def __init__(self):
+        self.api_key = os.getenv('OPENAI_API_KEY')
+        if not self.api_key:
+            raise ValueError("OPENAI_API_KEY environment variable is required")
+        
+        # The SDK retries 429/5xx with exponential backoff and jitter
+        self.client = AsyncOpenAI(
+            api_key=self.api_key,
+            max_retries=int(os.getenv('OPENAI_MAX_RETRIES', '6'))
+        )
+        # Cap in-flight requests to stay under the account's RPM/TPM limits
+        self._sem = asyncio.Semaphore(int(os.getenv('OPENAI_MAX_CONCURRENCY', '10')))
+        # Adapts to the provider's remaining budget reported on each response
+        self._rate_limit = TokenBucket()
+        self.cache_dir = Path('data/ai_analysis')
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        # In-process tier in front of the on-disk cache, keyed by (project_id, prompt hash)
+        self._mem_cache: Dict[Tuple[int, str], dict] = {}
+        # Analyses currently being requested, keyed like the memory tier
+        self._inflight: Dict[Tuple[int, str], asyncio.Future] = {}
+        # Index of cache files so lookups don't glob and stat the directory each time
+        self._latest: Dict[int, Path] = {}
+        self._by_hash: Dict[Tuple[int, str], Path] = {}
+        self._index_cache_dir()
+
+    def _index_cache_dir(self):
+        """Build the cache file index from a single directory scan"""
+        latest: Dict[int, Tuple[float, Path]] = {}
+        self._by_hash = {}
+        with os.scandir(self.cache_dir) as entries:
+            for entry in entries:
+                match = _CACHE_FILE.fullmatch(entry.name)
+                if not match:
+                    continue
+                project_id, prompt_hash = int(match.group(1)), match.group(3)
+                path = Path(entry.path)
+                mtime = entry.stat().st_mtime
+                if project_id not in latest or mtime > latest[project_id][0]:
+                    latest[project_id] = (mtime, path)
+                # Names sort by date, so the greatest one is the newest for a hash
+                if prompt_hash and path.name > self._by_hash.get((project_id, prompt_hash), Path()).name:
+                    self._by_hash[(project_id, prompt_hash)] = path
+        self._latest = {project_id: path for project_id, (_, path) in latest.items()}
+
+    def _build_request(self, prompt: str) -> dict:
+        """Build the chat completion request body for a project prompt"""
+        return {
+            "model": "o3-mini",
+            "messages": [
+                {"role": "system", "content": _SYSTEM_PROMPT},
+                {"role": "user", "content": prompt}
+            ],
+            "response_format": { "type": "json_object" }
+        }
+
+    def _parse_content(self, content: str, project_id: int, now: datetime) -> dict:
+        """Parse the model's JSON reply, falling back to an error payload"""
+        raw_content = content
+        try:
+            # Remove any potential markdown formatting (shouldn't be needed with the new prompt)
+            if content.startswith("```") and content.endswith("```"):
+                content = content.split("```")[1]
+                if content.startswith("json\n"):
+                    content = content[5:]
+                elif content.startswith("\n"):
+                    content = content[1:]
+                if content.endswith("\n"):
+                    content = content[:-1]
+            analysis = orjson.loads(content)
+            analysis.update({
+                'analyzed_at': now.isoformat(),
+                'model_version': "o3-mini"
+            })
+            logger.info(f"Successfully parsed JSON response for project {project_id}")
+        except orjson.JSONDecodeError as e:
+            logger.error(f"Failed to parse JSON response: {str(e)}")
+            logger.debug(f"Raw response content: {content}")
+            # Fallback if JSON parsing fails
+            analysis = {
+                'error': 'Failed to parse AI response as JSON',
+                'raw_response': raw_content,
+                'analyzed_at': now.isoformat(),
+                'model_version': "o3-mini"
+            }
+        return analysis
+
+    async def _get_cached(self, project_id: int, prompt_hash: str) -> Optional[dict]:
+        """Look up a cached analysis in memory, then on disk"""
+        cache_key = (project_id, prompt_hash)
+        if cache_key in self._mem_cache:
+            return self._mem_cache[cache_key]
+        
+        cache_file = self._by_hash.get(cache_key)
+        if cache_file:
+            try:
+                async with aiofiles.open(cache_file, 'rb') as f:
+                    analysis = orjson.loads(await f.read())
+            except FileNotFoundError:
+                # Removed outside this process; drop the stale index entry
+                del self._by_hash[cache_key]
+                return None
+            logger.info(f"Using cached analysis for project {project_id}")
+            self._mem_cache[cache_key] = analysis
+            return analysis
+        return None
+
+    async def _store_cached(self, project_id: int, prompt_hash: str, analysis: dict, day: str):
+        """Persist an analysis to both cache tiers"""
+        cache_file = self.cache_dir / f"analysis_{project_id}_{day}_{prompt_hash}.json"
+        async with aiofiles.open(cache_file, 'wb') as f:
+            await f.write(orjson.dumps(analysis))
+        self._mem_cache[(project_id, prompt_hash)] = analysis
+        self._by_hash[(project_id, prompt_hash)] = cache_file
+        self._latest[project_id] = cache_file
+        logger.info(f"Cached analysis results for project {project_id}")
+
+    async def _complete(self, request: dict) -> str:
+        """Send a chat completion request within the concurrency and rate limits"""
+        estimated_tokens = sum(estimate_tokens(m['content']) for m in request['messages'])
+        parts = []
+        usage = None
+        async with self._sem:
+            await self._rate_limit.acquire(estimated_tokens)
+            # Stream the completion so chunks are consumed as they arrive
+            raw_response = await self.client.chat.completions.with_raw_response.create(
+                **request,
+                stream=True,
+                stream_options={"include_usage": True}
             )
+            async for chunk in raw_response.parse():
+                if chunk.usage:
+                    usage = chunk.usage
+                if chunk.choices and chunk.choices[0].delta.content:
+                    parts.append(chunk.choices[0].delta.content)
+        if usage:
+            self._rate_limit.release(estimated_tokens, usage.total_tokens)
+        # Header values, when present, supersede the local estimate
+        self._rate_limit.update(raw_response.headers)
+        
+        content = "".join(parts)
+        logger.debug(f"OpenAI API response received: {len(content)} chars")
+        return content
+
+    @agentops.record_action('analyze_project')
+    async def analyze_project(self, prompt: str, project_id: int, refresh: bool = False) -> dict:
+        """Analyze project data using OpenAI's API; refresh skips the cache and replaces its entry"""
+        now = datetime.now()
+        
+        # Check cache first. Entries are keyed by the prompt contents so an
+        # unchanged project is not re-analyzed on a later day.
+        prompt_hash = hashlib.sha256(prompt.encode()).hexdigest()[:16]
+        if not refresh:
+            cached = await self._get_cached(project_id, prompt_hash)
+            if cached is not None:
+                return cached
+        
+        # Concurrent callers asking for the same analysis share one API call
+        cache_key = (project_id, prompt_hash)
+        while cache_key in self._inflight:
+            future = self._inflight[cache_key]
+            try:
+                return await asyncio.shield(future)
+            except asyncio.CancelledError:
+                # If the caller making the request was cancelled rather than this one, take it over
+                if not future.cancelled() or asyncio.current_task().cancelling():
+                    raise
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[cache_key] = future
+        try:
+            analysis = await self._request_analysis(prompt, project_id, prompt_hash, now)
+            future.set_result(analysis)
+            return analysis
+        finally:
+            del self._inflight[cache_key]
+            if not future.done():
+                future.cancel()
+
+    async def _request_analysis(self, prompt: str, project_id: int, prompt_hash: str, now: datetime) -> dict:
+        """Call the API for an uncached project and cache the result"""
+        try:
+            request = self._build_request(prompt)
             
-            logger.debug(f"OpenAI API response received: {len(response.choices[0].message.content)} chars")
+            logger.info(f"Making OpenAI API call for project {project_id}")
+            logger.debug(f"Using model: {request['model']}")
             
-            # Parse the JSON response
-            try:
-                content = response.choices[0].message.content
-                # Remove any potential markdown formatting (shouldn't be needed with the new prompt)
-                if content.startswith("```") and content.endswith("```"):
-                    content = content.split("```")[1]
-                    if content.startswith("json\n"):
-                        content = content[5:]
-                    elif content.startswith("\n"):
-                        content = content[1:]
-                    if content.endswith("\n"):
-                        content = content[:-1]
-                analysis = json.loads(content)
-                analysis.update({
-                    'analyzed_at': datetime.now().isoformat(),
-                    'model_version': "o3-mini"
-                })
-                logger.info(f"Successfully parsed JSON response for project {project_id}")
-            except json.JSONDecodeError as e:
-                logger.error(f"Failed to parse JSON response: {str(e)}")
-                logger.debug(f"Raw response content: {content}")
-                # Fallback if JSON parsing fails
-                analysis = {
-                    'error': 'Failed to parse AI response as JSON',
-                    'raw_response': response.choices[0].message.content,
-                    'analyzed_at': datetime.now().isoformat(),
-                    'model_version': "o3-mini"
-                }
+            content = await self._complete(request)
             
-            # Cache the results
-            with open(cache_file, 'w') as f:
-                json.dump(analysis, f, indent=2)
-            logger.info(f"Cached analysis results for project {project_id}")
+            # Parse the JSON response; only a successful parse is cached
+            analysis = self._parse_content(content, project_id, now)
+            if 'error' not in analysis:
+                await self._store_cached(project_id, prompt_hash, analysis, now.strftime('%Y%m%d'))
             
             return analysis
             
@@ -128,32 +328,194 @@ The response must be a valid JSON object with the following structure:
             logger.error(f"Error during analysis: {str(e)}")
             error_response = {
                 'error': str(e),
-                'analyzed_at': datetime.now().isoformat(),
+                'analyzed_at': now.isoformat(),
                 'status': 'failed'
             }
             return error_response
 
-    async def analyze_multiple_projects(self, project_prompts: Dict[int, str]) -> Dict[int, dict]:
-        """Analyze multiple projects in parallel"""
+    async def _analyze_group(self, group: List[Tuple[int, str, str]]) -> Dict[int, dict]:
+        """Analyze several small projects in a single chat request"""
+        # The grouping instruction goes in the user message so the system prefix stays cacheable
+        user_message = (
+            "The input contains several projects, each introduced by a ---PROJECT <id>--- line. "
+            "Return a JSON object whose keys are project IDs and whose values conform to the schema."
+        ) + "".join(
+            f"\n\n---PROJECT {project_id}---\n{prompt}" for project_id, prompt, _ in group
+        )
+        request = self._build_request(user_message)
+        
+        results = {}
+        try:
+            logger.info(f"Making OpenAI API call for projects {[project_id for project_id, _, _ in group]}")
+            content = await self._complete(request)
+            combined = orjson.loads(content)
+            now = datetime.now()
+            for project_id, _, prompt_hash in group:
+                analysis = combined.get(str(project_id))
+                if not isinstance(analysis, dict):
+                    continue
+                analysis.update({
+                    'analyzed_at': now.isoformat(),
+                    'model_version': request['model']
+                })
+                await self._store_cached(project_id, prompt_hash, analysis, now.strftime('%Y%m%d'))
+                results[project_id] = analysis
+        except Exception as e:
+            logger.warning(f"Grouped analysis failed, falling back to per-project calls: {str(e)}")
+        
+        # Anything the grouped reply did not cover is analyzed on its own
+        missing = [(project_id, prompt) for project_id, prompt, _ in group if project_id not in results]
+        if missing:
+            responses = await asyncio.gather(*(
+                self.analyze_project(prompt, project_id) for project_id, prompt in missing
+            ))
+            results.update(zip((project_id for project_id, _ in missing), responses))
+        return results
+
+    async def analyze_multiple_projects(self, project_prompts: Dict[int, str], group_size: int = 4) -> Dict[int, dict]:
+        """Analyze multiple projects in parallel, packing small prompts into shared requests"""
         results = {}
+        groups: List[List[Tuple[int, str, str]]] = []
+        group_tokens = 0
         for project_id, prompt in project_prompts.items():
-            results[project_id] = await self.analyze_project(prompt, project_id)
+            prompt_hash = hashlib.sha256(prompt.encode()).hexdigest()[:16]
+            cached = await self._get_cached(project_id, prompt_hash)
+            if cached is not None:
+                results[project_id] = cached
+                continue
+            tokens = estimate_tokens(prompt)
+            if groups and len(groups[-1]) < group_size and group_tokens + tokens <= _GROUP_TOKEN_LIMIT:
+                groups[-1].append((project_id, prompt, prompt_hash))
+                group_tokens += tokens
+            else:
+                groups.append([(project_id, prompt, prompt_hash)])
+                group_tokens = tokens
+        
+        tasks = [
+            asyncio.create_task(
+                self._analyze_group(group) if len(group) > 1
+                else self.analyze_project(group[0][1], group[0][0])
+            )
+            for group in groups
+        ]
+        responses = await asyncio.gather(*tasks, return_exceptions=True)
+        
+        for group, response in zip(groups, responses):
+            if isinstance(response, Exception):
+                for project_id, _, _ in group:
+                    logger.error(f"Error analyzing project {project_id}: {str(response)}")
+                    results[project_id] = {
+                        'error': str(response),
+                        'analyzed_at': datetime.now().isoformat(),
+                        'status': 'failed'
+                    }
+            elif len(group) > 1:
+                results.update(response)
+            else:
+                results[group[0][0]] = response
+        return {project_id: results[project_id] for project_id in project_prompts}
+
+    async def analyze_batch(self, project_prompts: Dict[int, str], poll_interval: float = 30.0) -> Dict[int, dict]:
+        """Analyze projects through the OpenAI Batch API for offline bulk runs"""
+        results = {}
+        pending = {}
+        for project_id, prompt in project_prompts.items():
+            prompt_hash = hashlib.sha256(prompt.encode()).hexdigest()[:16]
+            cached = await self._get_cached(project_id, prompt_hash)
+            if cached is not None:
+                results[project_id] = cached
+            else:
+                pending[project_id] = (prompt, prompt_hash)
+        if not pending:
+            return results
+        
+        def failed(error: str) -> dict:
+            return {
+                'error': error,
+                'analyzed_at': datetime.now().isoformat(),
+                'status': 'failed'
+            }
+        
+        try:
+            lines = [
+                orjson.dumps({
+                    "custom_id": str(project_id),
+                    "method": "POST",
+                    "url": "/v1/chat/completions",
+                    "body": self._build_request(prompt)
+                })
+                for project_id, (prompt, _) in pending.items()
+            ]
+            batch_file = await self.client.files.create(
+                file=("batch.jsonl", b"\n".join(lines)),
+                purpose="batch"
+            )
+            batch = await self.client.batches.create(
+                input_file_id=batch_file.id,
+                endpoint="/v1/chat/completions",
+                completion_window="24h"
+            )
+            logger.info(f"Submitted batch {batch.id} for {len(pending)} projects")
+            
+            delay = poll_interval
+            while batch.status not in ('completed', 'failed', 'expired', 'cancelled'):
+                await asyncio.sleep(delay)
+                delay = min(delay * 2, 600)
+                batch = await self.client.batches.retrieve(batch.id)
+                logger.debug(f"Batch {batch.id} status: {batch.status}")
+            
+            if batch.status != 'completed' or not batch.output_file_id:
+                raise RuntimeError(f"Batch {batch.id} ended with status {batch.status}")
+            
+            output = await self.client.files.content(batch.output_file_id)
+            now = datetime.now()
+            day = now.strftime('%Y%m%d')
+            for line in output.text.splitlines():
+                if not line.strip():
+                    continue
+                row = orjson.loads(line)
+                project_id = int(row['custom_id'])
+                if project_id not in pending:
+                    continue
+                response = row.get('response') or {}
+                if response.get('status_code') != 200:
+                    error = (row.get('error') or {}).get('message') or f"HTTP {response.get('status_code')}"
+                    results[project_id] = failed(error)
+                    continue
+                content = response['body']['choices'][0]['message']['content']
+                analysis = self._parse_content(content, project_id, now)
+                if 'error' not in analysis:
+                    await self._store_cached(project_id, pending[project_id][1], analysis, day)
+                results[project_id] = analysis
+        except Exception as e:
+            logger.error(f"Error during batch analysis: {str(e)}")
+            for project_id in pending:
+                results.setdefault(project_id, failed(str(e)))
+            return results
+        
+        for project_id in pending:
+            results.setdefault(project_id, failed('No result returned in batch output'))
         return results
 
-    def get_cached_analysis(self, project_id: int, date: Optional[str] = None) -> Optional[dict]:
+    async def get_cached_analysis(self, project_id: int, date: Optional[str] = None) -> Optional[dict]:
         """Retrieve cached analysis for a project"""
-        if date:
-            cache_file = self.cache_dir / f"analysis_{project_id}_{date}.json"
-            if cache_file.exists():
-                with open(cache_file) as f:
-                    return json.load(f)
-        else:
+        # A file deleted since it was indexed is retried once against a fresh index
+        for attempt in range(2):
+            if date:
+                # Matches both analysis_<id>_<date>.json and analysis_<id>_<date>_<hash>.json
+                files = list(self.cache_dir.glob(f"analysis_{project_id}_{date}*.json"))
+                latest = max(files, key=lambda x: x.stat().st_mtime) if files else None
+            else:
+                latest = self._latest.get(project_id)
+            
             # Get most recent analysis
-            files = list(self.cache_dir.glob(f"analysis_{project_id}_*.json"))
-            if files:
-                latest = max(files, key=lambda x: x.stat().st_mtime)
-                with open(latest) as f:
-                    return json.load(f)
+            if not latest:
+                return None
+            try:
+                async with aiofiles.open(latest, 'rb') as f:
+                    return orjson.loads(await f.read())
+            except FileNotFoundError:
+                self._index_cache_dir()
         return None
 
     def clear_cache(self, project_id: Optional[int] = None, before_date: Optional[str] = None):
@@ -165,8 +527,15 @@ The response must be a valid JSON object with the following structure:
             
         for file in self.cache_dir.glob(pattern):
             if before_date:
-                file_date = file.stem.split('_')[-1]
+                file_date = file.stem.split('_')[2]
                 if file_date < before_date:
                     file.unlink()
             else:
-                file.unlink() 
\ No newline at end of file
+                file.unlink()
+        
+        self._index_cache_dir()
+        
+        # The memory tier is repopulated from disk on demand
+        for cache_key in list(self._mem_cache):
+            if not project_id or cache_key[0] == project_id:
+                del self._mem_cache[cache_key] 
\ No newline at end of file
@@ -1,10 +1,14 @@
 """Module for analyzing detailed project data and preparing it for AI analysis."""
+import re
 from datetime import datetime
-from typing import Dict, List, Optional, Any
-import json
+from typing import Dict, List, Optional, Any, NamedTuple, Tuple
+import orjson
+import pandas as pd
 from pathlib import Path
 import agentops
-from functools import wraps
+from functools import wraps, cached_property
+from operator import itemgetter
+from collections import Counter
 
 def handle_errors(func):
     @wraps(func)
@@ -16,7 +20,25 @@ def handle_errors(func):
             raise
     return wrapper
 
+# Below this many tickets the DataFrame setup costs more than the plain loop saves
+_VECTORIZE_THRESHOLD = 100
+
+class TicketScan(NamedTuple):
+    """Ticket counters gathered in one pass over a project's tickets."""
+    status_dist: Dict[str, int]
+    priority_dist: Dict[str, int]
+    completed: int
+    in_progress: int
+    new_tickets: int
+    stalled_tickets: List[Dict[str, Any]]
+    unassigned_tickets: List[Dict[str, Any]]
+    member_allocation: Dict[str, Dict[str, Any]]
+
 class DetailedProjectAnalyzer:
+    # Note phrases that mark a status change or a key update on a ticket
+    _STATUS_RE = re.compile(r'status changed to|moved to', re.I)
+    _UPDATE_RE = re.compile(r'completed|blocked|updated|fixed|implemented', re.I)
+
     def __init__(self, project_data: Dict[str, Any]):
         self.project_data = project_data
         self.project = project_data['project']
@@ -25,6 +47,9 @@ class DetailedProjectAnalyzer:
         self.project_notes = project_data['project_notes']
         self.time_entries = project_data['project_time_entries']
         self.members = project_data['members']
+        # Per-instance memo so repeated timeline/prompt builds don't rescan the notes
+        self._ticket_progress: Dict[int, dict] = {}
+        self._ticket_summaries: Dict[int, dict] = {}
 
     @handle_errors
     def analyze(self) -> Dict[str, Any]:
@@ -40,105 +65,165 @@ class DetailedProjectAnalyzer:
     @handle_errors
     def _analyze_project_metrics(self) -> Dict[str, Any]:
         """Analyze basic project metrics."""
+        estimated = self.project.get("estimatedHours", 0)
         return {
             "id": self.project["id"],
             "name": self.project["name"],
-            "company": self.project.get("company", {}).get("name", "No Company Listed"),
+            "company": (self.project.get("company") or {}).get("name", "No Company Listed"),
             "hours": {
                 "actual": self.project["actualHours"],
-                "estimated": self.project.get("estimatedHours", 0),
-                "has_estimates": self.project.get("estimatedHours", 0) > 0
+                "estimated": estimated,
+                "has_estimates": estimated > 0
             },
             "status": self.project["status"]["name"],
             "start_date": self.project.get("scheduledStart"),
-            "manager": self.project.get("manager", {}).get("identifier")
+            "manager": (self.project.get("manager") or {}).get("identifier")
         }
 
-    @handle_errors
-    def _analyze_tickets(self) -> Dict[str, Any]:
-        """Analyze ticket metrics and distributions."""
-        status_dist = {}
-        priority_dist = {}
+    @cached_property
+    def _scan_tickets(self) -> TicketScan:
+        """Collect all ticket counters, vectorized for large projects."""
+        if len(self.tickets) >= _VECTORIZE_THRESHOLD:
+            return self._scan_ticket_frame()
+        return self._scan_ticket_loop()
+
+    def _scan_ticket_loop(self) -> TicketScan:
+        """Collect all ticket counters in a single pass over the tickets.
+
+        A null ``actualHours`` counts as missing: the ticket is unassigned,
+        and stalled if it is still New.
+        """
+        status_dist = Counter()
+        priority_dist = Counter()
         stalled_tickets = []
         unassigned_tickets = []
-        completed = 0
-        in_progress = 0
-        new_tickets = 0
+        member_allocation = {}
 
         for ticket in self.tickets:
             # Status distribution
             status = ticket["status"]["name"]
-            status_dist[status] = status_dist.get(status, 0) + 1
+            status_dist[status] += 1
             
             # Priority distribution
             priority = ticket["priority"]["name"]
-            priority_dist[priority] = priority_dist.get(priority, 0) + 1
+            priority_dist[priority] += 1
             
-            # Track completion
-            if status == "Completed":
-                completed += 1
-            elif status == "In Progress":
-                in_progress += 1
-            elif status == "New":
-                new_tickets += 1
-                
             # Track unassigned
-            if "actualHours" not in ticket:
+            hours = ticket.get("actualHours")
+            if hours is None:
                 unassigned_tickets.append({
                     "id": ticket["id"],
                     "summary": ticket["summary"]
                 })
             
             # Track stalled
-            if status == "New" and ticket.get("actualHours", 0) == 0:
+            if status == "New" and (hours or 0) == 0:
                 stalled_tickets.append({
                     "id": ticket["id"],
                     "summary": ticket["summary"]
                 })
-
-        return {
-            "total_tickets": len(self.tickets),
-            "status_distribution": status_dist,
-            "priority_distribution": priority_dist,
-            "completion_metrics": {
-                "completed": completed,
-                "in_progress": in_progress,
-                "new": new_tickets,
-                "completion_rate": (completed / len(self.tickets) * 100) if self.tickets else 0
-            },
-            "stalled_tickets": stalled_tickets,
-            "unassigned_tickets": unassigned_tickets
-        }
-
-    @handle_errors
-    def _analyze_resources(self) -> Dict[str, Any]:
-        """Analyze resource allocation and utilization."""
-        member_allocation = {}
-        
-        # Track ticket assignments
-        for ticket in self.tickets:
+            
+            # Track ticket assignments
             assignee = ticket.get("assignedTo", {}).get("identifier")
             if assignee:
                 if assignee not in member_allocation:
                     member_allocation[assignee] = {
                         "assigned_tickets": 0,
                         "completed_tickets": 0,
-                        "hours_logged": 0
+                        "hours_logged": 0.0
                     }
                 member_allocation[assignee]["assigned_tickets"] += 1
-                if ticket["status"]["name"] == "Completed":
+                if status == "Completed":
                     member_allocation[assignee]["completed_tickets"] += 1
-                if "actualHours" in ticket:
-                    member_allocation[assignee]["hours_logged"] += ticket["actualHours"]
+                if hours is not None:
+                    member_allocation[assignee]["hours_logged"] += float(hours)
 
+        # Completion counters come straight from the status distribution
+        return TicketScan(
+            status_dist=dict(status_dist),
+            priority_dist=dict(priority_dist),
+            completed=status_dist["Completed"],
+            in_progress=status_dist["In Progress"],
+            new_tickets=status_dist["New"],
+            stalled_tickets=stalled_tickets,
+            unassigned_tickets=unassigned_tickets,
+            member_allocation=member_allocation
+        )
+
+    def _scan_ticket_frame(self) -> TicketScan:
+        """Vectorized equivalent of _scan_ticket_loop for large projects."""
+        df = pd.json_normalize(self.tickets)
+        status = df["status.name"]
+        # Missing and null hours both normalize to NaN, matching the loop's rule
+        hours = pd.to_numeric(df["actualHours"]) if "actualHours" in df else pd.Series(float("nan"), index=df.index)
+        has_hours = hours.notna()
+        is_completed = status == "Completed"
+        
+        stalled_mask = (status == "New") & (hours.fillna(0) == 0)
+        
+        member_allocation = {}
+        if "assignedTo.identifier" in df:
+            assigned = pd.DataFrame({
+                "assignee": df["assignedTo.identifier"],
+                "completed": is_completed,
+                "hours": hours.where(has_hours, 0)
+            })
+            assigned = assigned[assigned["assignee"].notna() & (assigned["assignee"] != "")]
+            grouped = assigned.groupby("assignee", sort=False).agg(
+                assigned_tickets=("completed", "size"),
+                completed_tickets=("completed", "sum"),
+                hours_logged=("hours", "sum")
+            )
+            member_allocation = {
+                assignee: {
+                    "assigned_tickets": int(row.assigned_tickets),
+                    "completed_tickets": int(row.completed_tickets),
+                    "hours_logged": float(row.hours_logged)
+                }
+                for assignee, row in grouped.iterrows()
+            }
+
+        return TicketScan(
+            status_dist={k: int(v) for k, v in status.value_counts(sort=False).items()},
+            priority_dist={k: int(v) for k, v in df["priority.name"].value_counts(sort=False).items()},
+            completed=int(is_completed.sum()),
+            in_progress=int((status == "In Progress").sum()),
+            new_tickets=int((status == "New").sum()),
+            stalled_tickets=df.loc[stalled_mask, ["id", "summary"]].to_dict("records"),
+            unassigned_tickets=df.loc[~has_hours, ["id", "summary"]].to_dict("records"),
+            member_allocation=member_allocation
+        )
+
+    @handle_errors
+    def _analyze_tickets(self) -> Dict[str, Any]:
+        """Analyze ticket metrics and distributions."""
+        scan = self._scan_tickets
+        return {
+            "total_tickets": len(self.tickets),
+            "status_distribution": scan.status_dist,
+            "priority_distribution": scan.priority_dist,
+            "completion_metrics": {
+                "completed": scan.completed,
+                "in_progress": scan.in_progress,
+                "new": scan.new_tickets,
+                "completion_rate": (scan.completed / len(self.tickets) * 100) if self.tickets else 0
+            },
+            "stalled_tickets": scan.stalled_tickets,
+            "unassigned_tickets": scan.unassigned_tickets
+        }
+
+    @handle_errors
+    def _analyze_resources(self) -> Dict[str, Any]:
+        """Analyze resource allocation and utilization."""
         return {
             "team_size": len(self.members),
-            "member_allocation": member_allocation
+            "member_allocation": self._scan_tickets.member_allocation
         }
 
     @handle_errors
     def _analyze_risks(self) -> Dict[str, Any]:
         """Identify project risks based on metrics."""
+        scan = self._scan_tickets
         risks = []
         risk_level = "LOW"
         
@@ -148,20 +233,19 @@ class DetailedProjectAnalyzer:
             risk_level = "MEDIUM"
         
         # Check for stalled tickets
-        stalled_count = len([t for t in self.tickets if t["status"]["name"] == "New" and t.get("actualHours", 0) == 0])
+        stalled_count = len(scan.stalled_tickets)
         if stalled_count > 5:
             risks.append(f"High number of stalled tickets ({stalled_count})")
             risk_level = "HIGH"
         
         # Check for unassigned tickets
-        unassigned_count = len([t for t in self.tickets if "actualHours" not in t])
+        unassigned_count = len(scan.unassigned_tickets)
         if unassigned_count > 5:
             risks.append(f"High number of unassigned tickets ({unassigned_count})")
             risk_level = "HIGH"
         
         # Check completion rate
-        completed_count = len([t for t in self.tickets if t["status"]["name"] == "Completed"])
-        completion_rate = (completed_count / len(self.tickets)) if self.tickets else 0
+        completion_rate = (scan.completed / len(self.tickets)) if self.tickets else 0
         if completion_rate < 0.2:
             risks.append(f"Low completion rate ({completion_rate:.1%})")
             risk_level = "MEDIUM"
@@ -173,6 +257,9 @@ class DetailedProjectAnalyzer:
 
     def analyze_ticket_progress(self, ticket_id: int) -> dict:
         """Analyze progress and timeline of a specific ticket"""
+        if ticket_id in self._ticket_progress:
+            return self._ticket_progress[ticket_id]
+        
         # Convert ticket_id to string for dictionary lookup
         ticket_data = self.ticket_details[str(ticket_id)]
         ticket = ticket_data['ticket']
@@ -182,15 +269,15 @@ class DetailedProjectAnalyzer:
         # Analyze notes for status changes and key updates
         status_changes = []
         key_updates = []
-        for note in sorted(notes, key=lambda x: x.get('dateCreated', ''), reverse=True):
+        for note in notes:
             if 'dateCreated' not in note or 'text' not in note:
                 continue
                 
-            text = note['text'].lower()
+            text = note['text']
             date = note['dateCreated']
             
             # Look for status change indicators
-            if 'status changed to' in text or 'moved to' in text:
+            if self._STATUS_RE.search(text):
                 status_changes.append({
                     'date': date,
                     'text': note.get('text', ''),
@@ -198,12 +285,16 @@ class DetailedProjectAnalyzer:
                 })
             
             # Look for key update indicators
-            if any(key in text for key in ['completed', 'blocked', 'updated', 'fixed', 'implemented']):
+            if self._UPDATE_RE.search(text):
                 key_updates.append({
                     'date': date,
                     'text': note.get('text', ''),
                     'by': note.get('createdBy', 'Unknown')
                 })
+        
+        # Newest first; only the matched notes need ordering
+        status_changes.sort(key=itemgetter('date'), reverse=True)
+        key_updates.sort(key=itemgetter('date'), reverse=True)
 
         # Analyze time entries
         time_analysis = {
@@ -221,7 +312,7 @@ class DetailedProjectAnalyzer:
             if 'member/identifier' in entry:
                 time_analysis['contributors'].add(entry['member/identifier'])
 
-        return {
+        self._ticket_progress[ticket_id] = {
             'ticket_id': ticket_id,
             'summary': ticket.get('summary', ''),
             'current_status': ticket.get('status', {}).get('name', 'Unknown'),
@@ -233,27 +324,42 @@ class DetailedProjectAnalyzer:
             'key_updates': key_updates,
             'time_analysis': time_analysis
         }
+        return self._ticket_progress[ticket_id]
+
+    def _ticket_summary(self, ticket_id: int) -> dict:
+        """Summarize a ticket's progress without assembling the full note analysis"""
+        if ticket_id in self._ticket_summaries:
+            return self._ticket_summaries[ticket_id]
+        
+        ticket_data = self.ticket_details[str(ticket_id)]
+        ticket = ticket_data['ticket']
+        key_updates = 0
+        for note in ticket_data['notes']:
+            if 'dateCreated' not in note or 'text' not in note:
+                continue
+            if self._UPDATE_RE.search(note['text']):
+                key_updates += 1
+        
+        self._ticket_summaries[ticket_id] = {
+            'id': ticket_id,
+            'summary': ticket.get('summary', ''),
+            'status': ticket.get('status', {}).get('name', 'Unknown'),
+            'progress': min(100, round((ticket.get('actualHours', 0) or 0) / (ticket.get('estimatedHours', 0) or 1) * 100)),
+            'key_updates': key_updates
+        }
+        return self._ticket_summaries[ticket_id]
 
     def analyze_project_timeline(self) -> dict:
         """Analyze the overall project timeline and progress"""
         
-        # Collect all status changes and updates
-        all_status_changes = []
-        all_time_entries = []
+        # Create ticket summaries, counting open tickets in the same pass
         ticket_summaries = []
-
-        for ticket_id_str, details in self.ticket_details.items():
-            analysis = self.analyze_ticket_progress(int(ticket_id_str))
-            all_status_changes.extend(analysis['status_changes'])
-            
-            # Create ticket summary
-            ticket_summaries.append({
-                'id': int(ticket_id_str),  # Convert back to int for consistency
-                'summary': analysis['summary'],
-                'status': analysis['current_status'],
-                'progress': min(100, round((analysis['actual_hours'] or 0) / (analysis['estimated_hours'] or 1) * 100)),
-                'key_updates': len(analysis['key_updates'])
-            })
+        active_tickets = 0
+        for ticket_id_str in self.ticket_details:
+            summary = self._ticket_summary(int(ticket_id_str))  # Convert back to int for consistency
+            ticket_summaries.append(summary)
+            if summary['status'] not in ['Closed', 'Completed']:
+                active_tickets += 1
 
         # Analyze project notes
         project_updates = []
@@ -275,17 +381,25 @@ class DetailedProjectAnalyzer:
             'estimated_hours': self.project['estimatedHours'],
             'actual_hours': self.project['actualHours'],
             'ticket_count': len(self.tickets),
-            'active_tickets': sum(1 for t in ticket_summaries if t['status'] not in ['Closed', 'Completed']),
+            'active_tickets': active_tickets,
             'ticket_summaries': ticket_summaries,
             'project_updates': sorted(project_updates, key=lambda x: x['date'], reverse=True),
             'team_members': [m.get('identifier', str(m['id'])) for m in self.members],
             'analysis_date': datetime.now().isoformat()
         }
 
+    def analyze_and_prepare_prompt(self) -> Tuple[dict, str]:
+        """Build the project timeline and the AI prompt from a single pass over the tickets"""
+        timeline = self.analyze_project_timeline()
+        return timeline, self._render_prompt(timeline)
+
     def prepare_ai_prompt(self) -> str:
         """Prepare a detailed prompt for AI analysis"""
-        timeline = self.analyze_project_timeline()
-        
+        return self._render_prompt(self.analyze_project_timeline())
+
+    @staticmethod
+    def _render_prompt(timeline: dict) -> str:
+        """Format an analyzed timeline as the AI prompt"""
         prompt = f"""Analyze the following project data and provide insights:
 
 Project: {timeline['project_name']} (ID: {timeline['project_id']})
@@ -321,8 +435,8 @@ Please analyze:
 @handle_errors
 def analyze_project_file(file_path: str) -> Dict[str, Any]:
     """Analyze a project from a JSON file."""
-    with open(file_path, 'r') as f:
-        project_data = json.load(f)
+    with open(file_path, 'rb') as f:
+        project_data = orjson.loads(f.read())
     
     analyzer = DetailedProjectAnalyzer(project_data)
     return analyzer.analyze() 
\ No newline at end of file
@@ -1,9 +1,10 @@
 """Project data analysis module for generating quick insights."""
 
 from typing import Dict, List, Any
+from collections import Counter, defaultdict
 from datetime import datetime
 from pathlib import Path
-import json
+import orjson
 
 class ProjectAnalyzer:
     def __init__(self, project_data: Dict[str, Any]):
@@ -13,115 +14,110 @@ class ProjectAnalyzer:
         self.time_entries = project_data['time_entries']
         self.notes = project_data['notes']
         self.members = project_data['members']
+        
+        # Ticket indices grouped by status name, in first-seen order
+        self._by_status: Dict[str, List[int]] = defaultdict(list)
+        for i, ticket in enumerate(self.tickets):
+            self._by_status[ticket["status"]["name"]].append(i)
+
+    def analyze(self, detail: bool = True) -> Dict[str, Any]:
+        """Run all analysis and return combined metrics.
 
-    def analyze(self) -> Dict[str, Any]:
-        """Run all analysis and return combined metrics."""
+        The ticket analysis lists the stalled and unassigned tickets; pass
+        ``detail=False`` to report only their counts.
+        """
+        ticket_analysis = self._analyze_tickets(detail)
         return {
             "project_metrics": self._analyze_project_metrics(),
-            "ticket_analysis": self._analyze_tickets(),
+            "ticket_analysis": ticket_analysis,
             "resource_metrics": self._analyze_resources(),
-            "risk_indicators": self._analyze_risks(),
+            "risk_indicators": self._analyze_risks(ticket_analysis),
             "tickets": self.tickets  # Add raw tickets to output
         }
 
     def _analyze_project_metrics(self) -> Dict[str, Any]:
         """Analyze basic project metrics."""
+        estimated = self.project.get("estimatedHours", 0)
         return {
             "id": self.project["id"],
             "name": self.project["name"],
-            "company": self.project.get("company", {}).get("name", "No Company Listed"),
+            "company": (self.project.get("company") or {}).get("name", "No Company Listed"),
             "hours": {
                 "actual": self.project["actualHours"],
-                "estimated": self.project.get("estimatedHours", 0),
-                "has_estimates": self.project.get("estimatedHours", 0) > 0
+                "estimated": estimated,
+                "has_estimates": estimated > 0
             },
             "status": self.project["status"]["name"],
             "start_date": self.project.get("scheduledStart"),
-            "manager": self.project.get("manager", {}).get("identifier")
+            "manager": (self.project.get("manager") or {}).get("identifier")
         }
 
-    def _analyze_tickets(self) -> Dict[str, Any]:
+    def _analyze_tickets(self, detail: bool = True) -> Dict[str, Any]:
         """Analyze ticket metrics and distributions."""
-        status_dist = {}
-        priority_dist = {}
-        stalled_tickets = []
-        unassigned_tickets = []
-        completed = 0
-        in_progress = 0
-        new_tickets = 0
+        status_dist = {status: len(indices) for status, indices in self._by_status.items()}
+        priority_dist = Counter(ticket["priority"]["name"] for ticket in self.tickets)
+        completed = status_dist.get("Completed", 0)
+        in_progress = status_dist.get("In Progress", 0)
+        new_tickets = status_dist.get("New", 0)
 
-        for ticket in self.tickets:
-            # Status distribution
-            status = ticket["status"]["name"]
-            status_dist[status] = status_dist.get(status, 0) + 1
-            
-            # Priority distribution
-            priority = ticket["priority"]["name"]
-            priority_dist[priority] = priority_dist.get(priority, 0) + 1
-            
-            # Track completion
-            if status == "Completed":
-                completed += 1
-            elif status == "In Progress":
-                in_progress += 1
-            elif status == "New":
-                new_tickets += 1
-                
-            # Track unassigned
-            if "actualHours" not in ticket:
-                unassigned_tickets.append({
-                    "id": ticket["id"],
-                    "summary": ticket["summary"]
-                })
-            
-            # Track stalled
-            if status == "New" and ticket.get("actualHours", 0) == 0:
-                stalled_tickets.append({
-                    "id": ticket["id"],
-                    "summary": ticket["summary"]
-                })
+        # Track unassigned
+        unassigned = [ticket for ticket in self.tickets if "actualHours" not in ticket]
+        
+        # Track stalled; only New tickets can be stalled
+        stalled = [
+            self.tickets[i] for i in self._by_status.get("New", ())
+            if self.tickets[i].get("actualHours", 0) == 0
+        ]
 
-        return {
+        analysis = {
             "total_tickets": len(self.tickets),
             "status_distribution": status_dist,
-            "priority_distribution": priority_dist,
+            "priority_distribution": dict(priority_dist),
             "completion_metrics": {
                 "completed": completed,
                 "in_progress": in_progress,
                 "new": new_tickets,
                 "completion_rate": (completed / len(self.tickets) * 100) if self.tickets else 0
             },
-            "stalled_tickets": stalled_tickets,
-            "unassigned_tickets": unassigned_tickets
+            "stalled_count": len(stalled),
+            "unassigned_count": len(unassigned)
         }
+        if detail:
+            analysis["stalled_tickets"] = [{"id": t["id"], "summary": t["summary"]} for t in stalled]
+            analysis["unassigned_tickets"] = [{"id": t["id"], "summary": t["summary"]} for t in unassigned]
+        return analysis
 
     def _analyze_resources(self) -> Dict[str, Any]:
         """Analyze resource allocation and utilization."""
-        member_allocation = {}
+        # [assigned_tickets, completed_tickets, hours_logged] per assignee
+        allocation = defaultdict(lambda: [0, 0, 0])
         
-        # Track ticket assignments
+        # Track ticket assignments; null hours count as none logged
         for ticket in self.tickets:
             assignee = ticket.get("assignedTo", {}).get("identifier")
             if assignee:
-                if assignee not in member_allocation:
-                    member_allocation[assignee] = {
-                        "assigned_tickets": 0,
-                        "completed_tickets": 0,
-                        "hours_logged": 0
-                    }
-                member_allocation[assignee]["assigned_tickets"] += 1
+                counts = allocation[assignee]
+                counts[0] += 1
                 if ticket["status"]["name"] == "Completed":
-                    member_allocation[assignee]["completed_tickets"] += 1
-                if "actualHours" in ticket:
-                    member_allocation[assignee]["hours_logged"] += ticket["actualHours"]
+                    counts[1] += 1
+                hours = ticket.get("actualHours")
+                if hours is not None:
+                    counts[2] += hours
 
         return {
             "team_size": len(self.members),
-            "member_allocation": member_allocation
+            "member_allocation": {
+                assignee: {
+                    "assigned_tickets": assigned,
+                    "completed_tickets": completed,
+                    "hours_logged": hours
+                }
+                for assignee, (assigned, completed, hours) in allocation.items()
+            }
         }
 
-    def _analyze_risks(self) -> Dict[str, Any]:
-        """Identify project risks based on metrics."""
+    def _analyze_risks(self, ticket_stats: Dict[str, Any]) -> Dict[str, Any]:
+        """Identify project risks based on metrics from _analyze_tickets."""
         risks = []
         risk_level = "LOW"
         
@@ -131,36 +127,38 @@ class ProjectAnalyzer:
             risk_level = "MEDIUM"
         
         # Check for stalled tickets
-        stalled_count = len([t for t in self.tickets if t["status"]["name"] == "New" and t.get("actualHours", 0) == 0])
+        stalled_count = ticket_stats["stalled_count"]
         if stalled_count > 5:
             risks.append(f"High number of stalled tickets ({stalled_count})")
             risk_level = "HIGH"
         
         # Check for unassigned tickets
-        unassigned_count = len([t for t in self.tickets if "actualHours" not in t])
+        unassigned_count = ticket_stats["unassigned_count"]
         if unassigned_count > 5:
             risks.append(f"High number of unassigned tickets ({unassigned_count})")
             risk_level = "HIGH"
         
         # Check completion rate
-        completed_count = len([t for t in self.tickets if t["status"]["name"] == "Completed"])
-        completion_rate = (completed_count / len(self.tickets)) if self.tickets else 0
+        total = ticket_stats["total_tickets"]
+        completion_rate = (ticket_stats["completion_metrics"]["completed"] / total) if total else 0
         if completion_rate < 0.2:
             risks.append(f"Low completion rate ({completion_rate:.1%})")
-            risk_level = "MEDIUM"
+            # Only raises the level; a HIGH project stays HIGH
+            if risk_level != "HIGH":
+                risk_level = "MEDIUM"
 
         return {
             "risk_level": risk_level,
             "risk_factors": risks
         }
 
-def analyze_project_file(file_path: str) -> Dict[str, Any]:
-    """Analyze a project from a JSON file."""
-    with open(file_path, 'r') as f:
-        project_data = json.load(f)
+def analyze_project_file(file_path: str, detail: bool = True) -> Dict[str, Any]:
+    """Analyze a project from a JSON file, listing stalled/unassigned tickets by default."""
+    with open(file_path, 'rb') as f:
+        project_data = orjson.loads(f.read())
     
     analyzer = ProjectAnalyzer(project_data)
-    return analyzer.analyze()
+    return analyzer.analyze(detail=detail)
 
 if __name__ == "__main__":
     # Example usage
@@ -171,6 +169,6 @@ if __name__ == "__main__":
         
         # Save analysis results
         output_file = project_file.parent / f"{project_file.stem}_analysis.json"
-        with open(output_file, 'w') as f:
-            json.dump(analysis, f, indent=2)
+        with open(output_file, 'wb') as f:
+            f.write(orjson.dumps(analysis, option=orjson.OPT_INDENT_2))
         print(f"Analysis saved to {output_file}") 
\ No newline at end of file
@@ -1,8 +1,11 @@
-import json
-from typing import Dict, Any, Optional
+import orjson
+from typing import Dict, Any, Optional, ClassVar, Tuple
 from pathlib import Path
 
 class ProjectConfig:
+    # Parsed config files shared across instances, keyed by path with their mtime
+    _cache: ClassVar[Dict[Path, Tuple[float, Dict[str, Any]]]] = {}
+
     def __init__(self, config_path: str = "project_config.json"):
         self.config_path = Path(config_path)
         self.config: Dict[str, Any] = {}
@@ -13,8 +16,15 @@ class ProjectConfig:
         if not self.config_path.exists():
             raise FileNotFoundError(f"Configuration file not found: {self.config_path}")
         
-        with open(self.config_path, 'r') as f:
-            self.config = json.load(f)
+        mtime = self.config_path.stat().st_mtime
+        cached = self._cache.get(self.config_path)
+        if cached and cached[0] == mtime:
+            self.config = cached[1]
+            return
+        
+        with open(self.config_path, 'rb') as f:
+            self.config = orjson.loads(f.read())
+        self._cache[self.config_path] = (mtime, self.config)
 
     def get_project_config(self, project_id: str) -> Optional[Dict[str, Any]]:
         """Get configuration for a specific project"""
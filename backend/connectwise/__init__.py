@@ -1,15 +1,23 @@
 """ConnectWise API Client Package"""
 
-from .client import ConnectWiseClient, RateLimiter
-from .models import Project, TimeEntry, Ticket, Note, Member, Status
+from .client import ConnectWiseClient, ConnectWiseAPIError, RateLimiter
+from .models import (
+    Project, TimeEntry, Ticket, Note, Member, Status,
+    PROJECT_LIST_ADAPTER, TICKET_LIST_ADAPTER, TIME_ENTRY_LIST_ADAPTER, NOTE_LIST_ADAPTER
+)
 
 __all__ = [
     'ConnectWiseClient',
+    'ConnectWiseAPIError',
     'RateLimiter',
     'Project',
     'TimeEntry',
     'Ticket',
     'Note',
     'Member',
-    'Status'
+    'Status',
+    'PROJECT_LIST_ADAPTER',
+    'TICKET_LIST_ADAPTER',
+    'TIME_ENTRY_LIST_ADAPTER',
+    'NOTE_LIST_ADAPTER'
 ] 
\ No newline at end of file
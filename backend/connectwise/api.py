@@ -1,6 +1,7 @@
 import asyncio
-from typing import Optional, Dict
+from typing import Optional, Dict, List, Any, Awaitable
 import httpx
+import orjson
 
 class ConnectWiseAPI:
     """
@@ -10,12 +11,33 @@ class ConnectWiseAPI:
         base_url (str): The base URL of the ConnectWise API.
         client_id (str): The client ID for authentication, passed in HTTP headers.
         timeout (float): The timeout for HTTP requests.
+    
+    The underlying HTTP client is created on first use and kept open so
+    connections are reused across calls; call ``aclose`` when finished.
     """
     def __init__(self, base_url: str, client_id: str, timeout: float = 10.0):
         self.base_url = base_url.rstrip('/')
         self.client_id = client_id
         self.timeout = timeout
         self.headers = {"clientId": self.client_id}
+        self._client: Optional[httpx.AsyncClient] = None
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        """Get or create the pooled HTTP client"""
+        if self._client is None or self._client.is_closed:
+            self._client = httpx.AsyncClient(
+                timeout=self.timeout,
+                headers=self.headers,
+                limits=httpx.Limits(max_keepalive_connections=20, max_connections=50),
+                http2=True
+            )
+        return self._client
+
+    async def aclose(self):
+        """Close the pooled HTTP client"""
+        if self._client and not self._client.is_closed:
+            await self._client.aclose()
 
     async def _request(self, method: str, endpoint: str, params: Optional[dict] = None) -> Dict:
         """
@@ -30,10 +52,27 @@ class ConnectWiseAPI:
             Dict: Parsed JSON response.
         """
         url = f"{self.base_url}{endpoint}"
-        async with httpx.AsyncClient(timeout=self.timeout) as client:
-            response = await client.request(method, url, headers=self.headers, params=params)
-            response.raise_for_status()
-            return response.json()
+        response = await self.client.request(method, url, params=params)
+        response.raise_for_status()
+        return orjson.loads(response.content)
+
+    async def batch(self, calls: List[Awaitable[Any]]) -> List[Any]:
+        """
+        Run several endpoint calls concurrently over the shared client.
+
+        Submitting heterogeneous calls together (projects, tickets, notes)
+        lets them multiplex over the same HTTP/2 connection. If any call
+        fails the rest are cancelled and the error is raised.
+
+        Args:
+            calls (List[Awaitable]): Endpoint coroutines, e.g. ``api.get_ticket_notes(1)``.
+
+        Returns:
+            List: Results in the same order as ``calls``.
+        """
+        async with asyncio.TaskGroup() as tg:
+            tasks = [tg.create_task(call) for call in calls]
+        return [task.result() for task in tasks]
 
     # 1. Project Data Collection Endpoints
 
@@ -180,5 +219,7 @@ if __name__ == "__main__":
             print("Projects:", projects)
         except Exception as e:
             print("API call failed:", e)
+        finally:
+            await api.aclose()
     
     asyncio.run(test_api())
@@ -1,79 +1,167 @@
-from typing import Optional, Dict, Any, List, ClassVar, Callable
+from typing import Optional, Dict, Any, List, ClassVar, Callable, Awaitable, Iterable, AsyncIterator, Tuple
 import os
 import httpx
+import orjson
 import base64
 import logging
 import asyncio
-from datetime import datetime, timedelta
-from functools import lru_cache
+import functools
+import math
+import random
+import time
+from types import MappingProxyType
+from urllib.parse import urlencode
 from dotenv import load_dotenv
 
 load_dotenv()
-logging.basicConfig(level=logging.DEBUG)
+logging.basicConfig(level=os.getenv("LOG_LEVEL", "INFO").upper())
 logger = logging.getLogger(__name__)
 
+def _backoff_delay(retry_count: int, base_delay: float, max_delay: float) -> float:
+    """Exponential backoff delay with multiplicative jitter"""
+    return min(max_delay, base_delay * 2 ** retry_count) * (1 + random.uniform(0, 0.5))
+
+def _retry_after(response: httpx.Response) -> Optional[float]:
+    """Seconds requested by a Retry-After header, if it holds a number"""
+    try:
+        return float(response.headers['Retry-After'])
+    except (KeyError, ValueError):
+        return None
+
+def _retry_with_backoff(max_retries: int = 5, base_delay: float = 0.5, max_delay: float = 30.0):
+    """Retry an HTTP-sending coroutine on 429/5xx responses and timeouts with jittered backoff"""
+    def decorator(func: Callable[..., Awaitable[httpx.Response]]):
+        @functools.wraps(func)
+        async def wrapper(*args, **kwargs) -> httpx.Response:
+            retry_count = 0
+            while True:
+                try:
+                    response = await func(*args, **kwargs)
+                except httpx.TimeoutException:
+                    if retry_count >= max_retries:
+                        raise
+                    delay = _backoff_delay(retry_count, base_delay, max_delay)
+                    retry_count += 1
+                    logger.warning("Request timed out, retrying in %.2fs (%d/%d)", delay, retry_count, max_retries)
+                    await asyncio.sleep(delay)
+                    continue
+                
+                status = response.status_code
+                if (status != 429 and status < 500) or retry_count >= max_retries:
+                    return response
+                
+                # Honor the server's Retry-After on 429, otherwise back off
+                delay = _retry_after(response) if status == 429 else None
+                if delay is None:
+                    delay = _backoff_delay(retry_count, base_delay, max_delay)
+                retry_count += 1
+                logger.warning("Request failed with %d, retrying in %.2fs (%d/%d)", status, delay, retry_count, max_retries)
+                await asyncio.sleep(delay)
+        return wrapper
+    return decorator
+
+class ConnectWiseAPIError(Exception):
+    """Non-success response from the ConnectWise API"""
+    def __init__(self, status_code: int, body: str):
+        super().__init__(f"Request failed ({status_code}): {body}")
+        self.status_code = status_code
+        self.body = body
+
 class RateLimiter:
     """Rate limiter using token bucket algorithm"""
     def __init__(self, rate_limit: int = 1000, time_window: int = 60):
         self.rate_limit = rate_limit  # requests per time window
         self.time_window = time_window  # time window in seconds
         self.tokens = rate_limit
-        self.last_update = datetime.now()
+        self.last_update = time.monotonic()
         self._lock = asyncio.Lock()
     
+    def _refill(self) -> None:
+        """Replenish tokens based on time passed since the last update"""
+        now = time.monotonic()
+        time_passed = now - self.last_update
+        self.tokens = min(
+            self.rate_limit,
+            self.tokens + (time_passed * self.rate_limit) / self.time_window
+        )
+        self.last_update = now
+    
     async def acquire(self):
         """Acquire a token for making a request"""
-        async with self._lock:
-            now = datetime.now()
-            time_passed = (now - self.last_update).total_seconds()
-            
-            # Replenish tokens based on time passed
-            self.tokens = min(
-                self.rate_limit,
-                self.tokens + int((time_passed * self.rate_limit) / self.time_window)
-            )
-            self.last_update = now
-            
-            if self.tokens > 0:
-                self.tokens -= 1
-                return True
+        while True:
+            async with self._lock:
+                self._refill()
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return True
+                
+                # Time until the next whole token is available
+                wait_time = (1 - self.tokens) * self.time_window / self.rate_limit
             
-            # Calculate wait time if no tokens available
-            wait_time = (self.time_window / self.rate_limit) - time_passed
-            if wait_time > 0:
-                logger.warning(f"Rate limit reached, waiting {wait_time:.2f} seconds")
-                await asyncio.sleep(wait_time)
-                self.tokens = 1
-                self.tokens -= 1
-            return True
+            # Sleep without holding the lock so other callers can re-check
+            logger.warning("Rate limit reached, waiting %.2f seconds", wait_time)
+            await asyncio.sleep(wait_time)
 
 class ConnectWiseClient:
     # Class-level client for connection pooling
     _http_client: ClassVar[Optional[httpx.AsyncClient]] = None
     _rate_limiter: ClassVar[Optional[RateLimiter]] = None
     
+    # Connection pool limits for the shared HTTP client
+    MAX_CONNECTIONS = 200
+    MAX_KEEPALIVE_CONNECTIONS = 100
+    KEEPALIVE_EXPIRY = 30.0
+    
+    # Upper bound on fan-out requests in flight at once
+    MAX_INFLIGHT = 10
+    
+    # Response cache for slow-changing endpoints (members, project details)
+    CACHE_TTL = 60.0
+    CACHE_MAXSIZE = 512
+    
+    # Query defaults copied into every request's params
+    _DEFAULT_PARAMS: ClassVar[Dict[str, Any]] = {'page': 1, 'pageSize': 100}
+    
+    # Largest page size the ConnectWise API accepts
+    MAX_PAGE_SIZE = 1000
+    
+    # Params understood by the /count endpoints
+    _COUNT_PARAMS = ('conditions', 'childConditions', 'customFieldConditions')
+    
     # Common field sets
-    BASIC_FIELDS = ['id', 'name']
-    PROJECT_FIELDS = [
+    BASIC_FIELDS: ClassVar[Tuple[str, ...]] = ('id', 'name')
+    PROJECT_FIELDS: ClassVar[Tuple[str, ...]] = (
         'id', 'name', 'status/name', 'manager/identifier',
         'company/name', 'estimatedHours', 'actualHours',
-        'scheduledStart', 'scheduledFinish', 'billingMethod'
-    ]
-    TIME_ENTRY_FIELDS = [
+        'scheduledStart', 'scheduledFinish', 'billingMethod',
+        '_info/lastUpdated'
+    )
+    TIME_ENTRY_FIELDS: ClassVar[Tuple[str, ...]] = (
         'id', 'timeStart', 'timeEnd', 'hoursWorked', 'notes',
         'member/identifier', 'member/name', 'chargeToId', 'chargeToType'
-    ]
-    TICKET_FIELDS = [
+    )
+    TICKET_FIELDS: ClassVar[Tuple[str, ...]] = (
         'id', 'summary', 'status/name', 'priority/name', 'project/id',
         'project/name', 'assignedTo/identifier', 'dateEntered',
-        'estimatedHours', 'actualHours'
-    ]
-    NOTE_FIELDS = [
+        'estimatedHours', 'actualHours', '_info/lastUpdated'
+    )
+    NOTE_FIELDS: ClassVar[Tuple[str, ...]] = (
         'id', 'text', 'detailDescriptionFlag', 'internalAnalysisFlag',
         'resolutionFlag', 'dateCreated', 'createdBy'
-    ]
+    )
     
-    def __init__(self):
+    # Field sets pre-joined into the CSV form the API expects
+    _BASIC_FIELDS_CSV = ','.join(BASIC_FIELDS)
+    _PROJECT_FIELDS_CSV = ','.join(PROJECT_FIELDS)
+    _TIME_ENTRY_FIELDS_CSV = ','.join(TIME_ENTRY_FIELDS)
+    _TICKET_FIELDS_CSV = ','.join(TICKET_FIELDS)
+    _NOTE_FIELDS_CSV = ','.join(NOTE_FIELDS)
+    
+    def __init__(self, cache_ttl: Optional[float] = None):
+        # Batch scripts can keep cached responses for the whole run
+        if cache_ttl is not None:
+            self.CACHE_TTL = cache_ttl
+        
         self.base_url = os.getenv('CONNECTWISE_URL', os.getenv('CW_BASE_URL'))
         self.company = os.getenv('CONNECTWISE_COMPANY', 'it360nz')
         self.public_key = os.getenv('CONNECTWISE_PUBLIC_KEY', os.getenv('CW_PUBLIC_KEY'))
@@ -83,30 +171,48 @@ class ConnectWiseClient:
         if not all([self.base_url, self.company, self.public_key, self.private_key, self.client_id]):
             raise ValueError("Missing required ConnectWise configuration")
         
+        # Prefix every request URL is built from; tolerates a trailing slash in the env value
+        self._url_prefix = self.base_url.rstrip('/') + '/'
+        
         # Initialize rate limiter if not exists
         if ConnectWiseClient._rate_limiter is None:
             ConnectWiseClient._rate_limiter = RateLimiter()
         
         # Generate auth token once
-        self._auth_token = self._generate_auth_token()
+        self._auth_token = self._generate_auth_token(self.company, self.public_key, self.private_key)
         
-        # Create headers once
-        self._headers = {
+        # Create headers once; read-only so a caller can't mutate them for every request
+        self._headers = MappingProxyType({
             'Authorization': self._auth_token,
             'ClientID': self.client_id,
             'Content-Type': 'application/json'
-        }
+        })
+        
+        # Requests in flight and cached responses, keyed by endpoint + sorted query string.
+        # Bodies are kept as raw JSON bytes and parsed per caller, so no caller can
+        # mutate what another one gets
+        self._inflight: Dict[str, asyncio.Future] = {}
+        self._cache: Dict[str, Tuple[float, bytes]] = {}
+        # Last ETag / Last-Modified seen per request, with the body they describe
+        self._validators: Dict[str, Tuple[Optional[str], Optional[str], bytes]] = {}
         
-        logger.info(f"Initialized ConnectWise client for {self.company}")
+        logger.info("Initialized ConnectWise client for %s", self.company)
 
     @property
     def http_client(self) -> httpx.AsyncClient:
         """Get or create the shared HTTP client"""
         if self._http_client is None or self._http_client.is_closed:
+            # HTTP/2 multiplexes concurrent requests over one connection; httpx asks for
+            # gzip (and br when brotli is installed) and decodes responses itself
             self._http_client = httpx.AsyncClient(
                 timeout=30.0,
                 verify=True,
-                limits=httpx.Limits(max_keepalive_connections=5, max_connections=10)
+                http2=True,
+                limits=httpx.Limits(
+                    max_keepalive_connections=self.MAX_KEEPALIVE_CONNECTIONS,
+                    max_connections=self.MAX_CONNECTIONS,
+                    keepalive_expiry=self.KEEPALIVE_EXPIRY
+                )
             )
         return self._http_client
 
@@ -115,104 +221,218 @@ class ConnectWiseClient:
         """Get the rate limiter instance"""
         return self._rate_limiter
 
-    def _generate_auth_token(self) -> str:
-        """Generate Basic auth token for ConnectWise API"""
-        credentials = f"{self.company}+{self.public_key}:{self.private_key}"
+    @property
+    def max_inflight(self) -> int:
+        """Fan-out bound: MAX_INFLIGHT, or the rate limit's bucket size if that is smaller"""
+        return max(1, min(self.MAX_INFLIGHT, int(self._rate_limiter.rate_limit)))
+
+    @staticmethod
+    def _generate_auth_token(company: str, public_key: str, private_key: str) -> str:
+        """Generate Basic auth token for ConnectWise API; called once per client in __init__"""
+        credentials = f"{company}+{public_key}:{private_key}"
         encoded = base64.b64encode(credentials.encode()).decode()
         auth = f"Basic {encoded}"
         return auth
 
     def _build_params(self, base_params: Optional[Dict[str, Any]] = None, **kwargs) -> Dict[str, Any]:
         """Build query parameters with defaults"""
-        params = {
-            'page': 1,
-            'pageSize': 100,
-            'fields': kwargs.get('fields', self.BASIC_FIELDS),
-            **(base_params or {})
-        }
+        params = self._DEFAULT_PARAMS.copy()
+        fields = kwargs.get('fields', self._BASIC_FIELDS_CSV)
+        if fields is not None:
+            if not isinstance(fields, str):
+                fields = ','.join(map(str, fields))
+            params['fields'] = fields
         
-        # Add orderBy if specified and not None
-        if 'orderBy' in kwargs and kwargs['orderBy'] is not None:
-            params['orderBy'] = kwargs['orderBy']
+        # Caller params override the defaults in one pass: a None value drops
+        # the key and sequences are joined into the CSV form the API expects
+        if base_params:
+            for key, value in base_params.items():
+                if value is None:
+                    params.pop(key, None)
+                elif type(value) in (list, tuple):
+                    params[key] = ','.join(map(str, value))
+                else:
+                    params[key] = value
         
-        # Clean params
-        params = {k: v for k, v in params.items() if v is not None}
-        for key, value in params.items():
-            if isinstance(value, (list, tuple)):
-                params[key] = ','.join(str(x) for x in value)
+        # Add orderBy if specified and not None
+        order_by = kwargs.get('orderBy')
+        if order_by is not None:
+            params['orderBy'] = ','.join(map(str, order_by)) if type(order_by) in (list, tuple) else order_by
                 
         return params
 
+    @_retry_with_backoff()
+    async def _send(self, method: str, url: str, headers: Optional[Dict[str, str]] = None, **kwargs) -> httpx.Response:
+        """Send one rate-limited request; retries are handled by the decorator"""
+        await self.rate_limiter.acquire()
+        if headers:
+            headers = {**self._headers, **headers}
+        return await self.http_client.request(method, url, headers=headers or self._headers, **kwargs)
+
+    @staticmethod
+    def _request_key(endpoint: str, params: Optional[Dict[str, Any]]) -> str:
+        """Stable key for a GET, independent of param order"""
+        return f"{endpoint}?{urlencode(sorted((params or {}).items()))}"
+
     async def get(self, endpoint: str, params: Optional[Dict[str, Any]] = None) -> Any:
-        """Make a GET request to the ConnectWise API with rate limiting"""
-        url = f"{self.base_url}/{endpoint}"
+        """Make a GET request; concurrent identical requests share one API call
+
+        Every call returns its own parsed copy of the response body.
+        """
+        return orjson.loads(await self._get_raw(endpoint, params, self._request_key(endpoint, params)))
+
+    async def _get_raw(self, endpoint: str, params: Optional[Dict[str, Any]], key: str) -> bytes:
+        """Response body of a GET, sharing one API call between concurrent identical requests"""
+        while key in self._inflight:
+            future = self._inflight[key]
+            try:
+                return await asyncio.shield(future)
+            except asyncio.CancelledError:
+                # If the caller making the request was cancelled rather than this one, take it over
+                if not future.cancelled() or asyncio.current_task().cancelling():
+                    raise
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        try:
+            data = await self._fetch(endpoint, params, key)
+            future.set_result(data)
+            return data
+        except Exception as e:
+            # Waiters see the same error as the caller that made the request
+            future.set_exception(e)
+            future.exception()  # mark retrieved in case nobody else was waiting
+            raise
+        finally:
+            del self._inflight[key]
+            if not future.done():
+                future.cancel()
+
+    async def _fetch(self, endpoint: str, params: Optional[Dict[str, Any]], key: str) -> bytes:
+        """Make a GET request to the ConnectWise API with rate limiting, returning the raw body"""
+        url = self._url_prefix + endpoint
         
-        logger.debug(f"Making request to: {url}")
-        logger.debug(f"With params: {params}")
+        logger.debug("Making request to: %s", url)
+        logger.debug("With params: %s", params)
         
-        # Apply rate limiting
-        await self.rate_limiter.acquire()
+        # Revalidate a previously seen response instead of downloading it again
+        conditional = {}
+        validators = self._validators.get(key)
+        if validators is not None:
+            etag, last_modified, _ = validators
+            if etag:
+                conditional['If-None-Match'] = etag
+            if last_modified:
+                conditional['If-Modified-Since'] = last_modified
         
-        max_retries = 3
-        retry_count = 0
+        try:
+            response = await self._send('GET', url, headers=conditional, params=params)
+        except Exception as e:
+            logger.error("Request failed with error: %s", e)
+            raise
         
-        while retry_count < max_retries:
-            try:
-                response = await self.http_client.get(url, headers=self._headers, params=params)
-                
-                if response.status_code == 200:
-                    return response.json()
-                
-                if response.status_code == 429:  # Too Many Requests
-                    retry_after = int(response.headers.get('Retry-After', 60))
-                    logger.warning(f"Rate limit exceeded, waiting {retry_after} seconds")
-                    await asyncio.sleep(retry_after)
-                    continue
-                    
-                if response.status_code >= 500 and retry_count < max_retries - 1:
-                    retry_count += 1
-                    logger.warning(f"Request failed with {response.status_code}, retrying ({retry_count}/{max_retries})")
-                    continue
-                    
-                logger.error(f"Request failed: {response.text}")
-                raise Exception(f"Request failed: {response.text}")
-                
-            except httpx.TimeoutException:
-                if retry_count < max_retries - 1:
-                    retry_count += 1
-                    logger.warning(f"Request timed out, retrying ({retry_count}/{max_retries})")
-                    continue
-                raise
-            except Exception as e:
-                logger.error(f"Request failed with error: {str(e)}")
-                raise
+        if response.status_code == 304 and validators is not None:
+            return validators[2]
+        
+        if response.status_code == 200:
+            data = response.content
+            etag = response.headers.get('ETag')
+            last_modified = response.headers.get('Last-Modified')
+            if etag or last_modified:
+                if key not in self._validators and len(self._validators) >= self.CACHE_MAXSIZE:
+                    self._validators.pop(next(iter(self._validators)))
+                self._validators[key] = (etag, last_modified, data)
+            return data
+        
+        logger.error("Request failed: %s", response.text)
+        raise ConnectWiseAPIError(response.status_code, response.text)
 
-    async def _get_list(self, endpoint: str, params: Optional[Dict[str, Any]] = None, **kwargs) -> List[Dict[str, Any]]:
+    async def get_cached(self, endpoint: str, params: Optional[Dict[str, Any]] = None) -> Any:
+        """GET through the response cache; failed responses are never cached
+
+        Like get, every call returns its own parsed copy of the cached body.
+        """
+        key = self._request_key(endpoint, params)
+        hit = self._cache.get(key)
+        if hit is not None and hit[0] > time.monotonic():
+            return orjson.loads(hit[1])
+        
+        data = await self._get_raw(endpoint, params, key)
+        if len(self._cache) >= self.CACHE_MAXSIZE:
+            self._cache.pop(next(iter(self._cache)))
+        self._cache[key] = (time.monotonic() + self.CACHE_TTL, data)
+        return orjson.loads(data)
+
+    def cache_clear(self):
+        """Drop all cached responses"""
+        self._cache.clear()
+        self._validators.clear()
+
+    async def _get_list(self, endpoint: str, params: Optional[Dict[str, Any]] = None, *, cached: bool = False, **kwargs) -> List[Dict[str, Any]]:
         """Generic method for getting lists of items"""
-        return await self.get(endpoint, self._build_params(params, **kwargs))
+        get = self.get_cached if cached else self.get
+        return await get(endpoint, self._build_params(params, **kwargs))
 
-    async def _get_item(self, endpoint: str, item_id: int, params: Optional[Dict[str, Any]] = None, **kwargs) -> Dict[str, Any]:
+    async def _get_item(self, endpoint: str, item_id: int, params: Optional[Dict[str, Any]] = None, *, cached: bool = False, **kwargs) -> Dict[str, Any]:
         """Generic method for getting a single item"""
         if not isinstance(item_id, int):
             raise ValueError(f"{endpoint} ID must be an integer")
-        return await self.get(f"{endpoint}/{item_id}", self._build_params(params, **kwargs))
+        get = self.get_cached if cached else self.get
+        return await get(f"{endpoint}/{item_id}", self._build_params(params, **kwargs))
+
+    async def iter_pages(self, endpoint: str, params: Optional[Dict[str, Any]] = None,
+                         page_size: int = MAX_PAGE_SIZE, **kwargs) -> AsyncIterator[List[Dict[str, Any]]]:
+        """Fetch every page of a list endpoint concurrently, yielding pages as they arrive"""
+        params = params or {}
+        count_params = {key: params[key] for key in self._COUNT_PARAMS if params.get(key) is not None}
+        total = (await self.get(f"{endpoint}/count", count_params)).get('count', 0)
+        
+        sem = asyncio.Semaphore(self.max_inflight)
+        
+        async def fetch(page: int) -> List[Dict[str, Any]]:
+            async with sem:
+                return await self._get_list(endpoint, {**params, 'page': page, 'pageSize': page_size}, **kwargs)
+        
+        tasks = [asyncio.create_task(fetch(page)) for page in range(1, math.ceil(total / page_size) + 1)]
+        try:
+            for next_page in asyncio.as_completed(tasks):
+                yield await next_page
+        finally:
+            # Stop outstanding fetches if the caller stops iterating early
+            for task in tasks:
+                task.cancel()
+
+    async def iter_items(self, endpoint: str, params: Optional[Dict[str, Any]] = None,
+                         page_size: int = 100, **kwargs) -> AsyncIterator[Dict[str, Any]]:
+        """Yield items from a list endpoint one at a time, fetching the next page only when needed"""
+        params = params or {}
+        page = 1
+        while True:
+            items = await self._get_list(endpoint, {**params, 'page': page, 'pageSize': page_size}, **kwargs)
+            for item in items:
+                yield item
+            if len(items) < page_size:
+                return
+            page += 1
 
     # Projects
     async def get_projects(self, params: Optional[Dict[str, Any]] = None, **kwargs) -> List[Dict[str, Any]]:
-        return await self._get_list('project/projects', params, fields=self.PROJECT_FIELDS, orderBy='lastUpdated desc', **kwargs)
+        return await self._get_list('project/projects', params, fields=self._PROJECT_FIELDS_CSV, orderBy='lastUpdated desc', **kwargs)
+
+    def iter_projects(self, params: Optional[Dict[str, Any]] = None, page_size: int = 100, **kwargs) -> AsyncIterator[Dict[str, Any]]:
+        return self.iter_items('project/projects', params, page_size, fields=self._PROJECT_FIELDS_CSV, orderBy='lastUpdated desc', **kwargs)
 
     async def get_project(self, project_id: int, params: Optional[Dict[str, Any]] = None, **kwargs) -> Dict[str, Any]:
-        return await self._get_item('project/projects', project_id, params, fields=self.PROJECT_FIELDS, **kwargs)
+        return await self._get_item('project/projects', project_id, params, cached=True, fields=self._PROJECT_FIELDS_CSV, **kwargs)
 
     async def get_project_notes(self, project_id: int, params: Optional[Dict[str, Any]] = None, **kwargs) -> List[Dict[str, Any]]:
         """Get notes for a project"""
-        return await self._get_list(f'project/projects/{project_id}/notes', params, fields=self.NOTE_FIELDS, **kwargs)
+        return await self._get_list(f'project/projects/{project_id}/notes', params, cached=True, fields=self._NOTE_FIELDS_CSV, **kwargs)
 
     async def get_project_tickets(self, project_id: int, params: Optional[Dict[str, Any]] = None, **kwargs) -> List[Dict[str, Any]]:
         base_params = {'conditions': f"project/id={project_id}"}
         if params:
             base_params.update(params)
-        return await self._get_list('project/tickets', base_params, fields=self.TICKET_FIELDS, orderBy='dateEntered desc', **kwargs)
+        return await self._get_list('project/tickets', base_params, fields=self._TICKET_FIELDS_CSV, orderBy='dateEntered desc', **kwargs)
 
     # Time Entries
     async def get_time_entries(self, params=None, **kwargs):
@@ -222,27 +442,47 @@ class ConnectWiseClient:
         if 'conditions' in params and 'chargeToType' in params['conditions']:
             # Replace "Project" with ProjectTicket which is the correct enum value
             params['conditions'] = params['conditions'].replace('chargeToType="Project"', 'chargeToType="ProjectTicket"')
-        return await self._get_list('time/entries', params, fields=self.TIME_ENTRY_FIELDS, orderBy='timeStart desc', **kwargs)
+        return await self._get_list('time/entries', params, fields=self._TIME_ENTRY_FIELDS_CSV, orderBy='timeStart desc', **kwargs)
 
     # Members
     async def get_members(self, params: Optional[Dict[str, Any]] = None, **kwargs) -> List[Dict[str, Any]]:
         base_params = {'conditions': "inactiveFlag=false"}
         if params:
             base_params.update(params)
-        return await self._get_list('system/members', base_params, orderBy='firstName asc', **kwargs)
+        return await self._get_list('system/members', base_params, cached=True, orderBy='firstName asc', **kwargs)
 
     # Tickets
     async def get_tickets(self, params: Optional[Dict[str, Any]] = None, **kwargs) -> List[Dict[str, Any]]:
-        return await self._get_list('project/tickets', params, fields=self.TICKET_FIELDS, orderBy='dateEntered desc', **kwargs)
+        return await self._get_list('project/tickets', params, fields=self._TICKET_FIELDS_CSV, orderBy='dateEntered desc', **kwargs)
 
     async def get_ticket(self, ticket_id: int, params: Optional[Dict[str, Any]] = None, **kwargs) -> Dict[str, Any]:
-        return await self._get_item('project/tickets', ticket_id, params, fields=self.TICKET_FIELDS, **kwargs)
+        return await self._get_item('project/tickets', ticket_id, params, fields=self._TICKET_FIELDS_CSV, **kwargs)
 
     async def get_ticket_notes(self, ticket_id: int, params: Optional[Dict[str, Any]] = None, **kwargs) -> List[Dict[str, Any]]:
-        return await self._get_list(f'project/tickets/{ticket_id}/allNotes', params, fields=self.NOTE_FIELDS, **kwargs)
+        return await self._get_list(f'project/tickets/{ticket_id}/allNotes', params, fields=self._NOTE_FIELDS_CSV, **kwargs)
 
     async def get_ticket_time_entries(self, ticket_id: int, params: Optional[Dict[str, Any]] = None, **kwargs) -> List[Dict[str, Any]]:
-        return await self._get_list(f'project/tickets/{ticket_id}/timeentries', params, fields=self.TIME_ENTRY_FIELDS, orderBy='timeStart desc', **kwargs)
+        return await self._get_list(f'project/tickets/{ticket_id}/timeentries', params, fields=self._TIME_ENTRY_FIELDS_CSV, orderBy='timeStart desc', **kwargs)
+
+    async def _gather(self, coros: Iterable[Awaitable[Any]], max_inflight: Optional[int] = None) -> List[Any]:
+        """Run requests concurrently with a bounded number in flight"""
+        sem = asyncio.Semaphore(max_inflight or self.max_inflight)
+        
+        async def run(coro):
+            async with sem:
+                return await coro
+        
+        return await asyncio.gather(*(run(coro) for coro in coros))
+
+    async def get_notes_for_tickets(self, ticket_ids: List[int], **kwargs) -> Dict[int, List[Dict[str, Any]]]:
+        """Get notes for several tickets concurrently, keyed by ticket ID"""
+        results = await self._gather(self.get_ticket_notes(ticket_id, **kwargs) for ticket_id in ticket_ids)
+        return dict(zip(ticket_ids, results))
+
+    async def get_time_entries_for_tickets(self, ticket_ids: List[int], **kwargs) -> Dict[int, List[Dict[str, Any]]]:
+        """Get time entries for several tickets concurrently, keyed by ticket ID"""
+        results = await self._gather(self.get_ticket_time_entries(ticket_id, **kwargs) for ticket_id in ticket_ids)
+        return dict(zip(ticket_ids, results))
 
     async def verify_credentials(self) -> bool:
         """Verify ConnectWise credentials by making a test request"""
@@ -250,7 +490,7 @@ class ConnectWiseClient:
             await self.get('system/info')
             return True
         except Exception as e:
-            logger.error(f"Failed to verify credentials: {str(e)}")
+            logger.error("Failed to verify credentials: %s", e)
             return False
 
     async def close(self):
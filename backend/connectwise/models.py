@@ -1,10 +1,11 @@
-from pydantic import BaseModel, Field, ConfigDict, EmailStr, constr, conint, confloat, field_validator
-from typing import Optional, List, Dict, Literal
+from pydantic import BaseModel, Field, ConfigDict, EmailStr, TypeAdapter, constr, conint, confloat, field_validator
+from typing import Optional, List, Dict, Literal, ClassVar, Generic, TypeVar
+from dataclasses import dataclass, field
 from datetime import datetime
 import re
 
 class Member(BaseModel):
-    model_config = ConfigDict(populate_by_name=True)
+    model_config = ConfigDict(defer_build=True)
     
     id: int = Field(gt=0)
     identifier: constr(min_length=1, max_length=50)
@@ -13,15 +14,17 @@ class Member(BaseModel):
     email: Optional[EmailStr] = None
     inactive_flag: bool = False
 
+    _IDENTIFIER_RE: ClassVar[re.Pattern] = re.compile(r'[a-zA-Z0-9._-]+', re.ASCII)
+
     @field_validator('identifier')
     @classmethod
     def validate_identifier(cls, v: str) -> str:
-        if not re.match(r'^[a-zA-Z0-9._-]+$', v):
+        if not cls._IDENTIFIER_RE.fullmatch(v):
             raise ValueError('Identifier must contain only alphanumeric characters, dots, underscores, and hyphens')
         return v
 
 class Status(BaseModel):
-    model_config = ConfigDict(populate_by_name=True)
+    model_config = ConfigDict(defer_build=True)
     
     id: int = Field(gt=0)
     name: constr(min_length=1, max_length=50)
@@ -29,6 +32,7 @@ class Status(BaseModel):
 class Project(BaseModel):
     model_config = ConfigDict(
         populate_by_name=True,
+        defer_build=True,
         ser_json_timedelta='iso8601'  # Modern way to handle datetime serialization
     )
     
@@ -52,7 +56,7 @@ class Project(BaseModel):
         return v
 
 class TimeEntry(BaseModel):
-    model_config = ConfigDict(populate_by_name=True)
+    model_config = ConfigDict(populate_by_name=True, defer_build=True)
     
     id: int = Field(gt=0)
     time_start: datetime = Field(..., alias='timeStart')
@@ -73,7 +77,7 @@ class TimeEntry(BaseModel):
         return v
 
 class Ticket(BaseModel):
-    model_config = ConfigDict(populate_by_name=True)
+    model_config = ConfigDict(populate_by_name=True, defer_build=True)
     
     id: int = Field(gt=0)
     summary: constr(min_length=1, max_length=500)
@@ -87,7 +91,7 @@ class Ticket(BaseModel):
     actual_hours: Optional[confloat(ge=0)] = Field(None, alias='actualHours')
 
 class Note(BaseModel):
-    model_config = ConfigDict(populate_by_name=True)
+    model_config = ConfigDict(populate_by_name=True, defer_build=True)
     
     id: int = Field(gt=0)
     text: constr(min_length=1, max_length=5000)
@@ -99,28 +103,33 @@ class Note(BaseModel):
     ticket_id: Optional[int] = Field(None, gt=0)
     project_id: Optional[int] = Field(None, gt=0)
 
+# Bulk validators for list responses; one call validates the whole list in pydantic-core
+PROJECT_LIST_ADAPTER = TypeAdapter(List[Project])
+TICKET_LIST_ADAPTER = TypeAdapter(List[Ticket])
+TIME_ENTRY_LIST_ADAPTER = TypeAdapter(List[TimeEntry])
+NOTE_LIST_ADAPTER = TypeAdapter(List[Note])
+
 # Response Models
-class PaginatedResponse(BaseModel):
-    model_config = ConfigDict(populate_by_name=True)
+T = TypeVar('T')
+
+class PaginatedResponse(BaseModel, Generic[T]):
+    model_config = ConfigDict(populate_by_name=True, defer_build=True)
     
     page: conint(gt=0) = 1
     page_size: conint(gt=0, le=1000) = 100
     total_count: conint(ge=0)
     total_pages: conint(ge=0)
-    items: List[Dict] = Field(default_factory=list, max_length=1000)  # Using max_length instead of max_items
+    items: List[T] = Field(default_factory=list, max_length=1000)  # Using max_length instead of max_items
 
-class ProjectSummary(BaseModel):
-    model_config = ConfigDict(populate_by_name=True)
-    
+@dataclass(slots=True)
+class ProjectSummary:
+    """Internally built project rollup; inputs are trusted, so only the hours invariant is checked"""
     project: Project
-    total_hours: confloat(ge=0)
-    billable_hours: confloat(ge=0)
-    team_members: List[str] = Field(default_factory=list, max_length=100)  # Using max_length instead of max_items
-    last_activity: Optional[datetime]
+    total_hours: float
+    billable_hours: float
+    team_members: List[str] = field(default_factory=list)
+    last_activity: Optional[datetime] = None
 
-    @field_validator('billable_hours')
-    @classmethod
-    def validate_billable_hours(cls, v: float, info) -> float:
-        if 'total_hours' in info.data and v > info.data['total_hours']:
+    def __post_init__(self):
+        if self.billable_hours > self.total_hours:
             raise ValueError('Billable hours cannot exceed total hours')
-        return v 
\ No newline at end of file
@@ -1,14 +1,20 @@
-from fastapi import FastAPI, HTTPException, Query, Depends, Path as FastAPIPath
+from fastapi import FastAPI, HTTPException, Query, Depends, Request, Path as FastAPIPath
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse, StreamingResponse
 from typing import Optional, Dict, List
 from datetime import datetime, timedelta
 from pathlib import Path
-import json
+import asyncio
+import orjson
 
-from connectwise.client import ConnectWiseClient
+from connectwise.client import ConnectWiseClient, ConnectWiseAPIError
 from analysis.project_analyzer import analyze_project_file
 
-app = FastAPI(title="ConnectWise Project Reporting Backend", version="0.1.0")
+app = FastAPI(
+    title="ConnectWise Project Reporting Backend",
+    version="0.1.0",
+    default_response_class=ORJSONResponse
+)
 
 # CORS middleware
 app.add_middleware(
@@ -19,13 +25,33 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# Dependency for ConnectWise client
-async def get_cw_client():
+@app.on_event("startup")
+async def startup():
+    """Create the shared ConnectWise client once for the app's lifetime"""
+    app.state.cw_client = None
+    app.state.cw_client_error = None
     try:
-        client = ConnectWiseClient()
-        return client
+        app.state.cw_client = ConnectWiseClient()
     except ValueError as e:
-        raise HTTPException(status_code=500, detail=str(e))
+        app.state.cw_client_error = str(e)
+
+@app.on_event("shutdown")
+async def shutdown():
+    if app.state.cw_client is not None:
+        await app.state.cw_client.close()
+
+@app.exception_handler(ConnectWiseAPIError)
+async def connectwise_error_handler(request: Request, exc: ConnectWiseAPIError):
+    """Report upstream failures as 404 when ConnectWise has no such record, else 502"""
+    status_code = 404 if exc.status_code == 404 else 502
+    return ORJSONResponse(status_code=status_code, content={"detail": str(exc), "upstream_status": exc.status_code})
+
+# Dependency for ConnectWise client
+async def get_cw_client(request: Request):
+    client = request.app.state.cw_client
+    if client is None:
+        raise HTTPException(status_code=500, detail=request.app.state.cw_client_error)
+    return client
 
 @app.get("/")
 async def read_root():
@@ -34,17 +60,14 @@ async def read_root():
 @app.get("/api/analysis/{project_id}")
 async def get_project_analysis(project_id: int):
     """Get AI analysis for a specific project"""
-    try:
-        # Check if analysis exists
-        analysis_file = Path(f"data/ai_analysis/project_{project_id}_ai_analysis.json")
-        if not analysis_file.exists():
-            raise HTTPException(status_code=404, detail="Analysis not found")
-            
-        # Return the analysis directly
-        with open(analysis_file) as f:
-            return json.load(f)
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+    # Check if analysis exists
+    analysis_file = Path(f"data/ai_analysis/project_{project_id}_ai_analysis.json")
+    if not analysis_file.exists():
+        raise HTTPException(status_code=404, detail="Analysis not found")
+        
+    # Return the analysis directly
+    with open(analysis_file, 'rb') as f:
+        return orjson.loads(f.read())
 
 @app.get("/api/projects")
 async def get_projects(
@@ -52,30 +75,63 @@ async def get_projects(
     test_mode: bool = Query(False, description="Use test mode with minimal parameters"),
     status: Optional[str] = Query(None, description="Filter by project status"),
     page: int = Query(1, ge=1),
-    page_size: int = Query(50, ge=1, le=100)
+    page_size: int = Query(50, ge=1, le=100),
+    stream: bool = Query(False, description="Stream all matching projects as NDJSON")
 ):
-    try:
-        if test_mode:
-            return await client.test_basic_projects_request()
-            
-        params = {
-            'page': page,
-            'pageSize': page_size,
-            'conditions': f"status/name='{status}'" if status else None
-        }
-        return await client.get_projects(params)
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+    if test_mode:
+        return await client.test_basic_projects_request()
+        
+    if stream:
+        params = {'conditions': f"status/name='{status}'" if status else None}
+        
+        async def ndjson():
+            async for project in client.iter_projects(params, page_size=page_size):
+                yield orjson.dumps(project) + b"\n"
+        
+        return StreamingResponse(ndjson(), media_type="application/x-ndjson")
+        
+    params = {
+        'page': page,
+        'pageSize': page_size,
+        'conditions': f"status/name='{status}'" if status else None
+    }
+    return await client.get_projects(params)
 
 @app.get("/api/projects/{project_id}")
 async def get_project(
     project_id: int = FastAPIPath(..., description="The ID of the project to retrieve"),
     client: ConnectWiseClient = Depends(get_cw_client)
 ):
-    try:
-        return await client.get_project(project_id)
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+    return await client.get_project(project_id)
+
+@app.get("/api/projects/{project_id}/summary")
+async def get_project_summary(
+    project_id: int = FastAPIPath(..., description="The ID of the project"),
+    client: ConnectWiseClient = Depends(get_cw_client)
+):
+    """Get a project with its tickets and notes, fetched concurrently
+
+    A failed project lookup fails the request (404 for an unknown project);
+    tickets and notes that fail are reported under ``errors`` instead.
+    """
+    project, *related = await asyncio.gather(
+        client.get_project(project_id),
+        client.get_project_tickets(project_id),
+        client.get_project_notes(project_id),
+        return_exceptions=True
+    )
+    if isinstance(project, Exception):
+        raise project
+    summary = {'project': project}
+    errors = {}
+    for key, result in zip(('tickets', 'notes'), related):
+        if isinstance(result, Exception):
+            errors[key] = str(result)
+            summary[key] = None
+        else:
+            summary[key] = result
+    summary['errors'] = errors
+    return summary
 
 @app.get("/api/projects/{project_id}/tickets")
 async def get_project_tickets(
@@ -84,11 +140,8 @@ async def get_project_tickets(
     page: int = Query(1, ge=1),
     page_size: int = Query(50, ge=1, le=100)
 ):
-    try:
-        params = {'page': page, 'pageSize': page_size}
-        return await client.get_project_tickets(project_id, params)
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+    params = {'page': page, 'pageSize': page_size}
+    return await client.get_project_tickets(project_id, params)
 
 @app.get("/api/projects/{project_id}/notes")
 async def get_project_notes(
@@ -97,11 +150,8 @@ async def get_project_notes(
     page: int = Query(1, ge=1),
     page_size: int = Query(50, ge=1, le=100)
 ):
-    try:
-        params = {'page': page, 'pageSize': page_size}
-        return await client.get_project_notes(project_id, params)
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+    params = {'page': page, 'pageSize': page_size}
+    return await client.get_project_notes(project_id, params)
 
 @app.get("/api/tickets")
 async def get_tickets(
@@ -111,31 +161,25 @@ async def get_tickets(
     page: int = Query(1, ge=1),
     page_size: int = Query(50, ge=1, le=100)
 ):
-    try:
-        conditions = []
-        if project_id:
-            conditions.append(f"project/id={project_id}")
-        if status:
-            conditions.append(f"status/name like '{status}'")
-
-        params = {
-            'page': page,
-            'pageSize': page_size,
-            'conditions': " and ".join(conditions) if conditions else None
-        }
-        return await client.get_tickets(params)
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+    conditions = []
+    if project_id:
+        conditions.append(f"project/id={project_id}")
+    if status:
+        conditions.append(f"status/name like '{status}'")
+
+    params = {
+        'page': page,
+        'pageSize': page_size,
+        'conditions': " and ".join(conditions) if conditions else None
+    }
+    return await client.get_tickets(params)
 
 @app.get("/api/tickets/{ticket_id}")
 async def get_ticket(
     ticket_id: int = FastAPIPath(..., description="The ID of the ticket to retrieve"),
     client: ConnectWiseClient = Depends(get_cw_client)
 ):
-    try:
-        return await client.get_ticket(ticket_id)
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+    return await client.get_ticket(ticket_id)
 
 @app.get("/api/tickets/{ticket_id}/time-entries")
 async def get_ticket_time_entries(
@@ -144,11 +188,8 @@ async def get_ticket_time_entries(
     page: int = Query(1, ge=1),
     page_size: int = Query(50, ge=1, le=100)
 ):
-    try:
-        params = {'page': page, 'pageSize': page_size}
-        return await client.get_ticket_time_entries(ticket_id, params)
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+    params = {'page': page, 'pageSize': page_size}
+    return await client.get_ticket_time_entries(ticket_id, params)
 
 @app.get("/api/tickets/{ticket_id}/notes")
 async def get_ticket_notes(
@@ -157,11 +198,8 @@ async def get_ticket_notes(
     page: int = Query(1, ge=1),
     page_size: int = Query(50, ge=1, le=100)
 ):
-    try:
-        params = {'page': page, 'pageSize': page_size}
-        return await client.get_ticket_notes(ticket_id, params)
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+    params = {'page': page, 'pageSize': page_size}
+    return await client.get_ticket_notes(ticket_id, params)
 
 @app.get("/api/time-entries")
 async def get_time_entries(
@@ -170,49 +208,40 @@ async def get_time_entries(
     start_date: Optional[str] = Query(None, description="Start date (YYYY-MM-DD)"),
     end_date: Optional[str] = Query(None, description="End date (YYYY-MM-DD)")
 ):
-    try:
-        conditions = []
-        if project_id:
-            conditions.append(f"chargeToId={project_id}")
-        if start_date:
-            conditions.append(f"timeStart>=[{start_date}]")
-        if end_date:
-            conditions.append(f"timeEnd<=[{end_date}]")
-
-        params = {
-            'conditions': " and ".join(conditions) if conditions else None
-        }
-        return await client.get_time_entries(params)
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+    conditions = []
+    if project_id:
+        conditions.append(f"chargeToId={project_id}")
+    if start_date:
+        conditions.append(f"timeStart>=[{start_date}]")
+    if end_date:
+        conditions.append(f"timeEnd<=[{end_date}]")
+
+    params = {
+        'conditions': " and ".join(conditions) if conditions else None
+    }
+    return await client.get_time_entries(params)
 
 @app.get("/api/members")
 async def get_members(
     client: ConnectWiseClient = Depends(get_cw_client),
     active_only: bool = Query(True, description="Only show active members")
 ):
-    try:
-        params = {
-            'conditions': "inactiveFlag=false" if active_only else None
-        }
-        return await client.get_members(params)
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+    params = {
+        'conditions': "inactiveFlag=false" if active_only else None
+    }
+    return await client.get_members(params)
 
 @app.get("/api/projects/{project_id}/analysis")
 async def get_project_regular_analysis(project_id: int):
     """Get regular analysis data for a specific project"""
-    try:
-        # Check if analysis exists
-        analysis_file = Path(f"data/analysis/project_{project_id}_analysis.json")
-        if not analysis_file.exists():
-            raise HTTPException(status_code=404, detail="Analysis not found")
-            
-        # Return the analysis directly
-        with open(analysis_file) as f:
-            return json.load(f)
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+    # Check if analysis exists
+    analysis_file = Path(f"data/analysis/project_{project_id}_analysis.json")
+    if not analysis_file.exists():
+        raise HTTPException(status_code=404, detail="Analysis not found")
+        
+    # Return the analysis directly
+    with open(analysis_file, 'rb') as f:
+        return orjson.loads(f.read())
 
 if __name__ == "__main__":
     import uvicorn
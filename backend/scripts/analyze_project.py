@@ -1,6 +1,4 @@
 #!/usr/bin/env python3
-import asyncio
-import json
 from pathlib import Path
 import sys
 import logging
@@ -9,61 +7,58 @@ from datetime import datetime
 from backend.connectwise.client import ConnectWiseClient
 from backend.analysis.detailed_analyzer import DetailedProjectAnalyzer
 from backend.analysis.ai_analyzer import AIProjectAnalyzer
-from backend.scripts.collect_detailed_data import collect_project_detailed_data
+from backend.scripts.collect_detailed_data import load_or_collect_detailed_data, write_json
+from backend.utils.aio import run
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-async def analyze_project(project_id: int):
+# Output directories
+DATA_DIR = Path('data')
+DETAILED_DIR = DATA_DIR / 'detailed'
+ANALYSIS_DIR = DATA_DIR / 'analysis'
+AI_DIR = DATA_DIR / 'ai_analysis'
+
+async def analyze_project(project_id: int, refresh: bool = False):
     """Run complete analysis for a single project"""
     try:
         # Initialize clients
-        cw_client = ConnectWiseClient()
-        
-        # Create output directories
-        data_dir = Path('data')
-        detailed_dir = data_dir / 'detailed'
-        analysis_dir = data_dir / 'analysis'
-        ai_dir = data_dir / 'ai_analysis'
-        
-        for directory in [data_dir, detailed_dir, analysis_dir, ai_dir]:
-            directory.mkdir(parents=True, exist_ok=True)
+        cw_client = ConnectWiseClient(cache_ttl=float('inf'))
         
-        # Step 1: Collect detailed data
-        logger.info(f"Collecting detailed data for project {project_id}...")
-        detailed_data = await collect_project_detailed_data(cw_client, project_id)
+        # Step 1: Collect detailed data, reusing the saved copy if the project is unchanged
+        logger.info("Collecting detailed data for project %s...", project_id)
+        detailed_file = DETAILED_DIR / f"project_{project_id}_detailed.json"
+        detailed_data, collected = await load_or_collect_detailed_data(cw_client, project_id, detailed_file, refresh)
         
         # Save detailed data
-        detailed_file = detailed_dir / f"project_{project_id}_detailed.json"
-        with open(detailed_file, 'w') as f:
-            json.dump(detailed_data, f, indent=2)
+        if collected:
+            await write_json(detailed_file, detailed_data)
+        else:
+            logger.info("Project %s unchanged since last collection, reusing saved data", project_id)
         
         # Step 2: Analyze project data
         logger.info("Analyzing project data...")
         analyzer = DetailedProjectAnalyzer(detailed_data)
-        analysis = analyzer.analyze_project_timeline()
+        analysis, prompt = analyzer.analyze_and_prepare_prompt()
         
         # Save analysis
-        analysis_file = analysis_dir / f"project_{project_id}_analysis.json"
-        with open(analysis_file, 'w') as f:
-            json.dump(analysis, f, indent=2)
+        analysis_file = ANALYSIS_DIR / f"project_{project_id}_analysis.json"
+        await write_json(analysis_file, analysis)
         
         # Step 3: Generate AI insights
         logger.info("Generating AI insights...")
         ai_analyzer = AIProjectAnalyzer()
-        prompt = analyzer.prepare_ai_prompt()
         ai_analysis = await ai_analyzer.analyze_project(prompt, project_id)
         
         # Save AI analysis
-        ai_file = ai_dir / f"project_{project_id}_ai_analysis.json"
-        with open(ai_file, 'w') as f:
-            json.dump(ai_analysis, f, indent=2)
+        ai_file = AI_DIR / f"project_{project_id}_ai_analysis.json"
+        await write_json(ai_file, ai_analysis)
         
-        logger.info(f"Analysis complete for project {project_id}")
+        logger.info("Analysis complete for project %s", project_id)
         return True
         
     except Exception as e:
-        logger.error(f"Error analyzing project {project_id}: {e}")
+        logger.error("Error analyzing project %s: %s", project_id, e)
         return False
     finally:
         await cw_client.close()
@@ -78,8 +73,12 @@ def main():
     except ValueError:
         print("Error: project_id must be a number")
         sys.exit(1)
+    
+    # Create output directories
+    for directory in [DATA_DIR, DETAILED_DIR, ANALYSIS_DIR, AI_DIR]:
+        directory.mkdir(parents=True, exist_ok=True)
         
-    success = asyncio.run(analyze_project(project_id))
+    success = run(analyze_project(project_id))
     sys.exit(0 if success else 1)
 
 if __name__ == '__main__':
@@ -1,44 +1,67 @@
 #!/usr/bin/env python3
 
 import asyncio
-import json
+import os
+import orjson
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
+from typing import Tuple
 from backend.analysis.project_analyzer import analyze_project_file
+from backend.utils.aio import run
+from backend.utils.json_io import JSON_OPTIONS
+
+def _analyze_and_write(project_file: str) -> Tuple[dict, Path]:
+    """Analyze one sample file and save the results next to it; runs in a worker process"""
+    project_file = Path(project_file)
+    analysis = analyze_project_file(str(project_file))
+    
+    # Write to a temporary file first so a reader never sees a partial analysis
+    output_file = project_file.parent / f"{project_file.stem}_analysis.json"
+    tmp_file = output_file.with_suffix('.json.tmp')
+    with open(tmp_file, 'wb') as f:
+        f.write(orjson.dumps(analysis, option=JSON_OPTIONS))
+    os.replace(tmp_file, output_file)
+    return analysis, output_file
 
 async def main():
     """Analyze all sample project data files."""
     sample_dir = Path(__file__).parent.parent / 'data' / 'samples'
     sample_dir.mkdir(parents=True, exist_ok=True)
     
-    # Analyze each project file
-    for project_file in sample_dir.glob('project_*.json'):
-        if '_analysis' not in project_file.name:  # Skip analysis files
-            print(f"\nAnalyzing {project_file.name}...")
-            analysis = analyze_project_file(str(project_file))
-            
-            # Print key metrics
-            print("\nKey Metrics:")
-            print(f"Project: {analysis['project_metrics']['name']}")
-            print(f"Status: {analysis['project_metrics']['status']}")
-            print(f"Hours: {analysis['project_metrics']['hours']['actual']} actual / {analysis['project_metrics']['hours']['estimated']} estimated")
-            print(f"Completion Rate: {analysis['ticket_analysis']['completion_metrics']['completion_rate']:.1f}%")
-            print(f"Risk Level: {analysis['risk_indicators']['risk_level']}")
-            
-            if analysis['risk_indicators']['risk_factors']:
-                print("\nRisk Factors:")
-                for risk in analysis['risk_indicators']['risk_factors']:
-                    print(f"- {risk}")
-            
-            if analysis['ticket_analysis']['stalled_tickets']:
-                print("\nStalled Tickets:")
-                for ticket in analysis['ticket_analysis']['stalled_tickets']:
-                    print(f"- {ticket['summary']} (ID: {ticket['id']})")
-            
-            # Save analysis results
-            output_file = project_file.parent / f"{project_file.stem}_analysis.json"
-            with open(output_file, 'w') as f:
-                json.dump(analysis, f, indent=2)
-            print(f"\nFull analysis saved to {output_file}")
+    # Skip analysis files
+    project_files = [f for f in sample_dir.glob('project_*.json') if '_analysis' not in f.name]
+    
+    # Analysis is CPU-bound, so each file gets its own worker process
+    loop = asyncio.get_running_loop()
+    with ProcessPoolExecutor() as pool:
+        results = await asyncio.gather(*(
+            loop.run_in_executor(pool, _analyze_and_write, str(project_file))
+            for project_file in project_files
+        ))
+    
+    # Report in file order once everything is done
+    for project_file, (analysis, output_file) in zip(project_files, results):
+        print(f"\nAnalyzing {project_file.name}...")
+        
+        # Print key metrics
+        print("\nKey Metrics:")
+        print(f"Project: {analysis['project_metrics']['name']}")
+        print(f"Status: {analysis['project_metrics']['status']}")
+        print(f"Hours: {analysis['project_metrics']['hours']['actual']} actual / {analysis['project_metrics']['hours']['estimated']} estimated")
+        print(f"Completion Rate: {analysis['ticket_analysis']['completion_metrics']['completion_rate']:.1f}%")
+        print(f"Risk Level: {analysis['risk_indicators']['risk_level']}")
+        
+        if analysis['risk_indicators']['risk_factors']:
+            print("\nRisk Factors:")
+            for risk in analysis['risk_indicators']['risk_factors']:
+                print(f"- {risk}")
+        
+        if analysis['ticket_analysis']['stalled_tickets']:
+            print("\nStalled Tickets:")
+            for ticket in analysis['ticket_analysis']['stalled_tickets']:
+                print(f"- {ticket['summary']} (ID: {ticket['id']})")
+        
+        print(f"\nFull analysis saved to {output_file}")
 
 if __name__ == '__main__':
-    asyncio.run(main()) 
\ No newline at end of file
+    run(main()) 
\ No newline at end of file
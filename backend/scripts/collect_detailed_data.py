@@ -8,25 +8,64 @@ project_root = str(Path(__file__).parent.parent.parent)
 sys.path.insert(0, project_root)
 
 import asyncio
-import json
-from datetime import datetime
-from typing import Dict, List, Optional
+import orjson
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, List, Optional, Set, Tuple
 
 from backend.connectwise.client import ConnectWiseClient
+from backend.utils.aio import run
+from backend.utils.json_io import JSON_OPTIONS
 
-async def collect_ticket_details(client: ConnectWiseClient, ticket_id: int) -> dict:
-    """Collect all details for a single ticket including notes, time entries, and status"""
-    
-    # Get basic ticket info
-    ticket = await client.get_ticket(ticket_id)
-    
-    # Get ticket notes
-    notes = await client.get_ticket_notes(ticket_id)
-    
-    # Get time entries
-    time_entries = await client.get_ticket_time_entries(ticket_id)
+# Projects collected at once; the client's rate limiter still paces the requests
+MAX_CONCURRENT_PROJECTS = 8
+
+# Saved collections older than this are re-collected even if nothing reports an update,
+# since new ticket notes and time entries don't change a ticket's lastUpdated
+MAX_REUSE_AGE = timedelta(hours=24)
+
+def _write_json_value(write, value, indent: bytes, depth: int) -> None:
+    """Write one JSON value, streaming dict items so only one item is encoded at a time"""
+    if depth == 0 or not isinstance(value, dict) or not value:
+        encoded = orjson.dumps(value, option=JSON_OPTIONS)
+        write(encoded.replace(b'\n', b'\n' + indent) if indent else encoded)
+        return
+    inner = indent + b'  '
+    separator = b'{\n'
+    for key, item in value.items():
+        # Encode the key via a one-item dict so non-str keys are coerced as orjson does
+        write(separator + inner + orjson.dumps({key: None}, option=orjson.OPT_NON_STR_KEYS)[1:-6] + b': ')
+        _write_json_value(write, item, inner, depth - 1)
+        separator = b',\n'
+    write(b'\n' + indent + b'}')
+
+def _write_json_file(path: Path, data) -> None:
+    tmp_file = path.with_suffix('.tmp')
+    try:
+        with open(tmp_file, 'wb') as f:
+            # Stream the top level and one level below (e.g. ticket_details)
+            _write_json_value(f.write, data, b'', depth=2)
+        os.replace(tmp_file, path)
+    except BaseException:
+        tmp_file.unlink(missing_ok=True)
+        raise
+
+async def write_json(path: Path, data) -> None:
+    """Write JSON atomically in a worker thread"""
+    await asyncio.to_thread(_write_json_file, path, data)
+
+async def _returning(value):
+    return value
+
+async def _collect_ticket_details(client: ConnectWiseClient, ticket_id: int,
+                                  prefetched_ticket: Optional[dict] = None) -> dict:
+    # Get ticket info, notes and time entries concurrently
+    ticket, notes, time_entries = await asyncio.gather(
+        client.get_ticket(ticket_id) if prefetched_ticket is None else _returning(prefetched_ticket),
+        client.get_ticket_notes(ticket_id),
+        client.get_ticket_time_entries(ticket_id)
+    )
     
-    # Get member details for anyone involved
+    # Identify everyone involved; member details are fetched once per project
     member_ids = {
         ticket.get('assignedTo', {}).get('identifier'),
         *(entry.get('member', {}).get('identifier') for entry in time_entries),
@@ -34,20 +73,67 @@ async def collect_ticket_details(client: ConnectWiseClient, ticket_id: int) -> d
     }
     member_ids.discard(None)
     
-    members = await client.get_members({
-        'conditions': f"identifier IN ({','.join(member_ids)})"
-    }) if member_ids else []
-    
     return {
         'ticket': ticket,
         'notes': notes,
         'time_entries': time_entries,
-        'members': members,
+        'member_identifiers': sorted(member_ids),
         'collected_at': datetime.now().isoformat()
     }
 
-async def collect_project_detailed_data(client: ConnectWiseClient, project_id: int) -> dict:
-    """Collect detailed data for a project including all ticket details"""
+async def collect_ticket_details(client: ConnectWiseClient, ticket_id: int,
+                                 prefetched_ticket: Optional[dict] = None,
+                                 ticket_cache: Optional[Dict[int, asyncio.Task]] = None) -> dict:
+    """Collect all details for a single ticket; pass prefetched_ticket to skip refetching the ticket itself
+    
+    Tickets can be shared between projects; callers passing the same ticket_cache collect each ticket once.
+    """
+    if ticket_cache is None:
+        return await _collect_ticket_details(client, ticket_id, prefetched_ticket)
+    
+    # The first caller starts the collection and the rest await it; failed collections are retried
+    task = ticket_cache.get(ticket_id)
+    if task is None or (task.done() and (task.cancelled() or task.exception() is not None)):
+        task = asyncio.create_task(_collect_ticket_details(client, ticket_id, prefetched_ticket))
+        ticket_cache[ticket_id] = task
+    # Shielded so a cancelled caller doesn't cancel a collection others are waiting on
+    return await asyncio.shield(task)
+
+async def fetch_members(client: ConnectWiseClient, identifiers: Iterable[str]) -> Dict[str, dict]:
+    """Look up members in a single query, keyed by identifier"""
+    identifiers = list(identifiers)
+    if not identifiers:
+        return {}
+    members = await client.get_members({
+        'conditions': f"identifier IN ({','.join(identifiers)})"
+    })
+    return {member['identifier']: member for member in members}
+
+def member_identifiers(detailed_data: dict) -> Set[str]:
+    """Every member identifier referenced by a project or any of its tickets"""
+    return set(detailed_data['member_identifiers']).union(
+        *(detail['member_identifiers'] for detail in detailed_data['ticket_details'].values())
+    )
+
+def attach_members(detailed_data: dict, by_id: Dict[str, dict]) -> None:
+    """Fill in project and ticket member lists from a lookup, keeping the lookup's order"""
+    def resolve(identifiers: List[str]) -> List[dict]:
+        wanted = set(identifiers)
+        return [member for identifier, member in by_id.items() if identifier in wanted]
+    
+    detailed_data['members'] = resolve(detailed_data['member_identifiers'])
+    for detail in detailed_data['ticket_details'].values():
+        detail['members'] = resolve(detail['member_identifiers'])
+
+async def collect_project_detailed_data(client: ConnectWiseClient, project_id: int,
+                                        resolve_members: bool = True,
+                                        ticket_cache: Optional[Dict[int, asyncio.Task]] = None) -> dict:
+    """Collect detailed data for a project; with resolve_members=False, members are left for attach_members
+    
+    Pass the same ticket_cache for every project in a run to collect shared tickets once.
+    """
+    if ticket_cache is None:
+        ticket_cache = {}
     
     # Get project data first
     project_data = await client.get_project(project_id)
@@ -56,11 +142,17 @@ async def collect_project_detailed_data(client: ConnectWiseClient, project_id: i
     # Get all tickets for the project
     tickets = await client.get_project_tickets(project_id)
     
-    # Collect detailed data for each ticket
-    ticket_details = {}
-    for ticket in tickets:
-        ticket_id = str(ticket['id'])  # Convert to string
-        ticket_details[ticket_id] = await collect_ticket_details(client, int(ticket_id))
+    # Collect detailed data for each ticket concurrently, bounded like the client's own fan-out
+    sem = asyncio.Semaphore(client.max_inflight)
+    
+    async def collect(ticket: dict) -> dict:
+        async with sem:
+            # Project tickets are listed with the same fields get_ticket returns
+            return await collect_ticket_details(client, int(ticket['id']), prefetched_ticket=ticket,
+                                                ticket_cache=ticket_cache)
+    
+    details = await asyncio.gather(*(collect(ticket) for ticket in tickets))
+    ticket_details = {str(ticket['id']): detail for ticket, detail in zip(tickets, details)}
     
     # Get all time entries for the project
     time_entries = await client.get_time_entries({
@@ -76,53 +168,94 @@ async def collect_project_detailed_data(client: ConnectWiseClient, project_id: i
     }
     member_ids.discard(None)
     
-    members = await client.get_members({
-        'conditions': f"identifier IN ({','.join(member_ids)})"
-    }) if member_ids else []
-    
-    return {
+    detailed_data = {
         'project': project_data,
         'project_notes': project_notes,
         'tickets': tickets,
         'ticket_details': ticket_details,
         'project_time_entries': time_entries,
-        'members': members,
+        'member_identifiers': sorted(member_ids),
+        'members': [],
         'collected_at': datetime.now().isoformat()
     }
+    
+    # One lookup covers the project and every ticket
+    if resolve_members:
+        attach_members(detailed_data, await fetch_members(client, member_identifiers(detailed_data)))
+    
+    return detailed_data
+
+def _last_updated(items: Iterable[dict]) -> Dict[str, Optional[str]]:
+    """Each item's _info/lastUpdated, keyed by id"""
+    return {str(item['id']): item.get('_info', {}).get('lastUpdated') for item in items}
+
+async def _ticket_versions(client: ConnectWiseClient, project_id: int) -> Dict[str, Optional[str]]:
+    """The project's current tickets and when each was last updated"""
+    versions = {}
+    async for page in client.iter_pages('project/tickets', {'conditions': f"project/id={project_id}"},
+                                        fields='id,_info/lastUpdated'):
+        versions.update(_last_updated(page))
+    return versions
+
+async def load_or_collect_detailed_data(client: ConnectWiseClient, project_id: int, saved_file: Path,
+                                        refresh: bool = False, resolve_members: bool = True,
+                                        ticket_cache: Optional[Dict[int, asyncio.Task]] = None) -> Tuple[dict, bool]:
+    """Reuse a recent saved collection if neither the project nor its tickets have been updated since;
+    returns (data, freshly_collected)"""
+    if not refresh and saved_file.exists():
+        saved = orjson.loads(await asyncio.to_thread(saved_file.read_bytes))
+        collected_at = saved.get('collected_at')
+        if collected_at and datetime.now() - datetime.fromisoformat(collected_at) < MAX_REUSE_AGE:
+            project, ticket_versions = await asyncio.gather(
+                client.get_project(project_id),
+                _ticket_versions(client, project_id)
+            )
+            last_updated = project.get('_info', {}).get('lastUpdated')
+            # Added, removed and updated tickets all change the id -> lastUpdated mapping
+            if (last_updated and saved.get('project', {}).get('_info', {}).get('lastUpdated') == last_updated
+                    and _last_updated(saved.get('tickets', [])) == ticket_versions):
+                return saved, False
+    return await collect_project_detailed_data(client, project_id, resolve_members, ticket_cache), True
 
 async def main():
-    client = ConnectWiseClient()
+    client = ConnectWiseClient(cache_ttl=float('inf'))
     
     # Create output directory if it doesn't exist
     output_dir = Path('data/detailed')
     output_dir.mkdir(parents=True, exist_ok=True)
     
     try:
-        # Get all active projects
-        projects = await client.get_projects({
-            'conditions': "status/name='Active'"
-        })
+        # Get the IDs of all active projects, fetching pages concurrently
+        project_ids = [
+            project['id']
+            async for page in client.iter_pages('project/projects', {
+                'conditions': "status/name='Active'"
+            }, fields='id')
+            for project in page
+        ]
         
-        # Collect detailed data for each project
-        for project in projects:
-            project_id = project['id']
-            print(f"Collecting detailed data for project {project_id}...")
-            
-            try:
-                detailed_data = await collect_project_detailed_data(client, project_id)
-                
-                # Save to file
-                output_file = output_dir / f"project_{project_id}_detailed.json"
-                with open(output_file, 'w') as f:
-                    json.dump(detailed_data, f, indent=2)
-                print(f"Saved detailed data for project {project_id}")
-                
-            except Exception as e:
-                print(f"Error collecting data for project {project_id}: {e}")
-                continue
+        # Collect detailed data for several projects at once, sharing ticket details for this run
+        sem = asyncio.Semaphore(MAX_CONCURRENT_PROJECTS)
+        ticket_cache: Dict[int, asyncio.Task] = {}
+        
+        async def collect(project_id: int) -> None:
+            async with sem:
+                print(f"Collecting detailed data for project {project_id}...")
+                try:
+                    detailed_data = await collect_project_detailed_data(client, project_id, ticket_cache=ticket_cache)
+                    
+                    # Save to file
+                    output_file = output_dir / f"project_{project_id}_detailed.json"
+                    await write_json(output_file, detailed_data)
+                    print(f"Saved detailed data for project {project_id}")
+                    
+                except Exception as e:
+                    print(f"Error collecting data for project {project_id}: {e}")
+        
+        await asyncio.gather(*(collect(project_id) for project_id in project_ids))
             
     finally:
         await client.http_client.aclose()
 
 if __name__ == '__main__':
-    asyncio.run(main()) 
\ No newline at end of file
+    run(main()) 
\ No newline at end of file
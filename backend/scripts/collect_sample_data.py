@@ -1,9 +1,10 @@
 #!/usr/bin/env python3
-import asyncio
-import json
+import orjson
 from datetime import datetime
 from pathlib import Path
 from connectwise.client import ConnectWiseClient
+from utils.aio import run
+from utils.json_io import JSON_OPTIONS
 
 async def collect_project_data(client: ConnectWiseClient, project_id: int) -> dict:
     """Collect all relevant data for a single project"""
@@ -68,8 +69,8 @@ async def main():
             
             # Save to file
             output_file = data_dir / f"project_{project_id}_sample.json"
-            with open(output_file, 'w') as f:
-                json.dump(data, f, indent=2)
+            with open(output_file, 'wb') as f:
+                f.write(orjson.dumps(data, option=JSON_OPTIONS))
             
             print(f"Saved data to {output_file}")
     
@@ -77,4 +78,4 @@ async def main():
         await client.close()
 
 if __name__ == '__main__':
-    asyncio.run(main()) 
\ No newline at end of file
+    run(main()) 
\ No newline at end of file
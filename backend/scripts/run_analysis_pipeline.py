@@ -8,16 +8,19 @@ project_root = str(Path(__file__).parent.parent.parent)
 sys.path.insert(0, project_root)
 
 import asyncio
-import json
 import logging
 from datetime import datetime
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple
 import agentops
 
 from backend.connectwise.client import ConnectWiseClient
 from backend.analysis.detailed_analyzer import DetailedProjectAnalyzer
 from backend.analysis.ai_analyzer import AIProjectAnalyzer
-from backend.scripts.collect_detailed_data import collect_project_detailed_data
+from backend.scripts.collect_detailed_data import (
+    MAX_CONCURRENT_PROJECTS, load_or_collect_detailed_data, fetch_members, member_identifiers, attach_members,
+    write_json
+)
+from backend.utils.aio import run
 
 # Initialize AgentOps
 agentops.init(os.getenv('AGENTOPS_API_KEY'))
@@ -32,20 +35,85 @@ logging.getLogger('httpx').setLevel(logging.WARNING)
 logging.getLogger('httpcore').setLevel(logging.WARNING)
 logging.getLogger('asyncio').setLevel(logging.WARNING)
 
+# Output directories
+DATA_DIR = Path('data')
+DETAILED_DIR = DATA_DIR / 'detailed'
+ANALYSIS_DIR = DATA_DIR / 'analysis'
+AI_DIR = DATA_DIR / 'ai_analysis'
+# Present while a pipeline run is writing results; the dashboard shows a notice meanwhile
+PIPELINE_MARKER = DATA_DIR / '.pipeline_running'
+
 @agentops.track_agent(name='project-analysis-pipeline')
 async def list_projects(client: ConnectWiseClient) -> List[Dict]:
-    """Get a simple list of all projects"""
+    """Get a simple list of active projects, one page with minimal fields"""
     projects = await client.get_projects({
-        'fields': ['id', 'name', 'status/name', 'company/name']  # Minimal fields
+        'fields': 'id,name,status/name,company/name',
+        'conditions': "status/name='Active'",
+        'page': 1,
+        'pageSize': 200
     })
     return projects
 
+async def collect_project(project_id: int, cw_client: ConnectWiseClient, sem: asyncio.Semaphore,
+                          ticket_cache: Dict[int, asyncio.Task], refresh: bool = False) -> Tuple[dict, bool]:
+    """Collect a project's detailed data, leaving member lookup to the batched step"""
+    print(f"\nProcessing project {project_id}...")
+    print(f"Collecting detailed data for project {project_id}...")
+    detailed_file = DETAILED_DIR / f"project_{project_id}_detailed.json"
+    async with sem:
+        detailed_data, collected = await load_or_collect_detailed_data(
+            cw_client, project_id, detailed_file, refresh, resolve_members=False, ticket_cache=ticket_cache
+        )
+    if not collected:
+        print(f"Project {project_id} unchanged since last collection, reusing saved data")
+    return detailed_data, collected
+
+async def process_project(project_id: int, detailed_data: dict, collected: bool,
+                          ai_analyzer: AIProjectAnalyzer, sem: asyncio.Semaphore):
+    """Save, analyze and generate AI insights for a collected project"""
+    # Save detailed data in the background; it is kept even if analysis fails
+    saving = None
+    if collected:
+        detailed_file = DETAILED_DIR / f"project_{project_id}_detailed.json"
+        saving = asyncio.create_task(write_json(detailed_file, detailed_data))
+    
+    try:
+        # Step 2: Analyze project data
+        print(f"Analyzing project data for project {project_id}...")
+        analyzer = DetailedProjectAnalyzer(detailed_data)
+        analysis, prompt = analyzer.analyze_and_prepare_prompt()
+        
+        # Step 3: Generate AI insights while the analysis is written
+        print(f"Generating AI insights for project {project_id}...")
+        
+        async def generate_insights() -> dict:
+            async with sem:
+                return await ai_analyzer.analyze_project(prompt, project_id)
+        
+        ai_task = asyncio.create_task(generate_insights())
+        try:
+            analysis_file = ANALYSIS_DIR / f"project_{project_id}_analysis.json"
+            await write_json(analysis_file, analysis)
+        except BaseException:
+            ai_task.cancel()
+            raise
+        ai_analysis = await ai_task
+    finally:
+        if saving is not None:
+            await saving
+    
+    # Save AI analysis
+    ai_file = AI_DIR / f"project_{project_id}_ai_analysis.json"
+    await write_json(ai_file, ai_analysis)
+    
+    print(f"Completed analysis for project {project_id}")
+
 @agentops.track_agent(name='project-analysis-pipeline')
-async def run_pipeline(project_ids: Optional[List[int]] = None):
+async def run_pipeline(project_ids: Optional[List[int]] = None, refresh: bool = False):
     """Run the complete analysis pipeline for specified projects"""
     
     # Initialize clients
-    cw_client = ConnectWiseClient()
+    cw_client = ConnectWiseClient(cache_ttl=float('inf'))
     success = True
     error_message = None
     processed_count = 0
@@ -58,11 +126,11 @@ async def run_pipeline(project_ids: Optional[List[int]] = None):
             projects = await list_projects(cw_client)
             
             if not projects:
-                print("No projects found in the system.")
+                print("No active projects found in the system.")
                 agentops.end_session("Success", "Listed projects - none found")
                 return
             
-            print("\nAvailable projects:")
+            print("\nActive projects:")
             print("ID\tStatus\t\tCompany\t\tName")
             print("-" * 80)
             for p in projects:
@@ -78,58 +146,43 @@ async def run_pipeline(project_ids: Optional[List[int]] = None):
         print(f"\nStarting analysis for {len(project_ids)} projects...")
         
         # Create output directories
-        data_dir = Path('data')
-        detailed_dir = data_dir / 'detailed'
-        analysis_dir = data_dir / 'analysis'
-        ai_dir = data_dir / 'ai_analysis'
-        
-        for directory in [data_dir, detailed_dir, analysis_dir, ai_dir]:
+        for directory in [DATA_DIR, DETAILED_DIR, ANALYSIS_DIR, AI_DIR]:
             directory.mkdir(parents=True, exist_ok=True)
+        PIPELINE_MARKER.touch()
         
-        # Process each project
-        for project_id in project_ids:
-            try:
-                print(f"\nProcessing project {project_id}...")
-                
-                # Step 1: Collect detailed data
-                print("Collecting detailed data...")
-                detailed_data = await collect_project_detailed_data(cw_client, project_id)
-                
-                # Save detailed data
-                detailed_file = detailed_dir / f"project_{project_id}_detailed.json"
-                with open(detailed_file, 'w') as f:
-                    json.dump(detailed_data, f, indent=2)
-                
-                # Step 2: Analyze project data
-                print("Analyzing project data...")
-                analyzer = DetailedProjectAnalyzer(detailed_data)
-                analysis = analyzer.analyze_project_timeline()
-                
-                # Save analysis
-                analysis_file = analysis_dir / f"project_{project_id}_analysis.json"
-                with open(analysis_file, 'w') as f:
-                    json.dump(analysis, f, indent=2)
-                
-                # Step 3: Generate AI insights
-                print("Generating AI insights...")
-                ai_analyzer = AIProjectAnalyzer()
-                prompt = analyzer.prepare_ai_prompt()
-                ai_analysis = await ai_analyzer.analyze_project(prompt, project_id)
-                
-                # Save AI analysis
-                ai_file = ai_dir / f"project_{project_id}_ai_analysis.json"
-                with open(ai_file, 'w') as f:
-                    json.dump(ai_analysis, f, indent=2)
-                
-                print(f"Completed analysis for project {project_id}")
-                processed_count += 1
-                
-            except Exception as e:
-                print(f"Error processing project {project_id}: {e}")
+        # Step 1: Collect every project concurrently, collecting tickets shared between them once
+        ai_analyzer = AIProjectAnalyzer()
+        sem = asyncio.Semaphore(MAX_CONCURRENT_PROJECTS)
+        ticket_cache: Dict[int, asyncio.Task] = {}
+        results = dict(zip(project_ids, await asyncio.gather(
+            *(collect_project(project_id, cw_client, sem, ticket_cache, refresh) for project_id in project_ids),
+            return_exceptions=True
+        )))
+        collected = {pid: result for pid, result in results.items() if not isinstance(result, Exception)}
+        
+        # Look up the members of every freshly collected project in one query
+        fresh = [data for data, was_collected in collected.values() if was_collected]
+        if fresh:
+            by_id = await fetch_members(cw_client, set().union(*map(member_identifiers, fresh)))
+            for data in fresh:
+                attach_members(data, by_id)
+        
+        # Steps 2-3: Analyze and generate AI insights concurrently
+        processed = await asyncio.gather(
+            *(process_project(pid, data, was_collected, ai_analyzer, sem)
+              for pid, (data, was_collected) in collected.items()),
+            return_exceptions=True
+        )
+        results.update(zip(collected, processed))
+        
+        for project_id, result in results.items():
+            if isinstance(result, Exception):
+                print(f"Error processing project {project_id}: {result}")
                 success = False
-                error_message = str(e)
-                agentops.record_error(str(e))
-                continue
+                error_message = str(result)
+                agentops.record_error(str(result))
+            else:
+                processed_count += 1
     
     except Exception as e:
         success = False
@@ -138,6 +191,7 @@ async def run_pipeline(project_ids: Optional[List[int]] = None):
         raise
     
     finally:
+        PIPELINE_MARKER.unlink(missing_ok=True)
         await cw_client.http_client.aclose()
         # End AgentOps session with appropriate status and details
         if success:
@@ -153,9 +207,11 @@ def main():
     parser = argparse.ArgumentParser(description='Run the project analysis pipeline')
     parser.add_argument('--project-ids', type=int, nargs='+',
                       help='List of project IDs to analyze. If not provided, will only list available projects.')
+    parser.add_argument('--refresh', action='store_true',
+                      help='Re-collect project data even if the project has not been updated since the last run.')
     
     args = parser.parse_args()
-    asyncio.run(run_pipeline(args.project_ids))
+    run(run_pipeline(args.project_ids, args.refresh))
 
 if __name__ == '__main__':
     main() 
\ No newline at end of file
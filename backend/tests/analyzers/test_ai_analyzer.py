@@ -0,0 +1,113 @@
+import asyncio
+import os
+import pytest
+import orjson
+from analysis.ai_analyzer import AIProjectAnalyzer
+
+VALID_REPLY = orjson.dumps({'health_score': 80}).decode()
+
+@pytest.fixture
+def analyzer(monkeypatch, tmp_path):
+    """Analyzer with a dummy API key and its cache directory under tmp_path"""
+    monkeypatch.setenv('OPENAI_API_KEY', 'test-key')
+    monkeypatch.chdir(tmp_path)
+    return AIProjectAnalyzer()
+
+def fake_replies(analyzer, *replies):
+    """Replace the OpenAI call with canned replies, returning the list of requests made"""
+    requests = []
+
+    async def complete(request):
+        requests.append(request)
+        return replies[len(requests) - 1]
+
+    analyzer._complete = complete
+    return requests
+
+@pytest.mark.asyncio
+async def test_analysis_cached_by_prompt(analyzer):
+    """Test an unchanged prompt is answered from the cache, memory and disk"""
+    requests = fake_replies(analyzer, VALID_REPLY)
+
+    first = await analyzer.analyze_project("prompt", 1)
+    assert first['health_score'] == 80
+    assert await analyzer.analyze_project("prompt", 1) == first
+    assert len(requests) == 1
+
+    # A new analyzer finds the entry on disk
+    restarted = AIProjectAnalyzer()
+    fake_replies(restarted)
+    assert (await restarted.analyze_project("prompt", 1))['health_score'] == 80
+
+@pytest.mark.asyncio
+async def test_changed_prompt_is_reanalyzed(analyzer):
+    """Test a different prompt for the same project misses the cache"""
+    requests = fake_replies(analyzer, VALID_REPLY, VALID_REPLY)
+    await analyzer.analyze_project("prompt", 1)
+    await analyzer.analyze_project("changed prompt", 1)
+    assert len(requests) == 2
+
+@pytest.mark.asyncio
+async def test_unparseable_reply_not_cached(analyzer):
+    """Test a malformed reply is returned as an error but not cached"""
+    requests = fake_replies(analyzer, "not json", VALID_REPLY)
+
+    failed = await analyzer.analyze_project("prompt", 1)
+    assert failed['error'] == 'Failed to parse AI response as JSON'
+    assert not list(analyzer.cache_dir.glob('analysis_*.json'))
+
+    assert (await analyzer.analyze_project("prompt", 1))['health_score'] == 80
+    assert len(requests) == 2
+
+@pytest.mark.asyncio
+async def test_refresh_bypasses_cache(analyzer):
+    """Test refresh requests a new analysis and replaces the cached one"""
+    requests = fake_replies(analyzer, VALID_REPLY, orjson.dumps({'health_score': 40}).decode())
+    await analyzer.analyze_project("prompt", 1)
+
+    refreshed = await analyzer.analyze_project("prompt", 1, refresh=True)
+    assert refreshed['health_score'] == 40
+    assert len(requests) == 2
+    assert (await analyzer.analyze_project("prompt", 1))['health_score'] == 40
+
+@pytest.mark.asyncio
+async def test_cancelled_request_taken_over(analyzer):
+    """Test cancelling the caller making a shared request lets the waiters retry it"""
+    started = asyncio.Event()
+    calls = []
+
+    async def complete(request):
+        calls.append(request)
+        if len(calls) == 1:
+            started.set()
+            await asyncio.Event().wait()
+        return VALID_REPLY
+
+    analyzer._complete = complete
+    owner = asyncio.create_task(analyzer.analyze_project("prompt", 1))
+    await started.wait()
+    waiters = [asyncio.create_task(analyzer.analyze_project("prompt", 1)) for _ in range(2)]
+    await asyncio.sleep(0)
+    owner.cancel()
+
+    results = await asyncio.gather(owner, *waiters, return_exceptions=True)
+    assert isinstance(results[0], asyncio.CancelledError)
+    assert [result['health_score'] for result in results[1:]] == [80, 80]
+    # One waiter took the request over and the other shared it
+    assert len(calls) == 2
+    assert not analyzer._inflight
+
+@pytest.mark.asyncio
+async def test_cached_analysis_after_deletion(analyzer):
+    """Test a deleted latest analysis falls back to an older one still on disk"""
+    older = analyzer.cache_dir / 'analysis_1_20261001.json'
+    newer = analyzer.cache_dir / 'analysis_1_20261002.json'
+    older.write_bytes(orjson.dumps({'health_score': 50}))
+    newer.write_bytes(orjson.dumps({'health_score': 70}))
+    os.utime(older, (1, 1))
+    analyzer._index_cache_dir()
+
+    newer.unlink()
+    assert (await analyzer.get_cached_analysis(1))['health_score'] == 50
+    older.unlink()
+    assert await analyzer.get_cached_analysis(1) is None
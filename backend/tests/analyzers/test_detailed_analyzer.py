@@ -0,0 +1,40 @@
+import pytest
+from analysis.detailed_analyzer import DetailedProjectAnalyzer, _VECTORIZE_THRESHOLD
+
+# One of each kind of ticket the scan distinguishes, repeated to the wanted count
+TICKET_KINDS = [
+    {'status': {'name': 'New'}, 'priority': {'name': 'High'}, 'actualHours': None, 'assignedTo': {'identifier': 'amy'}},
+    {'status': {'name': 'New'}, 'priority': {'name': 'High'}},
+    {'status': {'name': 'New'}, 'priority': {'name': 'Low'}, 'actualHours': 0, 'assignedTo': {'identifier': 'bob'}},
+    {'status': {'name': 'New'}, 'priority': {'name': 'Low'}, 'actualHours': 1.5, 'assignedTo': {'identifier': 'amy'}},
+    {'status': {'name': 'In Progress'}, 'priority': {'name': 'Low'}, 'actualHours': None},
+    {'status': {'name': 'Completed'}, 'priority': {'name': 'High'}, 'actualHours': 3, 'assignedTo': {'identifier': 'bob'}},
+    {'status': {'name': 'Completed'}, 'priority': {'name': 'Low'}, 'actualHours': 2, 'assignedTo': {'identifier': ''}}
+]
+
+def analyzer(count: int) -> DetailedProjectAnalyzer:
+    """Analyzer over `count` tickets cycling through TICKET_KINDS"""
+    tickets = [
+        {'id': i, 'summary': f'Ticket {i}', **TICKET_KINDS[i % len(TICKET_KINDS)]}
+        for i in range(count)
+    ]
+    return DetailedProjectAnalyzer({
+        'project': {}, 'tickets': tickets, 'ticket_details': {},
+        'project_notes': [], 'project_time_entries': [], 'members': []
+    })
+
+@pytest.mark.parametrize("count", [_VECTORIZE_THRESHOLD - 1, _VECTORIZE_THRESHOLD])
+def test_scan_paths_agree(count):
+    """Test the loop and the vectorized scan give the same answer, null and missing hours included"""
+    project = analyzer(count)
+    assert project._scan_ticket_frame() == project._scan_ticket_loop()
+
+def test_scan_across_threshold():
+    """Test null and missing hours count as unassigned and stalled on both sides of the threshold"""
+    for count in (_VECTORIZE_THRESHOLD - 1, _VECTORIZE_THRESHOLD):
+        scan = analyzer(count)._scan_tickets
+        kinds = [i % len(TICKET_KINDS) for i in range(count)]
+        assert len(scan.unassigned_tickets) == sum(kind in (0, 1, 4) for kind in kinds)
+        assert len(scan.stalled_tickets) == sum(kind in (0, 1, 2) for kind in kinds)
+        assert set(scan.member_allocation) == {'amy', 'bob'}
+        assert all(isinstance(m['hours_logged'], float) for m in scan.member_allocation.values())
@@ -0,0 +1,47 @@
+from analysis.project_analyzer import ProjectAnalyzer
+
+PROJECT_DATA = {
+    'project': {'id': 1, 'name': 'Test', 'actualHours': 2, 'estimatedHours': 10, 'status': {'name': 'Open'}},
+    'tickets': [
+        {'id': 2, 'summary': 'Stalled', 'status': {'name': 'New'}, 'priority': {'name': 'High'}, 'actualHours': 0},
+        {'id': 3, 'summary': 'Unassigned', 'status': {'name': 'In Progress'}, 'priority': {'name': 'Low'}}
+    ],
+    'time_entries': [],
+    'notes': [],
+    'members': []
+}
+
+def test_analyze_lists_tickets_by_default():
+    """Test stalled and unassigned tickets are listed unless slimming is requested"""
+    tickets = ProjectAnalyzer(PROJECT_DATA).analyze()['ticket_analysis']
+    assert tickets['stalled_tickets'] == [{'id': 2, 'summary': 'Stalled'}]
+    assert tickets['unassigned_tickets'] == [{'id': 3, 'summary': 'Unassigned'}]
+    assert tickets['stalled_count'] == tickets['unassigned_count'] == 1
+
+def test_analyze_without_detail():
+    """Test detail=False keeps only the counts"""
+    tickets = ProjectAnalyzer(PROJECT_DATA).analyze(detail=False)['ticket_analysis']
+    assert 'stalled_tickets' not in tickets and 'unassigned_tickets' not in tickets
+    assert tickets['stalled_count'] == tickets['unassigned_count'] == 1
+
+def test_allocation_across_sizes():
+    """Test member allocation keeps the same rules and types for small and large projects"""
+    kinds = [
+        {'status': {'name': 'Completed'}, 'actualHours': 2, 'assignedTo': {'identifier': 'amy'}},
+        {'status': {'name': 'New'}, 'actualHours': None, 'assignedTo': {'identifier': 'amy'}},
+        {'status': {'name': 'New'}, 'assignedTo': {'identifier': 'bob'}},
+        {'status': {'name': 'New'}, 'actualHours': 1}
+    ]
+    for count in (99, 100):
+        tickets = [
+            {'id': i, 'summary': f'Ticket {i}', 'priority': {'name': 'Low'}, **kinds[i % len(kinds)]}
+            for i in range(count)
+        ]
+        allocation = ProjectAnalyzer({**PROJECT_DATA, 'tickets': tickets}).analyze()['resource_metrics']['member_allocation']
+        kind_counts = [sum(i % len(kinds) == kind for i in range(count)) for kind in range(len(kinds))]
+        assert allocation == {
+            'amy': {'assigned_tickets': kind_counts[0] + kind_counts[1], 'completed_tickets': kind_counts[0],
+                    'hours_logged': 2 * kind_counts[0]},
+            'bob': {'assigned_tickets': kind_counts[2], 'completed_tickets': 0, 'hours_logged': 0}
+        }
+        assert type(allocation['amy']['hours_logged']) is int
@@ -0,0 +1,99 @@
+import asyncio
+import time
+import httpx
+import orjson
+import pytest
+from openai import AsyncOpenAI
+from analysis.ai_analyzer import AIProjectAnalyzer, TokenBucket, _parse_reset
+
+@pytest.mark.parametrize("value, seconds", [
+    (None, 0.0),
+    ('', 0.0),
+    ('1s', 1.0),
+    ('20ms', 0.02),
+    ('6m0s', 360.0),
+    ('1h2m3.5s', 3723.5),
+])
+def test_parse_reset(value, seconds):
+    """Test reset durations in the formats OpenAI sends"""
+    assert _parse_reset(value) == pytest.approx(seconds)
+
+def test_update_from_headers():
+    """Test the budget and reset times come from the rate limit headers"""
+    bucket = TokenBucket()
+    before = time.monotonic()
+    bucket.update({
+        'x-ratelimit-remaining-requests': '9',
+        'x-ratelimit-reset-requests': '1s',
+        'x-ratelimit-remaining-tokens': '500',
+        'x-ratelimit-reset-tokens': '6m0s'
+    })
+    assert (bucket.remaining_requests, bucket.remaining_tokens) == (9, 500)
+    assert bucket.requests_reset_at == pytest.approx(before + 1, abs=0.5)
+    assert bucket.tokens_reset_at == pytest.approx(before + 360, abs=0.5)
+
+    # Headers that are missing leave that part of the budget alone
+    bucket.update({'x-ratelimit-remaining-requests': '8'})
+    assert (bucket.remaining_requests, bucket.remaining_tokens) == (8, 500)
+
+@pytest.mark.asyncio
+async def test_acquire_spends_budget():
+    """Test acquiring with an unknown budget doesn't wait, and a known one is spent"""
+    bucket = TokenBucket()
+    await bucket.acquire(100)
+    assert bucket.remaining_requests is None and bucket.remaining_tokens is None
+
+    bucket.update({'x-ratelimit-remaining-requests': '2', 'x-ratelimit-reset-requests': '1m',
+                   'x-ratelimit-remaining-tokens': '500', 'x-ratelimit-reset-tokens': '1m'})
+    await bucket.acquire(100)
+    assert (bucket.remaining_requests, bucket.remaining_tokens) == (1, 400)
+
+    bucket.release(100, 40)
+    assert bucket.remaining_tokens == 460
+
+@pytest.mark.asyncio
+async def test_acquire_waits_for_reset():
+    """Test an exhausted budget waits until its window resets"""
+    bucket = TokenBucket()
+    bucket.update({'x-ratelimit-remaining-requests': '0', 'x-ratelimit-reset-requests': '50ms'})
+    start = time.monotonic()
+    await asyncio.wait_for(bucket.acquire(10), timeout=5)
+    assert time.monotonic() - start >= 0.04
+    # The window reset, so the budget is unknown until the next response
+    assert bucket.remaining_requests is None
+
+def sse(*events) -> bytes:
+    """A server-sent event stream of the given chunks"""
+    return b''.join(b'data: ' + orjson.dumps(event) + b'\n\n' for event in events) + b'data: [DONE]\n\n'
+
+@pytest.mark.asyncio
+async def test_complete_reads_rate_limit_headers(monkeypatch, tmp_path):
+    """Test a streamed completion is joined and the response headers update the budget"""
+    monkeypatch.setenv('OPENAI_API_KEY', 'test-key')
+    monkeypatch.chdir(tmp_path)
+    analyzer = AIProjectAnalyzer()
+
+    chunk = {'id': 'c', 'object': 'chat.completion.chunk', 'created': 0, 'model': 'm'}
+    body = sse(
+        {**chunk, 'choices': [{'index': 0, 'delta': {'content': '{"health_score"'}, 'finish_reason': None}]},
+        {**chunk, 'choices': [{'index': 0, 'delta': {'content': ': 80}'}, 'finish_reason': 'stop'}]},
+        {**chunk, 'choices': [], 'usage': {'prompt_tokens': 10, 'completion_tokens': 5, 'total_tokens': 15}}
+    )
+    requests = []
+
+    def handler(request):
+        requests.append(orjson.loads(request.content))
+        return httpx.Response(200, content=body, headers={
+            'content-type': 'text/event-stream',
+            'x-ratelimit-remaining-requests': '99',
+            'x-ratelimit-reset-requests': '1s',
+            'x-ratelimit-remaining-tokens': '5000',
+            'x-ratelimit-reset-tokens': '20ms'
+        })
+
+    analyzer.client = AsyncOpenAI(api_key='test-key', max_retries=0,
+                                  http_client=httpx.AsyncClient(transport=httpx.MockTransport(handler)))
+    content = await analyzer._complete({'model': 'm', 'messages': [{'role': 'user', 'content': 'prompt'}]})
+    assert content == '{"health_score": 80}'
+    assert requests[0]['stream'] is True
+    assert (analyzer._rate_limit.remaining_requests, analyzer._rate_limit.remaining_tokens) == (99, 5000)
@@ -0,0 +1,327 @@
+import asyncio
+import base64
+import httpx
+import orjson
+import pytest
+import connectwise.client
+from connectwise.client import ConnectWiseAPIError, ConnectWiseClient
+
+@pytest.fixture
+def client(monkeypatch):
+    """Client with dummy credentials"""
+    monkeypatch.setenv('CONNECTWISE_URL', 'https://cw.example.com/v4_6_release/apis/3.0/')
+    monkeypatch.setenv('CONNECTWISE_COMPANY', 'company')
+    monkeypatch.setenv('CONNECTWISE_PUBLIC_KEY', 'public')
+    monkeypatch.setenv('CONNECTWISE_PRIVATE_KEY', 'private')
+    monkeypatch.setenv('CONNECTWISE_CLIENT_ID', 'client-id')
+    return ConnectWiseClient()
+
+def mock_transport(client, handler):
+    """Route the client's requests to handler, returning the list of requests it received"""
+    requests = []
+
+    def record(request):
+        requests.append(request)
+        return handler(request)
+
+    client._http_client = httpx.AsyncClient(transport=httpx.MockTransport(record))
+    return requests
+
+def test_auth_header(client):
+    """Test the Basic auth header is built from the client's own credentials"""
+    expected = "Basic " + base64.b64encode(b"company+public:private").decode()
+    assert client._headers['Authorization'] == expected
+    assert client._headers['ClientID'] == 'client-id'
+    with pytest.raises(TypeError):
+        client._headers['Authorization'] = 'changed'
+
+def test_auth_header_per_client(client, monkeypatch):
+    """Test a client with other credentials does not reuse an earlier token"""
+    monkeypatch.setenv('CONNECTWISE_PRIVATE_KEY', 'rotated')
+    other = ConnectWiseClient()
+    assert other._headers['Authorization'] != client._headers['Authorization']
+    assert other._headers['Authorization'] == "Basic " + base64.b64encode(b"company+public:rotated").decode()
+
+@pytest.mark.asyncio
+async def test_list_calls_default_page_size(client):
+    """Test plain list calls keep the default page size"""
+    requests = mock_transport(client, lambda request: httpx.Response(200, json=[]))
+    await client.get_projects()
+    assert requests[0].url.params['pageSize'] == '100'
+
+@pytest.mark.asyncio
+async def test_iter_pages_uses_max_page_size(client):
+    """Test iter_pages requests the largest page size and fetches every page"""
+    def handler(request):
+        if request.url.path.endswith('/count'):
+            return httpx.Response(200, json={'count': 2500})
+        page = int(request.url.params['page'])
+        return httpx.Response(200, content=orjson.dumps([{'id': page}]))
+
+    requests = mock_transport(client, handler)
+    pages = [page async for page in client.iter_pages('project/tickets', {'conditions': 'project/id=1'})]
+    assert sorted(page[0]['id'] for page in pages) == [1, 2, 3]
+    page_requests = [r for r in requests if not r.url.path.endswith('/count')]
+    assert {r.url.params['pageSize'] for r in page_requests} == {'1000'}
+    assert requests[0].url.params['conditions'] == 'project/id=1'
+
+@pytest.mark.asyncio
+async def test_concurrent_gets_share_request(client):
+    """Test identical in-flight GETs make one API call, whatever the param order"""
+    release = asyncio.Event()
+
+    async def handler(request):
+        await release.wait()
+        return httpx.Response(200, json=[{'id': 1}])
+
+    requests = mock_transport(client, handler)
+    calls = [
+        asyncio.create_task(client.get('project/projects', {'page': 1, 'pageSize': 10})),
+        asyncio.create_task(client.get('project/projects', {'pageSize': 10, 'page': 1}))
+    ]
+    await asyncio.sleep(0.01)
+    release.set()
+    assert await asyncio.gather(*calls) == [[{'id': 1}], [{'id': 1}]]
+    assert len(requests) == 1
+    assert not client._inflight
+
+    # Once finished the request isn't shared any more
+    await client.get('project/projects', {'page': 1, 'pageSize': 10})
+    assert len(requests) == 2
+
+@pytest.mark.asyncio
+async def test_concurrent_gets_share_error(client):
+    """Test callers waiting on a shared request see its error"""
+    release = asyncio.Event()
+
+    async def handler(request):
+        await release.wait()
+        return httpx.Response(404, text='not found')
+
+    requests = mock_transport(client, handler)
+    calls = [asyncio.create_task(client.get('project/projects/1')) for _ in range(3)]
+    await asyncio.sleep(0.01)
+    release.set()
+    results = await asyncio.gather(*calls, return_exceptions=True)
+    assert all(isinstance(result, ConnectWiseAPIError) and result.status_code == 404 for result in results)
+    assert len(requests) == 1
+
+@pytest.fixture
+def backoffs(monkeypatch):
+    """Retry without sleeping, recording each backoff's retry count"""
+    calls = []
+
+    def backoff_delay(retry_count, base_delay, max_delay):
+        calls.append(retry_count)
+        return 0
+
+    monkeypatch.setattr(connectwise.client, '_backoff_delay', backoff_delay)
+    return calls
+
+def replies(*responses):
+    """Handler answering each request with the next response, raising exceptions given instead"""
+    remaining = list(responses)
+
+    def handler(request):
+        response = remaining.pop(0)
+        if isinstance(response, Exception):
+            raise response
+        return response
+    return handler
+
+@pytest.mark.asyncio
+async def test_retry_server_errors(client, backoffs):
+    """Test 5xx responses and timeouts are retried with growing backoff"""
+    requests = mock_transport(client, replies(
+        httpx.Response(503),
+        httpx.ReadTimeout('timed out'),
+        httpx.Response(500),
+        httpx.Response(200, json={'id': 1})
+    ))
+    assert await client.get('project/projects/1') == {'id': 1}
+    assert len(requests) == 4
+    assert backoffs == [0, 1, 2]
+
+@pytest.mark.asyncio
+async def test_retry_after_honoured(client, backoffs):
+    """Test a 429 waits for its Retry-After instead of backing off"""
+    requests = mock_transport(client, replies(
+        httpx.Response(429, headers={'Retry-After': '0'}),
+        httpx.Response(429),
+        httpx.Response(200, json={'id': 1})
+    ))
+    assert await client.get('project/projects/1') == {'id': 1}
+    assert len(requests) == 3
+    # Only the 429 without a usable Retry-After falls back to backoff
+    assert backoffs == [1]
+
+@pytest.mark.asyncio
+async def test_retry_gives_up(client, backoffs):
+    """Test the last failed response is raised once retries run out"""
+    requests = mock_transport(client, lambda request: httpx.Response(502, text='bad gateway'))
+    with pytest.raises(ConnectWiseAPIError) as error:
+        await client.get('project/projects/1')
+    assert error.value.status_code == 502
+    assert len(requests) == 6
+
+@pytest.mark.asyncio
+async def test_client_errors_not_retried(client, backoffs):
+    """Test 4xx responses other than 429 fail straight away"""
+    requests = mock_transport(client, lambda request: httpx.Response(404, text='not found'))
+    with pytest.raises(ConnectWiseAPIError):
+        await client.get('project/projects/1')
+    assert len(requests) == 1
+    assert backoffs == []
+
+@pytest.mark.asyncio
+async def test_etag_revalidation(client):
+    """Test a repeated GET sends the validators and reuses the body on 304"""
+    def handler(request):
+        if request.headers.get('If-None-Match') == '"v1"':
+            return httpx.Response(304)
+        return httpx.Response(200, json={'id': 1}, headers={
+            'ETag': '"v1"', 'Last-Modified': 'Wed, 14 Oct 2026 10:00:00 GMT'
+        })
+
+    requests = mock_transport(client, handler)
+    assert await client.get('project/projects/1') == {'id': 1}
+    assert 'If-None-Match' not in requests[0].headers
+    assert await client.get('project/projects/1') == {'id': 1}
+    assert requests[1].headers['If-None-Match'] == '"v1"'
+    assert requests[1].headers['If-Modified-Since'] == 'Wed, 14 Oct 2026 10:00:00 GMT'
+
+    # Other params are a different resource, and cache_clear forgets the validators
+    await client.get('project/projects/1', {'fields': 'id'})
+    assert 'If-None-Match' not in requests[2].headers
+    client.cache_clear()
+    await client.get('project/projects/1')
+    assert 'If-None-Match' not in requests[3].headers
+
+@pytest.mark.asyncio
+async def test_etag_replaced_on_change(client):
+    """Test a changed resource replaces the stored body and validator"""
+    versions = iter([('"v1"', {'id': 1, 'name': 'old'}), ('"v2"', {'id': 1, 'name': 'new'})])
+
+    def handler(request):
+        etag, body = next(versions)
+        return httpx.Response(200, json=body, headers={'ETag': etag})
+
+    requests = mock_transport(client, handler)
+    await client.get('project/projects/1')
+    assert (await client.get('project/projects/1'))['name'] == 'new'
+    assert requests[1].headers['If-None-Match'] == '"v1"'
+    assert client._validators['project/projects/1?'][0] == '"v2"'
+
+@pytest.mark.asyncio
+async def test_no_validators_without_headers(client):
+    """Test responses without ETag or Last-Modified aren't stored for revalidation"""
+    requests = mock_transport(client, lambda request: httpx.Response(200, json={'id': 1}))
+    await client.get('project/projects/1')
+    await client.get('project/projects/1')
+    assert 'If-None-Match' not in requests[1].headers
+    assert not client._validators
+
+@pytest.mark.parametrize("base_params, kwargs, expected", [
+    (None, {}, {'page': 1, 'pageSize': 100, 'fields': 'id,name'}),
+    (None, {'fields': ('id', 'summary')}, {'page': 1, 'pageSize': 100, 'fields': 'id,summary'}),
+    (None, {'fields': None}, {'page': 1, 'pageSize': 100}),
+    ({'pageSize': 25, 'conditions': 'id=1'}, {}, {'page': 1, 'pageSize': 25, 'fields': 'id,name', 'conditions': 'id=1'}),
+    ({'page': None, 'fields': None}, {}, {'pageSize': 100}),
+    ({'fields': ['id', 'name', 'status/name'], 'ids': (1, 2)}, {},
+     {'page': 1, 'pageSize': 100, 'fields': 'id,name,status/name', 'ids': '1,2'}),
+    (None, {'orderBy': 'id desc'}, {'page': 1, 'pageSize': 100, 'fields': 'id,name', 'orderBy': 'id desc'}),
+    (None, {'orderBy': ['name asc', 'id desc']},
+     {'page': 1, 'pageSize': 100, 'fields': 'id,name', 'orderBy': 'name asc,id desc'}),
+])
+def test_build_params(client, base_params, kwargs, expected):
+    """Test defaults, field sets, caller overrides and CSV joining"""
+    assert client._build_params(base_params, **kwargs) == expected
+
+def test_build_params_leaves_inputs_unchanged(client):
+    """Test building params never mutates the defaults or the caller's dict"""
+    base_params = {'page': None, 'conditions': 'id=1'}
+    client._build_params(base_params, orderBy='id')
+    assert base_params == {'page': None, 'conditions': 'id=1'}
+    assert ConnectWiseClient._DEFAULT_PARAMS == {'page': 1, 'pageSize': 100}
+
+@pytest.mark.asyncio
+async def test_results_not_shared(client):
+    """Test mutating one result never changes what later or concurrent callers get"""
+    release = asyncio.Event()
+
+    async def handler(request):
+        await release.wait()
+        if request.headers.get('If-None-Match') == '"v1"':
+            return httpx.Response(304)
+        return httpx.Response(200, json=[{'id': 1, 'tags': ['a']}], headers={'ETag': '"v1"'})
+
+    requests = mock_transport(client, handler)
+    expected = [{'id': 1, 'tags': ['a']}]
+
+    # Callers sharing one in-flight request
+    calls = [asyncio.create_task(client.get_cached('project/projects')) for _ in range(2)]
+    await asyncio.sleep(0.01)
+    release.set()
+    first, second = await asyncio.gather(*calls)
+    first[0]['tags'].append('b')
+    first.clear()
+    assert second == expected
+
+    # The response cache
+    cached = await client.get_cached('project/projects')
+    cached[0]['id'] = 2
+    assert await client.get_cached('project/projects') == expected
+
+    # A 304 revalidation
+    revalidated = await client.get('project/projects')
+    revalidated.append({'id': 3})
+    assert await client.get('project/projects') == expected
+    assert len(requests) == 3
+
+@pytest.mark.asyncio
+async def test_cancelled_get_taken_over(client):
+    """Test cancelling the caller making a shared GET lets the waiters retry it"""
+    started = asyncio.Event()
+    requests = []
+
+    async def handler(request):
+        requests.append(request)
+        if len(requests) == 1:
+            started.set()
+            await asyncio.Event().wait()
+        await asyncio.sleep(0.01)
+        return httpx.Response(200, json={'id': 1})
+
+    client._http_client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    owner = asyncio.create_task(client.get('project/projects/1'))
+    await started.wait()
+    waiters = [asyncio.create_task(client.get('project/projects/1')) for _ in range(2)]
+    await asyncio.sleep(0)
+    owner.cancel()
+
+    results = await asyncio.gather(owner, *waiters, return_exceptions=True)
+    assert isinstance(results[0], asyncio.CancelledError)
+    assert results[1:] == [{'id': 1}, {'id': 1}]
+    assert len(requests) == 2
+    assert not client._inflight
+
+@pytest.mark.asyncio
+async def test_cancelled_waiter_leaves_request(client):
+    """Test cancelling a waiter doesn't cancel the request it was sharing"""
+    release = asyncio.Event()
+
+    async def handler(request):
+        await release.wait()
+        return httpx.Response(200, json={'id': 1})
+
+    requests = mock_transport(client, handler)
+    owner = asyncio.create_task(client.get('project/projects/1'))
+    await asyncio.sleep(0.01)
+    waiter = asyncio.create_task(client.get('project/projects/1'))
+    await asyncio.sleep(0)
+    waiter.cancel()
+    release.set()
+    assert await owner == {'id': 1}
+    with pytest.raises(asyncio.CancelledError):
+        await waiter
+    assert len(requests) == 1
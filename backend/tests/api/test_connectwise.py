@@ -15,7 +15,7 @@ def cw_client():
     """Create and return a ConnectWise client instance"""
     client = ConnectWiseClient()
     # Debug log the auth token
-    logger.debug(f"Auth token: {client._get_basic_auth()}")
+    logger.debug("Auth token: %s", client._auth_token)
     return client
 
 @pytest.mark.asyncio
@@ -51,12 +51,12 @@ async def test_concurrent_requests(cw_client):
 async def test_verify_credentials(cw_client):
     """Test basic credential verification"""
     try:
-        headers = await cw_client._get_headers()
-        logger.debug(f"Request headers: {headers}")
+        headers = cw_client._headers
+        logger.debug("Request headers: %s", headers)
         result = await cw_client.verify_credentials()
         assert result == True, "Credentials verification failed"
     except Exception as e:
-        logger.error(f"Credential verification failed: {str(e)}")
+        logger.error("Credential verification failed: %s", e)
         raise
 
 @pytest.mark.asyncio
@@ -70,13 +70,13 @@ async def test_basic_project_list(cw_client):
     
     try:
         result = await cw_client.get_projects(params)
-        logger.info(f"Project result: {result}")
+        logger.info("Project result: %s", result)
         assert isinstance(result, list), "Expected list response"
         assert len(result) > 0, "Expected at least one project"
         assert all(isinstance(p, dict) for p in result), "Expected list of dictionaries"
         
     except Exception as e:
-        logger.error(f"Test failed with error: {str(e)}")
+        logger.error("Test failed with error: %s", e)
         raise
 
 @pytest.mark.asyncio
@@ -87,13 +87,13 @@ async def test_raw_project_request(cw_client):
             'page': 1,
             'pageSize': 1
         })
-        logger.info(f"Raw project result: {result}")
+        logger.info("Raw project result: %s", result)
         assert isinstance(result, list), "Expected list response"
         assert len(result) > 0, "Expected at least one project"
         assert all(isinstance(p, dict) for p in result), "Expected list of dictionaries"
         
     except Exception as e:
-        logger.error(f"Test failed with error: {str(e)}")
+        logger.error("Test failed with error: %s", e)
         raise
 
 @pytest.mark.asyncio
@@ -101,9 +101,9 @@ async def test_system_info(cw_client):
     """Test basic system info endpoint"""
     try:
         result = await cw_client.get('system/info', {})
-        logger.info(f"System info result: {result}")
+        logger.info("System info result: %s", result)
         assert isinstance(result, dict), "Expected dictionary response"
         
     except Exception as e:
-        logger.error(f"Test failed with error: {str(e)}")
+        logger.error("Test failed with error: %s", e)
         raise
@@ -0,0 +1,55 @@
+import httpx
+import pytest
+from fastapi.testclient import TestClient
+import main
+from connectwise.client import ConnectWiseClient
+
+@pytest.fixture
+def api(monkeypatch):
+    """The API with a ConnectWise client whose responses come from `routes`, keyed by path suffix"""
+    monkeypatch.setenv('CONNECTWISE_URL', 'https://cw.example.com/v4_6_release/apis/3.0/')
+    monkeypatch.setenv('CONNECTWISE_COMPANY', 'company')
+    monkeypatch.setenv('CONNECTWISE_PUBLIC_KEY', 'public')
+    monkeypatch.setenv('CONNECTWISE_PRIVATE_KEY', 'private')
+    monkeypatch.setenv('CONNECTWISE_CLIENT_ID', 'client-id')
+    routes = {}
+
+    def handler(request):
+        for suffix, response in routes.items():
+            if request.url.path.endswith(suffix):
+                return response
+        return httpx.Response(200, json=[])
+
+    with TestClient(main.app) as test_client:
+        cw_client = main.app.state.cw_client
+        cw_client._http_client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        yield test_client, routes
+
+def test_summary_unknown_project(api):
+    """Test an unknown project is a 404 rather than an empty summary"""
+    test_client, routes = api
+    routes['/project/projects/1'] = httpx.Response(404, text='not found')
+    response = test_client.get('/api/projects/1/summary')
+    assert response.status_code == 404
+    assert response.json()['upstream_status'] == 404
+
+def test_summary_upstream_failure(api):
+    """Test a failed project lookup maps to 502 even when everything else fails too"""
+    test_client, routes = api
+    routes['/project/projects/1'] = httpx.Response(400, text='bad request')
+    routes['/project/tickets'] = httpx.Response(400, text='bad request')
+    routes['/notes'] = httpx.Response(400, text='bad request')
+    assert test_client.get('/api/projects/1/summary').status_code == 502
+
+def test_summary_degrades_related(api):
+    """Test failed tickets or notes are reported under errors alongside the project"""
+    test_client, routes = api
+    routes['/project/projects/1'] = httpx.Response(200, json={'id': 1})
+    routes['/notes'] = httpx.Response(400, text='bad request')
+    response = test_client.get('/api/projects/1/summary')
+    assert response.status_code == 200
+    summary = response.json()
+    assert summary['project'] == {'id': 1}
+    assert summary['tickets'] == []
+    assert summary['notes'] is None
+    assert list(summary['errors']) == ['notes']
@@ -0,0 +1,57 @@
+from datetime import datetime, timedelta
+import orjson
+import pytest
+from backend.scripts import collect_detailed_data
+from backend.scripts.collect_detailed_data import load_or_collect_detailed_data
+
+class FakeClient:
+    """Reports a project and its tickets with fixed lastUpdated stamps"""
+    def __init__(self, project_updated, tickets):
+        self.project_updated = project_updated
+        self.tickets = tickets
+    
+    async def get_project(self, project_id):
+        return {'id': project_id, '_info': {'lastUpdated': self.project_updated}}
+    
+    async def iter_pages(self, endpoint, params=None, **kwargs):
+        assert params == {'conditions': 'project/id=1'}
+        yield [{'id': ticket_id, '_info': {'lastUpdated': updated}} for ticket_id, updated in self.tickets.items()]
+
+def saved_collection(path, collected_at, tickets):
+    path.write_bytes(orjson.dumps({
+        'project': {'id': 1, '_info': {'lastUpdated': 'p1'}},
+        'tickets': [{'id': ticket_id, '_info': {'lastUpdated': updated}} for ticket_id, updated in tickets.items()],
+        'collected_at': collected_at.isoformat()
+    }))
+
+@pytest.fixture
+def collect(monkeypatch):
+    """Stand-in for a fresh collection"""
+    async def collect_project_detailed_data(client, project_id, resolve_members, ticket_cache):
+        return {'fresh': True}
+    monkeypatch.setattr(collect_detailed_data, 'collect_project_detailed_data', collect_project_detailed_data)
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("project_updated, tickets, age, reused", [
+    ('p1', {2: 't1', 3: 't1'}, timedelta(hours=1), True),
+    ('p2', {2: 't1', 3: 't1'}, timedelta(hours=1), False),
+    ('p1', {2: 't1', 3: 't2'}, timedelta(hours=1), False),
+    ('p1', {2: 't1'}, timedelta(hours=1), False),
+    ('p1', {2: 't1', 3: 't1', 4: 't1'}, timedelta(hours=1), False),
+    ('p1', {2: 't1', 3: 't1'}, collect_detailed_data.MAX_REUSE_AGE, False),
+])
+async def test_reuse_saved_collection(tmp_path, collect, project_updated, tickets, age, reused):
+    """Test saved data is only reused when recent and neither the project nor its tickets changed"""
+    path = tmp_path / 'project_1_detailed.json'
+    saved_collection(path, datetime.now() - age, {2: 't1', 3: 't1'})
+    data, collected = await load_or_collect_detailed_data(FakeClient(project_updated, tickets), 1, path)
+    assert collected is not reused
+    assert ('fresh' in data) is not reused
+
+@pytest.mark.asyncio
+async def test_refresh_skips_saved_collection(tmp_path, collect):
+    """Test refresh collects afresh without checking the saved data"""
+    path = tmp_path / 'project_1_detailed.json'
+    saved_collection(path, datetime.now(), {2: 't1'})
+    data, collected = await load_or_collect_detailed_data(None, 1, path, refresh=True)
+    assert collected and data == {'fresh': True}
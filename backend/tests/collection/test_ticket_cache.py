@@ -0,0 +1,54 @@
+import asyncio
+import pytest
+from backend.scripts.collect_detailed_data import collect_ticket_details
+
+class FakeClient:
+    """Counts ticket detail requests, failing the first `failures` note lookups"""
+    def __init__(self, failures: int = 0):
+        self.calls = 0
+        self.failures = failures
+    
+    async def get_ticket(self, ticket_id):
+        return {'id': ticket_id}
+    
+    async def get_ticket_notes(self, ticket_id):
+        self.calls += 1
+        await asyncio.sleep(0)
+        if self.failures:
+            self.failures -= 1
+            raise RuntimeError('notes unavailable')
+        return []
+    
+    async def get_ticket_time_entries(self, ticket_id):
+        return []
+
+@pytest.mark.asyncio
+async def test_shared_cache_collects_ticket_once():
+    """Test concurrent callers sharing a cache collect a ticket once"""
+    client = FakeClient()
+    ticket_cache = {}
+    first, second = await asyncio.gather(
+        collect_ticket_details(client, 1, ticket_cache=ticket_cache),
+        collect_ticket_details(client, 1, ticket_cache=ticket_cache)
+    )
+    assert first is second
+    assert client.calls == 1
+
+@pytest.mark.asyncio
+async def test_separate_runs_collect_again():
+    """Test a new cache, or none, collects the ticket afresh"""
+    client = FakeClient()
+    await collect_ticket_details(client, 1, ticket_cache={})
+    await collect_ticket_details(client, 1, ticket_cache={})
+    await collect_ticket_details(client, 1)
+    assert client.calls == 3
+
+@pytest.mark.asyncio
+async def test_failed_collection_is_retried():
+    """Test a failed collection isn't reused by later callers"""
+    client = FakeClient(failures=1)
+    ticket_cache = {}
+    with pytest.raises(RuntimeError):
+        await collect_ticket_details(client, 1, ticket_cache=ticket_cache)
+    assert (await collect_ticket_details(client, 1, ticket_cache=ticket_cache))['ticket'] == {'id': 1}
+    assert client.calls == 2
@@ -0,0 +1,38 @@
+import orjson
+import pytest
+from backend.scripts.collect_detailed_data import write_json
+from backend.utils.json_io import JSON_OPTIONS
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("data", [
+    {},
+    {'a': {}},
+    [1, {'b': 2}],
+    {'project': {'id': 1, 'name': 'Test'}, 'tickets': [{'id': 2}], 'ticket_details': {3: {'notes': []}}},
+    {1: {2: {3: 4}}},
+    {True: {'a': 1}},
+])
+async def test_write_json_matches_orjson(tmp_path, data):
+    """Test the streamed output is byte-identical to a single orjson.dumps"""
+    path = tmp_path / 'data.json'
+    await write_json(path, data)
+    assert path.read_bytes() == orjson.dumps(data, option=JSON_OPTIONS)
+
+@pytest.mark.asyncio
+async def test_write_json_replaces_file(tmp_path):
+    """Test a rewrite replaces the file and leaves no temporary or sidecar files"""
+    path = tmp_path / 'data.json'
+    await write_json(path, {'a': 1})
+    await write_json(path, {'a': 2})
+    assert orjson.loads(path.read_bytes()) == {'a': 2}
+    assert [p.name for p in tmp_path.iterdir()] == ['data.json']
+
+@pytest.mark.asyncio
+async def test_write_json_failure_keeps_previous_file(tmp_path):
+    """Test a failed write leaves the previous file intact and cleans up"""
+    path = tmp_path / 'data.json'
+    await write_json(path, {'a': 1})
+    with pytest.raises(TypeError):
+        await write_json(path, {'a': object()})
+    assert orjson.loads(path.read_bytes()) == {'a': 1}
+    assert [p.name for p in tmp_path.iterdir()] == ['data.json']
@@ -0,0 +1,67 @@
+import importlib.util
+import os
+from pathlib import Path
+import orjson
+import pytest
+from streamlit.testing.v1 import AppTest
+
+PAGE = Path(__file__).parents[2] / 'visualization' / 'pages' / 'detailed_analysis.py'
+
+@pytest.fixture(scope='module')
+def page():
+    """The detailed analysis page loaded as a module; main() only runs as a script"""
+    spec = importlib.util.spec_from_file_location('detailed_analysis_page', PAGE)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+def ticket_table(page, tmp_path, summaries):
+    """Build the ticket table from an analysis file holding the given summaries"""
+    path = tmp_path / 'analysis.json'
+    path.write_bytes(orjson.dumps({'ticket_summaries': summaries}))
+    return page._ticket_table(str(path), os.stat(path).st_mtime)
+
+def test_ticket_status_markers(page, tmp_path):
+    """Test each status gets its colour marker, with missing statuses marked Unknown"""
+    table = ticket_table(page, tmp_path, [
+        {'id': 1, 'status': 'Closed'},
+        {'id': 2, 'status': 'In Progress'},
+        {'id': 3, 'status': 'New'},
+        {'id': 4, 'status': None},
+        {'id': 5}
+    ])
+    assert table['status'].to_pylist() == [
+        '🟢 Closed', '🟠 In Progress', '🔴 New', '🔴 Unknown', '🔴 Unknown'
+    ]
+
+def test_ticket_table_without_status(page, tmp_path):
+    """Test summaries without any status are passed through unchanged"""
+    table = ticket_table(page, tmp_path, [{'id': 1}, {'id': 2}])
+    assert table.column_names == ['id']
+
+def render_ticket_details(page_path, summaries):
+    """Script rendering the ticket details for the given summaries"""
+    import importlib.util
+    import pyarrow as pa
+    spec = importlib.util.spec_from_file_location('detailed_analysis_page', page_path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    module.display_ticket_details(pa.Table.from_pylist(summaries))
+
+def test_ticket_status_filter(page, tmp_path):
+    """Test the status filter and row cap slice the table before it is rendered"""
+    summaries = ticket_table(page, tmp_path, [
+        {'id': i, 'status': 'Closed' if i % 2 else None} for i in range(page.TICKET_ROWS + 50)
+    ]).to_pylist()
+    at = AppTest.from_function(render_ticket_details, args=(str(PAGE), summaries), default_timeout=30).run()
+    assert not at.exception
+    assert at.multiselect[0].options == ['🔴 Unknown', '🟢 Closed']
+    assert len(at.dataframe[0].value) == page.TICKET_ROWS
+
+    at.multiselect[0].select('🟢 Closed').run()
+    assert len(at.dataframe[0].value) == (page.TICKET_ROWS + 50) // 2
+    assert at.caption[0].value == f"Showing {(page.TICKET_ROWS + 50) // 2} of {page.TICKET_ROWS + 50} tickets"
+
+    at.multiselect[0].unselect('🟢 Closed').run()
+    at.toggle[0].set_value(True).run()
+    assert len(at.dataframe[0].value) == page.TICKET_ROWS + 50
@@ -1,7 +1,7 @@
 import pytest
 from datetime import datetime, timedelta
 from pydantic import ValidationError
-from connectwise.models import Member, Status, Project, TimeEntry, Ticket, Note
+from connectwise.models import Member, Status, Project, TimeEntry, Ticket, Note, PaginatedResponse, PROJECT_LIST_ADAPTER
 
 def test_member_validation():
     """Test Member model validation rules"""
@@ -98,4 +98,34 @@ def test_project_validation():
     # Test negative hours
     with pytest.raises(ValidationError) as exc:
         Project(id=1, name="Test", estimated_hours=-1)
-    assert "Input should be greater than or equal to 0" in str(exc.value) 
\ No newline at end of file
+    assert "Input should be greater than or equal to 0" in str(exc.value) 
+
+def test_project_list_adapter():
+    """Test bulk validation of project lists"""
+    projects = PROJECT_LIST_ADAPTER.validate_python([
+        {"id": 1, "name": "First", "estimatedHours": 10},
+        {"id": 2, "name": "Second", "billingMethod": "FixedFee"}
+    ])
+    assert [p.id for p in projects] == [1, 2]
+    assert projects[0].estimated_hours == 10
+    assert all(isinstance(p, Project) for p in projects)
+    
+    # A single invalid item fails the whole list
+    with pytest.raises(ValidationError) as exc:
+        PROJECT_LIST_ADAPTER.validate_python([{"id": 1, "name": "Ok"}, {"id": 0, "name": "Bad"}])
+    assert "Input should be greater than 0" in str(exc.value)
+
+def test_paginated_response_items():
+    """Test typed items in paginated responses"""
+    page = PaginatedResponse[Status].model_validate({
+        "total_count": 2,
+        "total_pages": 1,
+        "items": [{"id": 1, "name": "Open"}, {"id": 2, "name": "Closed"}]
+    })
+    assert [s.name for s in page.items] == ["Open", "Closed"]
+    assert all(isinstance(s, Status) for s in page.items)
+    
+    # Items are validated against the page's model
+    with pytest.raises(ValidationError) as exc:
+        PaginatedResponse[Status].model_validate({"total_count": 1, "total_pages": 1, "items": [{"id": 0, "name": "Bad"}]})
+    assert "Input should be greater than 0" in str(exc.value)
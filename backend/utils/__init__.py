@@ -0,0 +1,6 @@
+"""Helpers shared by the backend scripts."""
+
+from .aio import run
+from .json_io import JSON_OPTIONS
+
+__all__ = ['run', 'JSON_OPTIONS']
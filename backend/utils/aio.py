@@ -0,0 +1,14 @@
+"""Event loop entry point shared by the backend scripts."""
+
+import asyncio
+from typing import Coroutine, TypeVar
+
+T = TypeVar('T')
+
+def run(main: Coroutine[object, object, T]) -> T:
+    """Run a coroutine like asyncio.run, on uvloop when the optional uvloop extra is installed."""
+    try:
+        import uvloop
+    except ImportError:
+        return asyncio.run(main)
+    return uvloop.run(main)
@@ -0,0 +1,6 @@
+"""JSON settings shared by the scripts that write project data."""
+
+import orjson
+
+# Indented like json.dump(indent=2); non-str keys are coerced to strings as json did
+JSON_OPTIONS = orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
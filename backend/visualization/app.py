@@ -1,82 +1,144 @@
 """Streamlit app for ConnectWise Project Analysis visualization."""
 
+import math
+import importlib.util
+import os
 import sys
+import uuid
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
 from pathlib import Path
+from typing import Tuple
 
-# Add project root to Python path
-project_root = str(Path(__file__).parent.parent.parent)
-sys.path.insert(0, project_root)
+# Add project root to Python path only when backend isn't already importable
+# (e.g. launched with `python -m streamlit run` from the root, or PYTHONPATH set)
+if importlib.util.find_spec('backend') is None:
+    sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 
 import streamlit as st
+import streamlit.components.v1 as components
 import plotly.express as px
 import plotly.graph_objects as go
 import pandas as pd
 from backend.analysis.project_analyzer import analyze_project_file
 
-def create_status_chart(project_data):
-    """Create a donut chart for ticket status distribution."""
-    status_dist = project_data['ticket_analysis']['status_distribution']
+# Project cards rendered per page; each card carries two charts and a ticket table
+PROJECTS_PER_PAGE = 10
+
+# Persisted per-project filter/sort fields, refreshed by file mtime
+INDEX_FILE = '_index.parquet'
+INDEX_COLUMNS = ['path', 'mtime', 'name', 'company', 'hours', 'completion', 'risk', 'risk_factors']
+
+@dataclass(slots=True)
+class ProjectView:
+    """Flat view of one project analysis, built for the cards being rendered."""
+    id: int
+    name: str
+    company: str
+    status: str
+    hours_actual: float
+    completion_rate: float
+    risk_level: str
+    risk_factors: Tuple[str, ...]
+    tickets: list
+    stalled_tickets: list
+    status_dist: dict
+    priority_dist: dict
+    engineers: Tuple[str, ...]
+
+    @classmethod
+    def from_analysis(cls, analysis: dict) -> "ProjectView":
+        metrics = analysis['project_metrics']
+        ticket_analysis = analysis['ticket_analysis']
+        risks = analysis['risk_indicators']
+        tickets = analysis.get('tickets', [])
+        return cls(
+            id=metrics['id'],
+            name=metrics['name'],
+            company=metrics['company'],
+            status=metrics['status'],
+            hours_actual=metrics['hours']['actual'],
+            completion_rate=ticket_analysis['completion_metrics']['completion_rate'],
+            risk_level=risks['risk_level'],
+            risk_factors=tuple(risks['risk_factors']),
+            tickets=tickets,
+            stalled_tickets=ticket_analysis['stalled_tickets'],
+            status_dist=ticket_analysis['status_distribution'],
+            priority_dist=ticket_analysis['priority_distribution'],
+            engineers=tuple(get_project_engineers(tickets))
+        )
+
+# Figures are shared across reruns and sessions; the distribution items are the cache key
+@st.cache_resource(show_spinner=False)
+def _status_fig(status_items: tuple):
+    labels, values = zip(*status_items) if status_items else ((), ())
     fig = go.Figure(data=[go.Pie(
-        labels=list(status_dist.keys()),
-        values=list(status_dist.values()),
+        labels=list(labels),
+        values=list(values),
         hole=.3,
         marker_colors=['#2ecc71', '#3498db', '#e74c3c', '#f1c40f']
     )])
     fig.update_layout(title="Ticket Status Distribution")
     return fig
 
-def create_priority_chart(project_data):
-    """Create a bar chart for ticket priority distribution."""
-    priority_dist = project_data['ticket_analysis']['priority_distribution']
+@st.cache_resource(show_spinner=False)
+def _priority_fig(priority_items: tuple):
+    labels, values = zip(*priority_items) if priority_items else ((), ())
     fig = go.Figure(data=[go.Bar(
-        x=list(priority_dist.keys()),
-        y=list(priority_dist.values()),
+        x=list(labels),
+        y=list(values),
         marker_color='#3498db'
     )])
     fig.update_layout(title="Ticket Priority Distribution")
     return fig
 
-def get_project_engineers(project_data):
+def render_fig(fig, div_id, height=450):
+    """Render a figure as static HTML, skipping Streamlit's per-chart frontend component."""
+    # A stable div_id keeps the HTML identical across reruns so the iframe isn't reloaded
+    components.html(
+        fig.to_html(include_plotlyjs='cdn', full_html=False, div_id=div_id, default_height=f"{height}px"),
+        height=height + 20
+    )
+
+def create_status_chart(project):
+    """Create a donut chart for ticket status distribution."""
+    return _status_fig(tuple(project.status_dist.items()))
+
+def create_priority_chart(project):
+    """Create a bar chart for ticket priority distribution."""
+    return _priority_fig(tuple(project.priority_dist.items()))
+
+def get_project_engineers(tickets):
     """Get unique list of engineers assigned to tickets."""
-    engineers = set()
-    for ticket in project_data.get('tickets', []):
-        if ticket.get('assignedTo', {}).get('identifier'):
-            engineers.add(ticket['assignedTo']['identifier'])
-    return sorted(list(engineers))
+    return sorted({
+        identifier for ticket in tickets
+        if (identifier := (ticket.get('assignedTo') or {}).get('identifier'))
+    })
 
-def display_project_header(project_data):
+def display_project_header(project):
     """Display project header with customer and engineers."""
-    metrics = project_data['project_metrics']
-    
-    # Get company name from project metrics
-    company_name = metrics['company']
-    engineers = get_project_engineers(project_data)
-    
-    st.markdown(f"### 📁 {metrics['name']}")
-    st.markdown(f"**Customer:** {company_name}")
-    if engineers:
-        st.markdown(f"**Engineers:** {', '.join(engineers)}")
+    st.markdown(f"### 📁 {project.name}")
+    st.markdown(f"**Customer:** {project.company}")
+    if project.engineers:
+        st.markdown(f"**Engineers:** {', '.join(project.engineers)}")
     st.markdown("---")
 
-def display_project_metrics(project_data):
+def display_project_metrics(project):
     """Display key project metrics in columns."""
-    metrics = project_data['project_metrics']
-    completion = project_data['ticket_analysis']['completion_metrics']
-    
     # Display status separately with full width
-    st.markdown(f"**Project Status:** {metrics['status']}")
+    st.markdown(f"**Project Status:** {project.status}")
     st.markdown("---")
     
     # Use columns for the numeric metrics
     col1, col2 = st.columns(2)
     with col1:
-        st.metric("Actual Hours", f"{metrics['hours']['actual']:.1f}")
+        st.metric("Actual Hours", f"{project.hours_actual:.1f}")
     with col2:
-        st.metric("Completion Rate", f"{completion['completion_rate']:.1f}%")
+        st.metric("Completion Rate", f"{project.completion_rate:.1f}%")
 
-def display_risk_indicators(project_data):
+def display_risk_indicators(project):
     """Display risk indicators with appropriate styling."""
-    risk_level = project_data['risk_indicators']['risk_level']
+    risk_level = project.risk_level
     risk_color = {
         'LOW': 'green',
         'MEDIUM': 'orange',
@@ -86,36 +148,40 @@ def display_risk_indicators(project_data):
     st.subheader("Risk Assessment")
     st.markdown(f"**Risk Level:** :{risk_color}[{risk_level}]")
     
-    if project_data['risk_indicators']['risk_factors']:
+    if project.risk_factors:
         st.warning("Risk Factors")
-        for risk in project_data['risk_indicators']['risk_factors']:
-            st.markdown(f"- {risk}")
+        st.markdown("\n".join(f"- {risk}" for risk in project.risk_factors))
 
-def display_stalled_tickets(project_data):
+def display_stalled_tickets(project):
     """Display stalled tickets if any exist."""
-    stalled = project_data['ticket_analysis']['stalled_tickets']
+    stalled = project.stalled_tickets
     if stalled:
         st.error(f"Stalled Tickets ({len(stalled)}):")
-        for ticket in stalled:
-            st.markdown(f"- {ticket['summary']} (ID: {ticket['id']})")
+        st.markdown("\n".join(f"- {ticket['summary']} (ID: {ticket['id']})" for ticket in stalled))
 
-def display_ticket_table(project_data):
+def display_ticket_table(project):
     """Display a table of all tickets in the project."""
-    # Safely get tickets with error handling
-    tickets = project_data.get('tickets', [])
+    tickets = project.tickets
     if not tickets:
         st.info("No tickets found in this project")
         return
     
     try:
-        # Create DataFrame for better display
-        df = pd.DataFrame([{
-            'ID': ticket.get('id', 'N/A'),
-            'Summary': ticket.get('summary', 'No summary'),
-            'Status': ticket.get('status', {}).get('name', 'Unknown'),
-            'Hours': ticket.get('actualHours', 0),
-            'Priority': ticket.get('priority', {}).get('name', 'Unknown')
-        } for ticket in tickets])
+        # Create DataFrame for better display; reindex keeps columns no ticket has
+        df = (
+            pd.json_normalize(tickets)
+            .reindex(columns=['id', 'summary', 'status.name', 'actualHours', 'priority.name'])
+            .rename(columns={
+                'id': 'ID',
+                'summary': 'Summary',
+                'status.name': 'Status',
+                'actualHours': 'Hours',
+                'priority.name': 'Priority'
+            })
+            .fillna({'Summary': 'No summary', 'Status': 'Unknown', 'Hours': 0, 'Priority': 'Unknown'})
+            # Explicit narrow dtypes keep the Arrow conversion in st.dataframe cheap
+            .astype({'ID': 'Int32', 'Summary': 'string', 'Status': 'category', 'Hours': 'float32', 'Priority': 'category'})
+        )
         
         # Sort by status and then ID
         df = df.sort_values(['Status', 'ID'])
@@ -160,62 +226,111 @@ def display_ticket_table(project_data):
         st.error(f"Error displaying ticket table: {str(e)}")
         st.info("Please check the data structure of the project")
 
-def get_all_analyses():
-    """Get analyses for all projects."""
-    sample_dir = Path(__file__).parent.parent / 'data' / 'samples'
-    analyses = []
+@st.cache_data(show_spinner=False)
+def _analyze_cached(path: str, mtime: float):
+    """Analyze a project file; mtime is part of the cache key so edited files are re-analyzed."""
+    return analyze_project_file(path)
+
+def load_project_view(path: str, mtime: float) -> ProjectView:
+    """Full view of one project, for the cards actually rendered."""
+    return ProjectView.from_analysis(_analyze_cached(path, mtime))
+
+def _index_row(analysis: dict) -> dict:
+    """The fields of one project analysis that the index persists."""
+    view = ProjectView.from_analysis(analysis)
+    return {
+        'name': view.name,
+        'company': view.company,
+        'hours': view.hours_actual,
+        'completion': view.completion_rate,
+        'risk': view.risk_level,
+        'risk_factors': '\n'.join(view.risk_factors)
+    }
+
+def build_or_update_index(sample_dir: Path) -> pd.DataFrame:
+    """Load the persisted project index, re-analyzing only new or modified project files."""
+    index_file = sample_dir / INDEX_FILE
+    files = {
+        str(p): p.stat().st_mtime
+        for p in sample_dir.glob("project_*.json") if '_analysis' not in p.name
+    }
     
-    for project_file in sample_dir.glob("project_*.json"):
-        if '_analysis' not in project_file.name:
-            analysis = analyze_project_file(str(project_file))
-            analyses.append(analysis)
+    cached = pd.DataFrame(columns=INDEX_COLUMNS)
+    if index_file.exists():
+        try:
+            cached = pd.read_parquet(index_file)
+        except Exception as e:
+            st.warning(f"Rebuilding project index: {str(e)}")
     
-    return analyses
+    # Keep rows whose file is unchanged; anything else is (re-)analyzed
+    fresh = cached[cached['path'].map(files).eq(cached['mtime'])]
+    stale = sorted(files.keys() - set(fresh['path']))
+    if stale:
+        # Analysis is CPU-bound, so spread it across processes
+        with ProcessPoolExecutor(max_workers=min(os.cpu_count() or 1, len(stale))) as executor:
+            rows = [_index_row(analysis) for analysis in executor.map(analyze_project_file, stale)]
+        added = pd.DataFrame(rows).assign(path=stale, mtime=[files[p] for p in stale])[INDEX_COLUMNS]
+        fresh = pd.concat([fresh, added], ignore_index=True) if len(fresh) else added
+    
+    if stale or len(fresh) != len(cached):
+        fresh.to_parquet(index_file, index=False)
+    return fresh.reset_index(drop=True)
+
+def build_analysis_index(projects: pd.DataFrame):
+    """Add the derived columns used for filtering and sorting to the project index."""
+    names = projects['name'].astype(object)
+    companies = projects['company'].astype(object)
+    return projects.assign(
+        # Lowercased once here so search doesn't lowercase every row on each keystroke
+        name_lc=names.str.lower(),
+        company_lc=companies.str.lower(),
+        risk=pd.Categorical(projects['risk'], categories=["HIGH", "MEDIUM", "LOW"], ordered=True),
+        risk_factors_lc=projects['risk_factors'].astype(object).str.lower(),
+        idx=range(len(projects))
+    )
 
-def filter_projects(analyses, search_term="", risk_level=None, risk_factor=None):
-    """Filter projects based on search term and risk criteria."""
-    filtered = analyses
+def filter_projects(index, search_term="", risk_level=None, risk_factor=None):
+    """Filter index rows based on search term and risk criteria."""
+    mask = pd.Series(True, index=index.index)
     
     # Text search filter
     if search_term:
         search_term = search_term.lower()
-        filtered = [
-            analysis for analysis in filtered
-            if search_term in analysis['project_metrics']['name'].lower()
-            or search_term in analysis.get('project_metrics', {}).get('company_name', '').lower()
-        ]
+        mask &= (
+            index['name_lc'].str.contains(search_term, regex=False)
+            | index['company_lc'].str.contains(search_term, regex=False)
+        )
     
     # Risk level filter
     if risk_level:
-        filtered = [
-            analysis for analysis in filtered
-            if analysis['risk_indicators']['risk_level'] == risk_level
-        ]
+        mask &= index['risk'] == risk_level
     
     # Risk factor filter
     if risk_factor:
-        filtered = [
-            analysis for analysis in filtered
-            if any(risk_factor.lower() in factor.lower() 
-                  for factor in analysis['risk_indicators']['risk_factors'])
-        ]
+        mask &= index['risk_factors_lc'].str.contains(risk_factor.lower(), regex=False)
     
-    return filtered
+    return index[mask]
+
+# Index column and direction for each sort option; risk is an ordered HIGH > MEDIUM > LOW categorical
+SORT_KEYS = {
+    "name": ('name', True),
+    "company": ('company', True),
+    "hours": ('hours', False),
+    "completion": ('completion', False),
+    "risk": ('risk', True)
+}
 
-def sort_projects(analyses, sort_by="name"):
-    """Sort projects based on given criteria."""
-    if sort_by == "name":
-        return sorted(analyses, key=lambda x: x['project_metrics']['name'])
-    elif sort_by == "company":
-        return sorted(analyses, key=lambda x: x['project_metrics'].get('company_name', ''))
-    elif sort_by == "hours":
-        return sorted(analyses, key=lambda x: x['project_metrics']['hours']['actual'], reverse=True)
-    elif sort_by == "completion":
-        return sorted(analyses, key=lambda x: x['ticket_analysis']['completion_metrics']['completion_rate'], reverse=True)
-    elif sort_by == "risk":
-        risk_order = {"HIGH": 0, "MEDIUM": 1, "LOW": 2}
-        return sorted(analyses, key=lambda x: risk_order[x['risk_indicators']['risk_level']])
-    return analyses
+def sort_projects(index, sort_by="name"):
+    """Sort index rows based on given criteria."""
+    if sort_by not in SORT_KEYS:
+        return index
+    column, ascending = SORT_KEYS[sort_by]
+    return index.sort_values(column, ascending=ascending, kind='stable')
+
+@st.cache_data(show_spinner=False)
+def _filter_sort(_index, analyses_version, search, risk_level, risk_factor, sort_by):
+    """Positions of the filtered, sorted analyses; the index itself is keyed by analyses_version."""
+    return sort_projects(filter_projects(_index, search, risk_level, risk_factor), sort_by)['idx'].tolist()
 
 def main():
     st.set_page_config(
@@ -225,8 +340,9 @@ def main():
     )
     
     # Initialize session state
-    if 'analyses' not in st.session_state:
-        st.session_state.analyses = []
+    if 'analysis_index' not in st.session_state:
+        st.session_state.analysis_index = build_analysis_index(pd.DataFrame(columns=INDEX_COLUMNS))
+        st.session_state.analyses_version = None
     if 'risk_level_filter' not in st.session_state:
         st.session_state.risk_level_filter = None
     if 'risk_factor_filter' not in st.session_state:
@@ -239,9 +355,12 @@ def main():
         # Run Analysis Button
         if st.button("🔄 Run Analysis", type="primary", use_container_width=True):
             with st.spinner("Running analysis..."):
-                st.session_state.analyses = get_all_analyses()
+                sample_dir = Path(__file__).parent.parent / 'data' / 'samples'
+                st.session_state.analysis_index = build_analysis_index(build_or_update_index(sample_dir))
+                # Unique per load, so cached filter results never outlive the analyses they index
+                st.session_state.analyses_version = uuid.uuid4().hex
         
-        if len(st.session_state.analyses) > 0:
+        if len(st.session_state.analysis_index) > 0:
             st.divider()
             
             # Search
@@ -316,15 +435,29 @@ def main():
     # Main Content
     st.title("📊 ConnectWise Project Analysis")
     
-    if len(st.session_state.analyses) > 0:
+    if len(st.session_state.analysis_index) > 0:
         # Filter and sort analyses
-        filtered_analyses = filter_projects(
-            st.session_state.analyses,
+        positions = _filter_sort(
+            st.session_state.analysis_index,
+            st.session_state.analyses_version,
             search,
             st.session_state.risk_level_filter,
-            st.session_state.risk_factor_filter
+            st.session_state.risk_factor_filter,
+            sort_by
         )
-        sorted_analyses = sort_projects(filtered_analyses, sort_by)
+        
+        # Only the current page's projects are rendered
+        page_count = max(1, math.ceil(len(positions) / PROJECTS_PER_PAGE))
+        if st.session_state.get('project_page', 1) > page_count:
+            st.session_state.project_page = 1
+        page = 1
+        if page_count > 1:
+            page = st.number_input("Page", min_value=1, max_value=page_count, step=1, key='project_page')
+        page_positions = positions[(page - 1) * PROJECTS_PER_PAGE:page * PROJECTS_PER_PAGE]
+        sorted_analyses = [
+            load_project_view(path, mtime)
+            for path, mtime in st.session_state.analysis_index.iloc[page_positions][['path', 'mtime']].itertuples(index=False)
+        ]
         
         # Show active filters and count
         col1, col2 = st.columns([3, 1])
@@ -337,7 +470,13 @@ def main():
             if active_filters:
                 st.markdown("**Active Filters:** " + " | ".join(active_filters))
         with col2:
-            st.markdown(f"*Showing {len(filtered_analyses)} of {len(st.session_state.analyses)} projects*")
+            st.markdown(f"*Showing {len(positions)} of {len(st.session_state.analysis_index)} projects*")
+        
+        # Build each project's charts once; both tabs show the same figures
+        figs = {
+            analysis.id: (create_status_chart(analysis), create_priority_chart(analysis))
+            for analysis in sorted_analyses
+        }
         
         # Tabs for different views
         tab1, tab2 = st.tabs(["📊 Dashboard View", "📋 Detailed View"])
@@ -355,29 +494,26 @@ def main():
                         display_project_metrics(analysis)
                         
                         # Risk summary
-                        risk_level = analysis['risk_indicators']['risk_level']
+                        risk_level = analysis.risk_level
                         risk_color = {'LOW': 'green', 'MEDIUM': 'orange', 'HIGH': 'red'}.get(risk_level, 'gray')
                         st.markdown(f"**Risk Level:** :{risk_color}[{risk_level}]")
                         
-                        if analysis['risk_indicators']['risk_factors']:
+                        if analysis.risk_factors:
                             with st.expander("⚠️ Risk Factors"):
-                                for risk in analysis['risk_indicators']['risk_factors']:
-                                    st.markdown(f"- {risk}")
+                                st.markdown("\n".join(f"- {risk}" for risk in analysis.risk_factors))
                     
                     with col2:
                         # Charts side by side
                         subcol1, subcol2 = st.columns(2)
                         with subcol1:
-                            st.plotly_chart(
-                                create_status_chart(analysis), 
-                                use_container_width=True,
-                                key=f"status_chart_dash_{analysis['project_metrics']['name']}"
+                            render_fig(
+                                figs[analysis.id][0],
+                                div_id=f"status_chart_dash_{analysis.id}"
                             )
                         with subcol2:
-                            st.plotly_chart(
-                                create_priority_chart(analysis), 
-                                use_container_width=True,
-                                key=f"priority_chart_dash_{analysis['project_metrics']['name']}"
+                            render_fig(
+                                figs[analysis.id][1],
+                                div_id=f"priority_chart_dash_{analysis.id}"
                             )
                     
                     # Add ticket table below charts
@@ -393,15 +529,15 @@ def main():
                 col1, col2 = st.columns(2)
                 with col1:
                     st.plotly_chart(
-                        create_status_chart(analysis), 
+                        figs[analysis.id][0],
                         use_container_width=True,
-                        key=f"status_chart_detail_{analysis['project_metrics']['name']}"
+                        key=f"status_chart_detail_{analysis.name}"
                     )
                 with col2:
                     st.plotly_chart(
-                        create_priority_chart(analysis), 
+                        figs[analysis.id][1],
                         use_container_width=True,
-                        key=f"priority_chart_detail_{analysis['project_metrics']['name']}"
+                        key=f"priority_chart_detail_{analysis.name}"
                     )
                 
                 display_risk_indicators(analysis)
@@ -409,7 +545,7 @@ def main():
                 display_stalled_tickets(analysis)
                 st.divider()
         
-        if not filtered_analyses:
+        if not positions:
             st.info("No projects match your search criteria")
     
     else:
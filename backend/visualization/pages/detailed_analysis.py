@@ -1,40 +1,80 @@
 """Detailed project analysis page with AI insights."""
+import importlib.util
+import os
+import re
 import sys
 from pathlib import Path
 
-# Add project root to Python path
-project_root = str(Path(__file__).parent.parent.parent.parent)
-sys.path.insert(0, project_root)
+# Add project root to Python path only when backend isn't already importable
+# (e.g. launched with `python -m streamlit run` from the root, or PYTHONPATH set)
+if importlib.util.find_spec('backend') is None:
+    sys.path.insert(0, str(Path(__file__).parent.parent.parent.parent))
 
 import streamlit as st
-import json
+import orjson
 from datetime import datetime
-import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
 import asyncio
+import bisect
+import threading
 
 from backend.analysis.detailed_analyzer import DetailedProjectAnalyzer
 from backend.analysis.ai_analyzer import AIProjectAnalyzer
 
-def load_project_data(project_id: int) -> tuple[dict, dict, dict]:
-    """Load all analysis data for a project"""
+# Ticket rows rendered before the user asks to load the rest
+TICKET_ROWS = 200
+
+# Fresh AI analyses are only read back by the app, so they are written compact unless PRETTY_JSON is set
+AI_JSON_OPTIONS = orjson.OPT_APPEND_NEWLINE | (orjson.OPT_INDENT_2 if os.getenv('PRETTY_JSON') else 0)
+
+# Health score colours: below 40 red, below 70 yellow, otherwise green
+HEALTH_THRESHOLDS = (40, 70)
+HEALTH_COLORS = ('red', 'yellow', 'green')
+RISK_COLORS = {'LOW': 'green', 'MEDIUM': 'yellow', 'HIGH': 'red'}
+
+# Collected data file name, capturing the project ID
+_DETAILED_FILE = re.compile(r'^project_(\d+)_detailed\.json$')
+
+def _project_files(project_id: int) -> tuple[Path, Path, Path]:
+    """Detailed data, analysis and AI analysis files for a project"""
     data_dir = Path('data')
-    
-    # Load detailed data
-    detailed_file = data_dir / 'detailed' / f"project_{project_id}_detailed.json"
-    with open(detailed_file) as f:
-        detailed_data = json.load(f)
-    
-    # Load analysis
-    analysis_file = data_dir / 'analysis' / f"project_{project_id}_analysis.json"
-    with open(analysis_file) as f:
-        analysis = json.load(f)
-    
-    # Load AI analysis
-    ai_file = data_dir / 'ai_analysis' / f"project_{project_id}_ai_analysis.json"
-    with open(ai_file) as f:
-        ai_analysis = json.load(f)
-    
-    return detailed_data, analysis, ai_analysis
+    return (
+        data_dir / 'detailed' / f"project_{project_id}_detailed.json",
+        data_dir / 'analysis' / f"project_{project_id}_analysis.json",
+        data_dir / 'ai_analysis' / f"project_{project_id}_ai_analysis.json"
+    )
+
+@st.cache_data(show_spinner=False)
+def _load_json(path: str, mtime: float):
+    """Parse a JSON file; mtime is part of the cache key so a rewritten file is reloaded"""
+    return orjson.loads(Path(path).read_bytes())
+
+def _load_cached(path: Path):
+    return _load_json(str(path), path.stat().st_mtime)
+
+@st.cache_data(ttl=60, show_spinner=False)
+def _project_ids() -> tuple[int, ...]:
+    """Sorted IDs of projects with collected data; rescanned at most once a minute rather than on every rerun"""
+    try:
+        names = os.listdir('data/detailed')
+    except FileNotFoundError:
+        return ()
+    return tuple(sorted(int(m[1]) for name in names if (m := _DETAILED_FILE.match(name))))
+
+def load_project_data(project_id: int) -> tuple[dict, dict]:
+    """Load the analysis and AI analysis for a project"""
+    _, analysis_file, ai_file = _project_files(project_id)
+    return _load_cached(analysis_file), _load_cached(ai_file)
+
+def load_ai_analysis(project_id: int) -> dict:
+    """Load the AI analysis for a project"""
+    return _load_cached(_project_files(project_id)[2])
+
+def load_ai_prompt(project_id: int) -> str:
+    """Build the AI prompt from a project's collected data; the data is read uncached and freed once the prompt exists"""
+    detailed_data = orjson.loads(_project_files(project_id)[0].read_bytes())
+    return DetailedProjectAnalyzer(detailed_data).prepare_ai_prompt()
 
 def display_project_header(analysis: dict):
     """Display project header information"""
@@ -45,17 +85,21 @@ def display_project_header(analysis: dict):
 
 def display_progress_metrics(analysis: dict):
     """Display project progress metrics"""
+    # Hours may be missing or null; without an estimate there is no progress to report
+    estimated = analysis.get('estimated_hours') or 0.0
+    actual = analysis.get('actual_hours') or 0.0
+    progress = round(actual / estimated * 100) if estimated else 0
+    
     col1, col2, col3 = st.columns(3)
     
     with col1:
-        progress = round((analysis['actual_hours'] or 0) / (analysis['estimated_hours'] or 1) * 100)
         st.metric("Progress", f"{progress}%")
         
     with col2:
-        st.metric("Estimated Hours", f"{analysis['estimated_hours']:.1f}")
+        st.metric("Estimated Hours", f"{estimated:.1f}")
         
     with col3:
-        st.metric("Actual Hours", f"{analysis['actual_hours']:.1f}")
+        st.metric("Actual Hours", f"{actual:.1f}")
 
 def display_ticket_metrics(analysis: dict):
     """Display ticket-related metrics"""
@@ -67,6 +111,10 @@ def display_ticket_metrics(analysis: dict):
     with col2:
         st.metric("Active Tickets", analysis['active_tickets'])
 
+def _bullets(items) -> str:
+    """Markdown list of items, so a group of notes renders as one element"""
+    return "\n".join(f"- {item}" for item in items)
+
 def display_ai_insights(ai_analysis: dict):
     """Display AI-generated insights"""
     if 'error' in ai_analysis:
@@ -76,7 +124,7 @@ def display_ai_insights(ai_analysis: dict):
     # Project Health Score with color coding
     st.header("🎯 Project Health Analysis")
     health_score = ai_analysis.get('health_score', 0)
-    color = 'red' if health_score < 40 else 'yellow' if health_score < 70 else 'green'
+    color = HEALTH_COLORS[bisect.bisect_right(HEALTH_THRESHOLDS, health_score)]
     st.markdown(f"### Health Score: :{color}[{health_score}/100]")
     
     # Progress Analysis
@@ -97,8 +145,7 @@ def display_ai_insights(ai_analysis: dict):
     
     if concerns:
         with st.expander("View Progress Concerns"):
-            for concern in concerns:
-                st.warning(concern)
+            st.warning(_bullets(concerns))
     
     # Risks and Blockers
     st.header("⚠️ Risks & Blockers")
@@ -108,18 +155,16 @@ def display_ai_insights(ai_analysis: dict):
         st.subheader("Risks")
         risks = ai_analysis.get('risks', {})
         risk_level = risks.get('level', 'UNKNOWN')
-        risk_color = {'LOW': 'green', 'MEDIUM': 'yellow', 'HIGH': 'red'}.get(risk_level, 'gray')
+        risk_color = RISK_COLORS.get(risk_level, 'gray')
         st.markdown(f"**Risk Level:** :{risk_color}[{risk_level}]")
         
         if risks.get('factors'):
             st.markdown("**Risk Factors:**")
-            for factor in risks['factors']:
-                st.warning(factor)
+            st.warning(_bullets(risks['factors']))
                 
         if risks.get('mitigation_suggestions'):
             with st.expander("View Mitigation Suggestions"):
-                for suggestion in risks['mitigation_suggestions']:
-                    st.info(suggestion)
+                st.info(_bullets(risks['mitigation_suggestions']))
     
     with col2:
         st.subheader("Blockers")
@@ -127,13 +172,11 @@ def display_ai_insights(ai_analysis: dict):
         
         if blockers.get('current_blockers'):
             st.markdown("**Current Blockers:**")
-            for blocker in blockers['current_blockers']:
-                st.error(blocker)
+            st.error(_bullets(blockers['current_blockers']))
                 
         if blockers.get('potential_blockers'):
             with st.expander("View Potential Blockers"):
-                for blocker in blockers['potential_blockers']:
-                    st.warning(blocker)
+                st.warning(_bullets(blockers['potential_blockers']))
     
     # Resource Analysis
     st.header("👥 Resource Analysis")
@@ -144,14 +187,12 @@ def display_ai_insights(ai_analysis: dict):
     with col1:
         if resources.get('concerns'):
             st.markdown("**Resource Concerns:**")
-            for concern in resources['concerns']:
-                st.warning(concern)
+            st.warning(_bullets(resources['concerns']))
     
     with col2:
         if resources.get('recommendations'):
             st.markdown("**Resource Recommendations:**")
-            for rec in resources['recommendations']:
-                st.info(rec)
+            st.info(_bullets(resources['recommendations']))
     
     # Recommendations
     st.header("💡 Recommendations")
@@ -160,13 +201,13 @@ def display_ai_insights(ai_analysis: dict):
     col1, col2 = st.columns(2)
     with col1:
         st.subheader("Immediate Actions")
-        for action in recommendations.get('immediate_actions', []):
-            st.info(action)
+        if recommendations.get('immediate_actions'):
+            st.info(_bullets(recommendations['immediate_actions']))
             
     with col2:
         st.subheader("Long-term Improvements")
-        for improvement in recommendations.get('long_term_improvements', []):
-            st.success(improvement)
+        if recommendations.get('long_term_improvements'):
+            st.success(_bullets(recommendations['long_term_improvements']))
     
     # Timeline Prediction
     st.header("🗓️ Timeline Prediction")
@@ -180,50 +221,87 @@ def display_ai_insights(ai_analysis: dict):
     with col2:
         if timeline.get('factors_affecting_timeline'):
             st.markdown("**Factors Affecting Timeline:**")
-            for factor in timeline['factors_affecting_timeline']:
-                st.info(factor)
+            st.info(_bullets(timeline['factors_affecting_timeline']))
 
-def display_ticket_details(analysis: dict):
-    """Display detailed ticket information"""
-    st.header("Ticket Details")
+@st.cache_data(show_spinner=False)
+def _ticket_table(path: str, mtime: float) -> pa.Table:
+    """Arrow table of an analysis file's ticket summaries, with each status marked by a colour"""
+    table = pa.Table.from_pylist(_load_json(path, mtime)['ticket_summaries'])
+    if 'status' not in table.column_names:
+        return table
     
-    # Convert ticket summaries to dataframe
-    tickets_df = pd.DataFrame(analysis['ticket_summaries'])
+    # Mark status with a plain-text prefix: done is green, in progress orange, anything else red.
+    # A missing status reads 'Unknown' so the status filter can sort its options
+    status = pc.fill_null(table['status'].cast(pa.string()), 'Unknown')
+    done = pc.is_in(status, value_set=pa.array(['Closed', 'Completed']))
+    in_progress = pc.equal(status, 'In Progress')
+    markers = pc.if_else(done, '🟢', pc.if_else(in_progress, '🟠', '🔴'))
+    marked = pc.binary_join_element_wise(markers, status, ' ')
+    return table.set_column(table.column_names.index('status'), 'status', marked.dictionary_encode())
+
+def load_ticket_table(project_id: int) -> pa.Table:
+    """Load a project's ticket summaries, built into an Arrow table once per analysis file"""
+    analysis_file = _project_files(project_id)[1]
+    return _ticket_table(str(analysis_file), analysis_file.stat().st_mtime)
+
+@st.fragment
+def display_ticket_details(tickets: pa.Table):
+    """Display detailed ticket information; the filter widgets rerun only this table"""
+    st.header("Ticket Details")
     
-    # Add styling
-    def color_status(val):
-        if val == 'Closed' or val == 'Completed':
-            return 'color: green'
-        elif val == 'In Progress':
-            return 'color: orange'
-        else:
-            return 'color: red'
+    # Filter and slice before rendering so only the rows shown are sent to the browser
+    shown = tickets
+    if 'status' in tickets.column_names and tickets.num_rows:
+        statuses = st.multiselect("Status", sorted(tickets['status'].unique().to_pylist()))
+        if statuses:
+            shown = shown.filter(pc.is_in(shown['status'], value_set=pa.array(statuses)))
+    if shown.num_rows > TICKET_ROWS and not st.toggle(f"Load all {shown.num_rows} tickets"):
+        shown = shown.slice(0, TICKET_ROWS)
+    st.caption(f"Showing {shown.num_rows} of {tickets.num_rows} tickets")
     
-    # Display styled dataframe using the new map method instead of applymap
+    # Arrow goes to the frontend as-is, with no intermediate DataFrame
     st.dataframe(
-        tickets_df.style.map(color_status, subset=['status']),
-        use_container_width=True
+        shown,
+        use_container_width=True,
+        column_config={'status': st.column_config.TextColumn('Status')}
     )
 
-async def run_fresh_analysis(project_id: int, detailed_data: dict) -> dict:
-    """Run a fresh AI analysis for the project"""
+@st.cache_resource
+def _event_loop() -> asyncio.AbstractEventLoop:
+    """One event loop for the process, run in a background thread so clients and their connections outlive a rerun"""
+    loop = asyncio.new_event_loop()
+    threading.Thread(target=loop.run_forever, name='ai-analysis-loop', daemon=True).start()
+    return loop
+
+@st.cache_resource
+def _ai_analyzer() -> AIProjectAnalyzer:
+    """AI analyzer shared by every session, reusing its OpenAI client and connection pool"""
+    return AIProjectAnalyzer()
+
+async def _analyze_and_save(project_id: int, prompt: str, ai_analyzer: AIProjectAnalyzer) -> dict:
+    """Request an AI analysis and save it, replacing the previous file atomically"""
+    # The user asked for a new analysis, so an identical prompt must not return the cached one
+    analysis = await ai_analyzer.analyze_project(prompt, project_id, refresh=True)
+    
+    if 'error' in analysis:
+        raise Exception(analysis['error'])
+    
+    # Save the new analysis; readers never see a half-written file
+    ai_file = _project_files(project_id)[2]
+    tmp_file = ai_file.with_suffix('.tmp')
+    tmp_file.write_bytes(orjson.dumps(analysis, option=AI_JSON_OPTIONS))
+    tmp_file.replace(ai_file)
+    
+    return analysis
+
+def run_fresh_analysis(project_id: int, prompt: str) -> dict:
+    """Run a fresh AI analysis for the project on the shared event loop"""
     try:
-        analyzer = DetailedProjectAnalyzer(detailed_data)
-        prompt = analyzer.prepare_ai_prompt()
-        
-        ai_analyzer = AIProjectAnalyzer()
-        analysis = await ai_analyzer.analyze_project(prompt, project_id)
-        
-        if 'error' in analysis:
-            raise Exception(analysis['error'])
-        
-        # Save the new analysis
-        data_dir = Path('data')
-        ai_file = data_dir / 'ai_analysis' / f"project_{project_id}_ai_analysis.json"
-        with open(ai_file, 'w') as f:
-            json.dump(analysis, f, indent=2)
-        
-        return analysis
+        # Clicks that overlap share one API call through the analyzer's in-flight table
+        future = asyncio.run_coroutine_threadsafe(
+            _analyze_and_save(project_id, prompt, _ai_analyzer()), _event_loop()
+        )
+        return future.result()
         
     except Exception as e:
         st.error(f"AI Analysis failed: {str(e)}")
@@ -232,8 +310,7 @@ async def run_fresh_analysis(project_id: int, detailed_data: dict) -> dict:
             data_dir = Path('data')
             ai_file = data_dir / 'ai_analysis' / f"project_{project_id}_ai_analysis.json"
             if ai_file.exists():
-                with open(ai_file) as f:
-                    return json.load(f)
+                return orjson.loads(ai_file.read_bytes())
         except:
             pass
         
@@ -244,6 +321,34 @@ async def run_fresh_analysis(project_id: int, detailed_data: dict) -> dict:
             'status': 'failed'
         }
 
+@st.fragment
+def ai_analysis_section(project_id: int):
+    """AI insights with a refresh button; a fresh analysis reruns only this section"""
+    ai_analysis = load_ai_analysis(project_id)
+    
+    ai_col1, ai_col2 = st.columns([3, 1])
+    with ai_col1:
+        st.header("AI Analysis Insights")
+        if 'analyzed_at' in ai_analysis:
+            st.caption(f"Last analyzed: {ai_analysis['analyzed_at']}")
+    with ai_col2:
+        if st.button("🔄 Run Fresh Analysis", type="primary", help="Generate new AI insights for this project"):
+            try:
+                with st.spinner("Running AI analysis..."):
+                    # Run fresh analysis
+                    prompt = load_ai_prompt(project_id)
+                    new_analysis = run_fresh_analysis(project_id, prompt)
+                    if 'error' not in new_analysis:
+                        st.success("Analysis complete!")
+                        # The rewritten file has a new mtime, so the rerun loads it
+                        st.rerun(scope="fragment")
+                    else:
+                        st.error(f"Analysis failed: {new_analysis['error']}")
+            except Exception as e:
+                st.error(f"Failed to run analysis: {str(e)}")
+    
+    display_ai_insights(ai_analysis)
+
 def main():
     st.set_page_config(
         page_title="Detailed Project Analysis",
@@ -251,10 +356,12 @@ def main():
         layout="wide"
     )
     
+    # Saved results stay readable while the pipeline runs; files are reloaded by mtime once rewritten
+    if Path('data/.pipeline_running').exists():
+        st.info("Analysis pipeline running… showing the last saved results.")
+    
     # Project selector
-    data_dir = Path('data/detailed')
-    project_files = list(data_dir.glob('project_*_detailed.json'))
-    project_ids = [int(f.stem.split('_')[1]) for f in project_files]
+    project_ids = _project_ids()
     
     if not project_ids:
         st.error("No project data available. Please run the analysis pipeline first.")
@@ -267,8 +374,8 @@ def main():
     )
     
     try:
-        # Load data
-        detailed_data, analysis, ai_analysis = load_project_data(selected_project)
+        # Load data; the AI analysis is read alongside so its section starts from a warm cache
+        analysis, _ = load_project_data(selected_project)
         
         # Display sections
         display_project_header(analysis)
@@ -284,34 +391,13 @@ def main():
         
         st.markdown("---")
         
-        # AI Analysis Section with Refresh Button
-        ai_col1, ai_col2 = st.columns([3, 1])
-        with ai_col1:
-            st.header("AI Analysis Insights")
-            if 'analyzed_at' in ai_analysis:
-                st.caption(f"Last analyzed: {ai_analysis['analyzed_at']}")
-        with ai_col2:
-            if st.button("🔄 Run Fresh Analysis", type="primary", help="Generate new AI insights for this project"):
-                try:
-                    with st.spinner("Running AI analysis..."):
-                        # Run fresh analysis
-                        new_analysis = asyncio.run(run_fresh_analysis(selected_project, detailed_data))
-                        if 'error' not in new_analysis:
-                            st.success("Analysis complete!")
-                            ai_analysis = new_analysis
-                            st.rerun()
-                        else:
-                            st.error(f"Analysis failed: {new_analysis['error']}")
-                except Exception as e:
-                    st.error(f"Failed to run analysis: {str(e)}")
-        
-        # Display AI insights
-        display_ai_insights(ai_analysis)
+        # AI analysis reruns on its own when a fresh analysis is requested
+        ai_analysis_section(selected_project)
         
         st.markdown("---")
         
         # Ticket Details
-        display_ticket_details(analysis)
+        display_ticket_details(load_ticket_table(selected_project))
         
     except Exception as e:
         st.error(f"Error loading project data: {e}")
@@ -6,6 +6,7 @@ import time
 from pathlib import Path
 import signal
 import logging
+import httpx
 from dotenv import load_dotenv
 
 # Configure logging
@@ -15,6 +16,10 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Rules printed above and below the startup summary
+_BANNER_TOP = "\n" + "=" * 50
+_BANNER_BOTTOM = "=" * 50 + "\n"
+
 # Load environment variables
 load_dotenv()
 
@@ -73,6 +78,42 @@ def run_frontend():
         logger.error(f"Failed to start frontend: {e}")
         return None
 
+def wait_ready(url, timeout=15):
+    """Poll url with exponential backoff until it answers or timeout seconds pass"""
+    deadline = time.monotonic() + timeout
+    delay = 0.05
+    while time.monotonic() < deadline:
+        try:
+            httpx.get(url, timeout=0.5)
+            return True
+        except httpx.HTTPError:
+            time.sleep(min(delay, max(0, deadline - time.monotonic())))
+            delay *= 2
+    return False
+
+def wait_for_exit(processes):
+    """Block until a service exits or a shutdown signal arrives"""
+    if not hasattr(signal, 'sigwait'):
+        # No sigwait on Windows; fall back to polling
+        try:
+            while all(p.poll() is None for p in processes):
+                time.sleep(1)
+        except KeyboardInterrupt:
+            logger.info("Received shutdown signal...")
+        return
+    
+    # Blocked only after the services start, so they don't inherit the mask, and
+    # unblocked again before cleanup so a second Ctrl-C can still interrupt it
+    signals = {signal.SIGINT, signal.SIGTERM, signal.SIGCHLD}
+    previous = signal.pthread_sigmask(signal.SIG_BLOCK, signals)
+    try:
+        while all(p.poll() is None for p in processes):
+            if signal.sigwait(signals) != signal.SIGCHLD:
+                logger.info("Received shutdown signal...")
+                return
+    finally:
+        signal.pthread_sigmask(signal.SIG_SETMASK, previous)
+
 def cleanup(processes):
     """Clean up processes on shutdown"""
     logger.info("Shutting down services...")
@@ -102,8 +143,9 @@ def main():
         backend_process = run_backend()
         if backend_process:
             processes.append(backend_process)
-            # Wait a bit for backend to start
-            time.sleep(2)
+            # Start the frontend as soon as the backend answers
+            if not wait_ready("http://127.0.0.1:8000/docs"):
+                logger.warning("Backend not responding yet; starting frontend anyway")
         
         # Start frontend
         frontend_process = run_frontend()
@@ -111,18 +153,14 @@ def main():
             processes.append(frontend_process)
             
             # Print access URLs
-            logger.info("\n" + "="*50)
+            logger.info(_BANNER_TOP)
             logger.info("Services started successfully!")
             logger.info("Access the dashboard at: http://localhost:3000")
             logger.info("API documentation at: http://localhost:8000/docs")
-            logger.info("="*50 + "\n")
+            logger.info(_BANNER_BOTTOM)
             
             # Wait for interrupt
-            try:
-                while all(p.poll() is None for p in processes):
-                    time.sleep(1)
-            except KeyboardInterrupt:
-                logger.info("Received shutdown signal...")
+            wait_for_exit(processes)
             
     finally:
         cleanup(processes)